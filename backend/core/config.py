@@ -9,3 +9,6 @@ if not os.path.exists(PROJECTS_DIR):
 
 if not os.path.exists(OUTPUT_DIR):
     os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+# Shared, content-addressed caches (safe to delete at any time)
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
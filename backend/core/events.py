@@ -0,0 +1,105 @@
+import json
+import asyncio
+import threading
+from datetime import datetime
+
+# --- Event Bus ---
+# In-process pub/sub used to push pipeline/job/log/download updates to
+# Server-Sent-Events clients instead of having dashboards poll.
+# publish() is safe to call from worker threads; delivery happens on each
+# subscriber's event loop via call_soon_threadsafe.
+
+GLOBAL_CHANNEL = "*"
+QUEUE_SIZE = 500
+
+class _Subscription:
+    def __init__(self, loop, channel, types=None):
+        self.loop = loop
+        self.channel = channel
+        self.types = set(types) if types else None
+        self.queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+
+    def _put(self, event):
+        # Runs on the subscriber's loop. A slow client drops its oldest events
+        # rather than blocking publishers or growing without bound.
+        if self.queue.full():
+            try: self.queue.get_nowait()
+            except asyncio.QueueEmpty: pass
+        self.queue.put_nowait(event)
+
+class EventBus:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(EventBus, cls).__new__(cls)
+            cls._instance._subs = set()
+            cls._instance._lock = threading.Lock()
+        return cls._instance
+
+    def subscribe(self, channel=GLOBAL_CHANNEL, types=None):
+        """
+        Must be called from a running event loop (e.g. inside an async endpoint).
+        types optionally restricts the subscription to those event types.
+        """
+        sub = _Subscription(asyncio.get_running_loop(), channel, types)
+        with self._lock:
+            self._subs.add(sub)
+        return sub
+
+    def unsubscribe(self, sub):
+        with self._lock:
+            self._subs.discard(sub)
+
+    def has_subscribers(self):
+        return bool(self._subs)
+
+    def publish(self, project_id, event_type, data):
+        """Sends an event to the project's subscribers and to every global subscriber."""
+        if not self._subs:
+            return
+        event = {
+            "type": event_type,
+            "project_id": project_id,
+            "data": data,
+            "ts": datetime.now().isoformat()
+        }
+        with self._lock:
+            targets = [s for s in self._subs
+                       if (s.channel == GLOBAL_CHANNEL or s.channel == project_id)
+                       and (s.types is None or event_type in s.types)]
+        for sub in targets:
+            try:
+                sub.loop.call_soon_threadsafe(sub._put, event)
+            except RuntimeError:
+                # Loop already closed; the stream's finally block will unsubscribe
+                pass
+
+    async def stream(self, channel, is_disconnected, initial=None, types=None, keepalive_sec=15):
+        """
+        Async generator of SSE-formatted chunks for a StreamingResponse.
+        `initial` is a list of events sent right after connecting (current state snapshot).
+        """
+        sub = self.subscribe(channel, types)
+        try:
+            for event in initial or []:
+                if sub.types is None or event["type"] in sub.types:
+                    yield format_sse(event)
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.queue.get(), timeout=keepalive_sec)
+                    yield format_sse(event)
+                except asyncio.TimeoutError:
+                    if await is_disconnected():
+                        break
+                    yield ": keepalive\n\n"
+        finally:
+            self.unsubscribe(sub)
+
+def format_sse(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False, default=str)}\n\n"
+
+event_bus = EventBus()
+
+def publish(project_id, event_type, data):
+    event_bus.publish(project_id, event_type, data)
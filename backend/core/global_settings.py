@@ -11,6 +11,8 @@ class VideoSettings(BaseModel):
     default_duration_sec: float = Field(20.0, description="Default video duration in seconds")
     intro_silence_sec: float = Field(1.5, description="Silence duration before intro speech")
     outro_silence_sec: float = Field(1.5, description="Silence duration after outro speech")
+    exclude_duplicate_images: bool = Field(True, description="Leave near-duplicate images (perceptual hash) out of the timeline")
+    duplicate_max_distance: int = Field(6, description="Max differing bits (of 64) for two images to count as duplicates")
 
 class ScriptSettings(BaseModel):
     prompt_template: str = Field(
@@ -47,12 +49,51 @@ class MusicSettings(BaseModel):
 
 class VoiceSettings(BaseModel):
     default_voice_profile: str = Field("random", description="Default voice profile ID for TTS generation (use 'random' for random selection)")
+    chunked_synthesis: bool = Field(False, description="Synthesize Gemini voice sentence by sentence in parallel (one API request per sentence) and stitch with pauses at the real sentence boundaries. Off: one request for the whole text, and breathing pauses are placed at evenly spaced positions, which can fall mid-word (as for OpenAI/gTTS)")
+    sentence_pause_sec: float = Field(0.4, description="Breathing pause between sentences (seconds)")
+    tts_max_concurrency: int = Field(3, description="Maximum simultaneous TTS API requests across all jobs (provider rate limit)")
+    hedge_enabled: bool = Field(False, description="Race a backup TTS request against a primary that is slower than usual or fails; the loser is cancelled before requests it hasn't sent, one already in flight still uses quota")
+    hedge_backup_provider: str = Field("gtts", description="Backup provider for hedged requests (gtts, openai, gemini; empty = same provider and voice as the primary)")
+    hedge_backup_voice: str = Field("th", description="Backup voice (gTTS language, OpenAI or Gemini voice name; empty = the provider's default)")
+    hedge_percentile: float = Field(95, description="Primary latency percentile after which the backup request is issued")
+    hedge_min_samples: int = Field(10, description="Latency samples needed before the percentile deadline is used")
+    hedge_default_deadline_sec: float = Field(20.0, description="Hedge deadline while there are too few latency samples")
+    auto_speed_max: float = Field(1.25, description="Highest speed the TTS step may pick so the predicted voice fits the video duration (1.0 = never speed up)")
 
 class CoverDefaults(BaseModel):
     default_color: str = Field("#FFFFFF", description="Default text color")
     default_background: str = Field("gradient", description="Default background style (none, box, gradient)")
     default_position: str = Field("center", description="Default position (top, center, bottom)")
 
+class SpeculativeSettings(BaseModel):
+    enabled: bool = Field(False, description="Precompute likely-needed artifacts while workers are idle")
+    idle_poll_sec: float = Field(1.0, description="How often a waiting speculative task re-checks for idle workers")
+    niceness: int = Field(15, description="Scheduling niceness for the speculative worker thread (Linux only)")
+
+class ResourceSettings(BaseModel):
+    enabled: bool = Field(True, description="Launch heavy subprocesses (render, loudnorm, video normalization) through the resource governor")
+    niceness: int = Field(10, description="CPU niceness added to heavy subprocesses")
+    io_class: int = Field(2, description="ionice class for heavy subprocesses (0=off, 1=realtime, 2=best-effort, 3=idle)")
+    io_level: int = Field(7, description="ionice level within the class (0=highest, 7=lowest)")
+    workers: int = Field(2, description="Expected concurrent heavy jobs; CPU threads are split between them")
+    threads_per_job: int = Field(0, description="Explicit ffmpeg -threads per job (0 = derive from CPU count and workers)")
+    memory_limit_mb: int = Field(0, description="Address-space limit per heavy subprocess in MB (0 = unlimited)")
+    image_workers: int = Field(0, description="Worker processes for batch image processing (0 = one per CPU core)")
+
+class TTSCacheSettings(BaseModel):
+    enabled: bool = Field(True, description="Reuse synthesized audio for identical text/voice/style/speed across projects")
+    max_size_mb: int = Field(500, description="Size budget of the shared TTS cache; least recently used entries are evicted")
+
+class ThumbnailSettings(BaseModel):
+    max_size_mb: int = Field(200, description="Size budget of the shared thumbnail cache; least recently used thumbnails are evicted")
+
+class WaveformSettings(BaseModel):
+    max_size_mb: int = Field(100, description="Size budget of the shared waveform peaks cache; least recently used peaks are evicted")
+
+class SmartCropSettings(BaseModel):
+    roi_detector: str = Field("auto", description="Subject detector for smart crop (local, gemini, auto = local first, Gemini when unsure)")
+    local_min_confidence: float = Field(0.6, description="Local detections below this confidence are sent to Gemini in auto mode")
+
 class GlobalSettings(BaseModel):
     video: VideoSettings = Field(default_factory=VideoSettings)
     script: ScriptSettings = Field(default_factory=ScriptSettings)
@@ -61,6 +102,12 @@ class GlobalSettings(BaseModel):
     music: MusicSettings = Field(default_factory=MusicSettings)
     voice: VoiceSettings = Field(default_factory=VoiceSettings)
     cover: CoverDefaults = Field(default_factory=CoverDefaults)
+    speculative: SpeculativeSettings = Field(default_factory=SpeculativeSettings)
+    resources: ResourceSettings = Field(default_factory=ResourceSettings)
+    tts_cache: TTSCacheSettings = Field(default_factory=TTSCacheSettings)
+    smart_crop: SmartCropSettings = Field(default_factory=SmartCropSettings)
+    thumbnails: ThumbnailSettings = Field(default_factory=ThumbnailSettings)
+    waveform: WaveformSettings = Field(default_factory=WaveformSettings)
 
 # --- Manager ---
 
@@ -0,0 +1,66 @@
+import os
+import shutil
+import subprocess
+from core.global_settings import get_settings
+
+# --- Resource Governor ---
+# Heavy children (ffmpeg render, loudnorm, video normalization) are launched
+# through here so they run below the API process in CPU and I/O priority,
+# share the CPU between concurrent jobs instead of each grabbing every core,
+# and can be capped in memory.
+
+def _settings():
+    return get_settings().resources
+
+def thread_budget():
+    """Encoder threads per heavy job: available CPUs split across the configured workers."""
+    cfg = _settings()
+    if cfg.threads_per_job > 0:
+        return cfg.threads_per_job
+    cpus = os.cpu_count() or 1
+    return max(1, cpus // max(1, cfg.workers))
+
+def _with_threads(cmd):
+    """Adds -threads before the output file of an ffmpeg command (encoder option)."""
+    if not cmd or os.path.basename(cmd[0]) != "ffmpeg" or "-threads" in cmd:
+        return list(cmd)
+    return list(cmd[:-1]) + ["-threads", str(thread_budget()), cmd[-1]]
+
+def _with_ionice(cmd):
+    cfg = _settings()
+    ionice = shutil.which("ionice")
+    if not ionice or cfg.io_class <= 0:
+        return cmd
+    prefix = [ionice, "-c", str(cfg.io_class)]
+    if cfg.io_class in (1, 2):
+        prefix += ["-n", str(cfg.io_level)]
+    return prefix + cmd
+
+def _with_priority(cmd):
+    """
+    nice / prlimit prefixes for CPU priority and the memory cap. Applied as commands
+    rather than a preexec_fn, which is unsafe to run in a multithreaded server.
+    """
+    cfg = _settings()
+    prefix = []
+    nice = shutil.which("nice")
+    if nice and cfg.niceness > 0:
+        prefix += [nice, "-n", str(cfg.niceness)]
+    prlimit = shutil.which("prlimit")
+    if prlimit and cfg.memory_limit_mb > 0:
+        prefix += [prlimit, f"--as={cfg.memory_limit_mb * 1024 * 1024}", "--"]
+    return prefix + cmd
+
+def governed_cmd(cmd):
+    """Returns cmd with the thread budget, CPU/I/O priority and memory cap applied (no-op if disabled)."""
+    if not _settings().enabled:
+        return list(cmd)
+    return _with_ionice(_with_priority(_with_threads(cmd)))
+
+def run(cmd, **kwargs):
+    """subprocess.run for heavy jobs."""
+    return subprocess.run(governed_cmd(cmd), **kwargs)
+
+def popen(cmd, **kwargs):
+    """subprocess.Popen for heavy jobs."""
+    return subprocess.Popen(governed_cmd(cmd), **kwargs)
@@ -1,10 +1,14 @@
 import os
 from datetime import datetime
+from core.events import publish
 
 def log_event(project_path, filename, message):
     log_dir = os.path.join(project_path, "log")
     os.makedirs(log_dir, exist_ok=True)
     log_file = os.path.join(log_dir, filename)
     now = datetime.now().isoformat()
+    line = f"[{now}] {message}"
     with open(log_file, 'a') as f:
-        f.write(f"[{now}] {message}\n")
+        f.write(f"{line}\n")
+    # Push to live log viewers (no-op without subscribers)
+    publish(os.path.basename(os.path.normpath(project_path)), "log", {"file": filename, "line": line})
@@ -8,6 +8,9 @@ from core.step_registry import STEP_REGISTRY
 from core.state import set_done
 from core.logger import log_event
 from core.errors import PipelineError
+from core.speculative import speculative
+from core.run_context import RunContext
+from core.events import publish
 
 class PipelineRunner:
     _instance = None
@@ -21,6 +24,12 @@ class PipelineRunner:
     def get_job(self, project_id):
         return self.jobs.get(project_id)
 
+    def _publish_job(self, project_id):
+        """Pushes the job state to live subscribers (SSE) on every transition."""
+        job = self.jobs.get(project_id)
+        if job:
+            publish(project_id, "job", dict(job, logs=list(job['logs'])))
+
     def cancel_job(self, project_id):
         if project_id in self.jobs:
             self.jobs[project_id]['cancelled'] = True
@@ -45,11 +54,18 @@ class PipelineRunner:
             'cancelled': False
         }
 
-        thread = threading.Thread(target=self._run_pipeline, args=(project_id, project_path))
+        self._publish_job(project_id)
+
+        thread = threading.Thread(target=self._run_pipeline_foreground, args=(project_id, project_path))
         thread.daemon = True
         thread.start()
         return True, "Job started"
 
+    def _run_pipeline_foreground(self, project_id, project_path):
+        # Speculative precomputation yields while a real pipeline is running
+        with speculative.foreground(project_id):
+            self._run_pipeline(project_id, project_path)
+
     def _run_pipeline(self, project_id, project_path):
         job = self.jobs[project_id]
         
@@ -69,11 +85,16 @@ class PipelineRunner:
         try:
             log_event(project_path, "pipeline.log", "[RUNNER] Starting async pipeline execution")
             job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] Pipeline started")
+            self._publish_job(project_id)
+
+            # Resolve settings once so every step of this run sees the same values
+            ctx = RunContext.resolve(project_path, project_id)
 
             for i, step in enumerate(STEP_REGISTRY):
                 if job['cancelled']:
                     job['status'] = 'cancelled'
                     job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] Canceled by user")
+                    self._publish_job(project_id)
                     log_event(project_path, "pipeline.log", "[RUNNER] Execution canceled by user")
                     return
 
@@ -85,29 +106,33 @@ class PipelineRunner:
                 # Check disabled
                 if step.step_id in disabled_steps:
                     job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] Skipped: {step.label} (Disabled)")
+                    self._publish_job(project_id)
                     continue
                 
                 # Check completed
                 # We check if it's already done to support "Resume" behavior
                 if step.is_completed(project_path):
                     job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] Skipped: {step.label} (Already Done)")
+                    self._publish_job(project_id)
                     continue
 
                 # Run
                 try:
                     job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] Running: {step.label}...")
+                    self._publish_job(project_id)
                     
                     # Update project.json to indicate running (optional but good for persistence)
                     self._update_project_json(project_path, step.step_id, "running")
 
                     start_ts = time.time()
-                    step.run(project_id, project_path)
+                    step.run(project_id, project_path, ctx)
                     duration = time.time() - start_ts
                     
                     set_done(project_path, f"{step.step_id}.done")
                     
                     self._update_project_json(project_path, step.step_id, "completed")
                     job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] Completed: {step.label} ({duration:.1f}s)")
+                    self._publish_job(project_id)
                     
                 except PipelineError as e:
                     job['status'] = 'failed'
@@ -117,6 +142,7 @@ class PipelineRunner:
                         job['error'] += f" ({e.detail})"
                         
                     job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] FAILED: {step.label} - {e.message}")
+                    self._publish_job(project_id)
                     
                     self._update_project_json(project_path, step.step_id, "failed", error=e.to_dict())
                     log_event(project_path, "pipeline.log", f"[RUNNER] Step {step.step_id} failed: {e.message}")
@@ -126,6 +152,7 @@ class PipelineRunner:
                     job['status'] = 'failed'
                     job['error'] = f"{step.label} Unexpected Error: {str(e)}"
                     job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] ERROR: {step.label} - {str(e)}")
+                    self._publish_job(project_id)
                     
                     self._update_project_json(project_path, step.step_id, "failed", error={"code": "UNKNOWN", "message": str(e)})
                     log_event(project_path, "pipeline.log", f"[RUNNER] Step {step.step_id} exception: {traceback.format_exc()}")
@@ -136,11 +163,13 @@ class PipelineRunner:
                 job['progress'] = 100
                 job['current_step'] = None
                 job['logs'].append(f"[{datetime.now().strftime('%H:%M:%S')}] Pipeline Finished Successfully")
+                self._publish_job(project_id)
                 log_event(project_path, "pipeline.log", "[RUNNER] Pipeline finished successfully")
 
         except Exception as e:
              job['status'] = 'failed'
              job['error'] = f"Runner System Error: {str(e)}"
+             self._publish_job(project_id)
              log_event(project_path, "pipeline.log", f"[RUNNER] Top level exception: {traceback.format_exc()}")
 
     def _update_project_json(self, project_path, step_id, status, error=None):
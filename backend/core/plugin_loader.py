@@ -1,16 +1,92 @@
 import os
+import ast
 import importlib
 import inspect
+import threading
 from .step_base import PipelineStep
 
+class LazyStep(PipelineStep):
+    """
+    Registry entry built from a step module's source without importing it.
+    step_id and label come from the `super().__init__("id", "label")` call;
+    the module (and the SDKs it pulls in) is only imported the first time
+    the step is run.
+    """
+    def __init__(self, step_id: str, label: str, module_name: str, class_name: str):
+        super().__init__(step_id, label)
+        self.module_name = module_name
+        self.class_name = class_name
+        self._step = None
+        self._lock = threading.Lock()
+
+    def load(self) -> PipelineStep:
+        if self._step is None:
+            with self._lock:
+                if self._step is None:
+                    module = importlib.import_module(self.module_name)
+                    self._step = getattr(module, self.class_name)()
+        return self._step
+
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
+        return self.load().run(project_id, project_path, ctx)
+
+    def is_completed(self, project_path: str) -> bool:
+        # Status checks must not trigger the import; defer to the real step once loaded
+        if self._step is not None:
+            return self._step.is_completed(project_path)
+        return super().is_completed(project_path)
+
+def _read_step_metadata(file_path):
+    """
+    Returns [(class_name, step_id, label)] for PipelineStep subclasses whose
+    __init__ passes literal strings to super().__init__. Anything else is
+    left to the eager loader.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=file_path)
+
+    found = []
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        if not any(isinstance(b, ast.Name) and b.id == "PipelineStep" for b in node.bases):
+            continue
+        for item in node.body:
+            if not (isinstance(item, ast.FunctionDef) and item.name == "__init__"):
+                continue
+            for call in ast.walk(item):
+                if (isinstance(call, ast.Call) and isinstance(call.func, ast.Attribute)
+                        and call.func.attr == "__init__" and len(call.args) == 2
+                        and all(isinstance(a, ast.Constant) and isinstance(a.value, str) for a in call.args)):
+                    found.append((node.name, call.args[0].value, call.args[1].value))
+                    break
+    return found
+
+def _load_module_steps(module_name, log_file):
+    """Eager path: import the module and instantiate its steps (original behaviour)."""
+    steps = []
+    module = importlib.import_module(module_name)
+    # Find all classes that inherit from PipelineStep and are not PipelineStep itself
+    for name, obj in inspect.getmembers(module, inspect.isclass):
+        if issubclass(obj, PipelineStep) and obj is not PipelineStep:
+            # Ensure the class is defined in THIS module, not imported
+            if obj.__module__ != module_name:
+                continue
+            try:
+                steps.append(obj())
+            except Exception as e:
+                with open(log_file, "a") as f:
+                    f.write(f"Error instantiating step from {module_name}: {str(e)}\n")
+    return steps
+
 def load_plugins():
     steps_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "steps")
     logs_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "logs")
     if not os.path.exists(logs_dir):
         os.makedirs(logs_dir, exist_ok=True)
-    
+
     log_file = os.path.join(logs_dir, "plugin-load.log")
-    
+
     discovered_steps = []
     seen_ids = set()
 
@@ -19,31 +95,30 @@ def load_plugins():
         if filename.endswith(".py") and not filename.startswith("__"):
             module_name = f"steps.{filename[:-3]}"
             try:
-                module = importlib.import_module(module_name)
-                # Find all classes that inherit from PipelineStep and are not PipelineStep itself
-                for name, obj in inspect.getmembers(module, inspect.isclass):
-                    if issubclass(obj, PipelineStep) and obj is not PipelineStep:
-                        # Ensure the class is defined in THIS module, not imported
-                        if obj.__module__ != module_name:
-                            continue
-                            
-                        try:
-                            instance = obj()
-                            if instance.step_id in seen_ids:
-                                with open(log_file, "a") as f:
-                                    f.write(f"Duplicate step_id detected: {instance.step_id} in {module_name}\n")
-                                continue
-                            
-                            discovered_steps.append(instance)
-                            seen_ids.add(instance.step_id)
-                        except Exception as e:
-                            with open(log_file, "a") as f:
-                                f.write(f"Error instantiating step from {module_name}: {str(e)}\n")
+                # Register from source metadata; fall back to importing the module
+                try:
+                    metadata = _read_step_metadata(os.path.join(steps_dir, filename))
+                except SyntaxError:
+                    metadata = []
+                if metadata:
+                    instances = [LazyStep(step_id, label, module_name, class_name)
+                                 for class_name, step_id, label in metadata]
+                else:
+                    instances = _load_module_steps(module_name, log_file)
+
+                for instance in instances:
+                    if instance.step_id in seen_ids:
+                        with open(log_file, "a") as f:
+                            f.write(f"Duplicate step_id detected: {instance.step_id} in {module_name}\n")
+                        continue
+
+                    discovered_steps.append(instance)
+                    seen_ids.add(instance.step_id)
             except Exception as e:
                 with open(log_file, "a") as f:
                     f.write(f"Error loading module {module_name}: {str(e)}\n")
 
-    # Sort steps by step_id (or you might prefer a numeric prefix if we had one, 
+    # Sort steps by step_id (or you might prefer a numeric prefix if we had one,
     # but the task says sort by step_id)
     discovered_steps.sort(key=lambda x: x.step_id)
     return discovered_steps
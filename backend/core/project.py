@@ -52,16 +52,7 @@ def initialize_project_structure(project_id: str, product_name: str = None, badg
         folder_path = os.path.join(project_path, folder)
         os.makedirs(folder_path, exist_ok=True)
         
-    # Preload Default BGM to input
-    try:
-        import shutil
-        app_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__))) # backend dir
-        bgm_src = os.path.join(app_root, "assets", "music", "carefree.mp3")
-        bgm_dst = os.path.join(project_path, "input", "carefree.mp3")
-        if os.path.exists(bgm_src) and not os.path.exists(bgm_dst):
-             shutil.copy2(bgm_src, bgm_dst)
-    except Exception as e:
-        print(f"Warning: Failed to preload BGM: {e}")
+    # Default BGM is resolved from the shared music library (assets/music); no per-project copy
 
     if product_name and not os.path.exists(product_json_path):
         payload = {"product_name": product_name}
@@ -246,8 +237,8 @@ def list_assets(project_id):
     target_dir = os.path.join(project_path, "input")
     if not os.path.exists(target_dir):
         return []
+    from utils import thumbnails, image_index
     assets = []
-    valid_exts = {".jpg", ".jpeg", ".png", ".webp", ".mp4", ".webm"}
     
     import re
     def natural_sort_key(s):
@@ -259,20 +250,25 @@ def list_assets(project_id):
             return int(match.group(1))
         return 999999 # Put non-numbered files at the end
     
-    for item in os.listdir(target_dir):
-        if any(item.lower().endswith(ext) for ext in valid_exts):
-             fpath = os.path.join(target_dir, item)
-             size = os.path.getsize(fpath)
-             # Check for backup
-             has_backup = os.path.exists(os.path.join(target_dir, "backups", item))
-             
-             assets.append({
-                 "name": item,
-                 "url": f"/media/{project_id}/input/{item}",
-                 "size": size,
-                 "has_backup": has_backup,
-                 "sort_key": natural_sort_key(item)
-             })
+    # Sizes, dimensions and backups come from the image index (no per-file stat/open)
+    from core.global_settings import get_settings
+    images = image_index.entries(project_path)
+    groups = image_index.duplicates(project_path, get_settings().video.duplicate_max_distance, images=images)
+    duplicate_of = image_index.duplicate_of(groups)
+    group_of = {name: i for i, group in enumerate(groups) for name in group}
+    for item, meta in images.items():
+        assets.append({
+            "name": item,
+            "url": f"/media/{project_id}/input/{item}",
+            "thumb_url": thumbnails.thumb_url(project_id, item, version=meta["mtime_ns"]) if thumbnails.is_image(item) else None,
+            "size": meta["size"],
+            "width": meta.get("width"),
+            "height": meta.get("height"),
+            "has_backup": meta.get("has_backup", False),
+            "duplicate_of": duplicate_of.get(item),
+            "duplicate_group": group_of.get(item),
+            "sort_key": natural_sort_key(item)
+        })
     
     # Sort by the extracted number, then by name for tie-breaking
     assets.sort(key=lambda x: (x["sort_key"], x["name"]))
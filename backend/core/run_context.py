@@ -0,0 +1,173 @@
+import os
+import json
+import copy
+from types import MappingProxyType
+from dataclasses import dataclass
+from datetime import datetime
+from core.global_settings import GlobalSettings, get_settings
+
+def _freeze(value):
+    """Recursively turns dicts into read-only mappings and lists into tuples."""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+def _read_json(path):
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except Exception:
+        return None
+
+@dataclass(frozen=True)
+class RunContext:
+    """
+    Immutable snapshot of the settings a pipeline run works with.
+    Global settings, project.json settings and input/product.json are read once
+    and merged here, so every step sees the same values even if a user edits
+    settings mid-run.
+
+    Only settings are snapshotted. Pipeline state that steps hand to each other
+    through project.json (cover selection, pipeline status, video_path) is
+    still read from disk.
+    """
+    project_id: str
+    project_path: str
+    settings: GlobalSettings
+    project_settings: MappingProxyType
+    music_config: MappingProxyType
+    product: MappingProxyType
+    project_name: str
+    has_project_json: bool
+    resolved_at: str
+
+    @classmethod
+    def resolve(cls, project_path, project_id=None):
+        project_data = _read_json(os.path.join(project_path, "project.json"))
+        product_data = _read_json(os.path.join(project_path, "input", "product.json")) or {}
+        has_project_json = project_data is not None
+        project_data = project_data or {}
+
+        return cls(
+            project_id=project_id or os.path.basename(os.path.normpath(project_path)),
+            project_path=project_path,
+            settings=copy.deepcopy(get_settings()),
+            project_settings=_freeze(project_data.get("settings", {}) or {}),
+            music_config=_freeze(project_data.get("music_config", {}) or {}),
+            product=_freeze(product_data),
+            project_name=project_data.get("product_name") or "",
+            has_project_json=has_project_json,
+            resolved_at=datetime.now().isoformat()
+        )
+
+    # --- Sections ---
+
+    def section(self, name):
+        """Project-level settings section (read-only mapping, empty if unset)."""
+        return self.project_settings.get(name) or MappingProxyType({})
+
+    # --- Product ---
+
+    def product_name(self, default=None):
+        return self.product.get("product_name") or self.project_name or default
+
+    # --- Video ---
+
+    @property
+    def intro_silence(self):
+        if self.has_project_json:
+            return self.section("video").get("intro_silence", 0.0)
+        return self.settings.video.intro_silence_sec
+
+    @property
+    def outro_silence(self):
+        if self.has_project_json:
+            return self.section("video").get("outro_silence", 0.0)
+        return self.settings.video.outro_silence_sec
+
+    @property
+    def voice_intro_silence(self):
+        """Padding baked into the voice file; none without project.json (as TTS always did)."""
+        return self.intro_silence if self.has_project_json else 0.0
+
+    @property
+    def voice_outro_silence(self):
+        return self.outro_silence if self.has_project_json else 0.0
+
+    @property
+    def max_duration(self):
+        return self.settings.video.default_duration_sec
+
+    @property
+    def ken_burns_enabled(self):
+        return self.section("video").get("ken_burns_enabled", True)
+
+    @property
+    def video_format(self):
+        return self.section("video").get("format", "portrait")
+
+    @property
+    def transition_id(self):
+        return self.section("video").get("transition", "slideright")
+
+    @property
+    def transition_duration(self):
+        return self.section("video").get("transition_duration", 1.0)
+
+    # --- Voice ---
+
+    @property
+    def breathing_pause(self):
+        return self.section("voice").get("breathing_pause", False)
+
+    @property
+    def sentence_pause(self):
+        return self.settings.voice.sentence_pause_sec
+
+    # --- Script ---
+
+    @property
+    def target_word_count(self):
+        script_settings = self.section("script")
+        if "word_count" in script_settings:
+            return script_settings.get("word_count")
+        return self.settings.script.target_word_count
+
+    @property
+    def prompt_template(self):
+        return self.section("script").get("template") or self.settings.script.prompt_template
+
+    # --- Mix / Music ---
+
+    @property
+    def voice_gain(self):
+        return self.section("mix").get("voice_gain", 1.0)
+
+    @property
+    def music_gain(self):
+        return self.section("mix").get("music_gain", 0.2)
+
+    @property
+    def duck_voice(self):
+        return self.section("music").get("duck_voice", True)
+
+    @property
+    def music_track(self):
+        """Track name resolved the way the mixer always has: music_config > settings.music.track > global default."""
+        if not self.has_project_json:
+            return ""
+        legacy_track = self.section("music").get("track", "")
+        if self.music_config.get("enabled", True):
+            track = self.music_config.get("music_file", legacy_track)
+        else:
+            return "none" # Explicitly disabled
+        return track or legacy_track or self.settings.music.default_music_file
+
+    @property
+    def music_volume_db(self):
+        """Explicit dB adjustment from music_config, or None to fall back to mix.music_gain."""
+        return self.music_config.get("volume_adj")
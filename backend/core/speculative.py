@@ -0,0 +1,223 @@
+import os
+import sys
+import queue
+import threading
+import itertools
+import traceback
+from contextlib import contextmanager
+from core.logger import log_event
+
+# Lower number = runs first when the machine goes idle
+PRIORITY_HIGH = 0
+PRIORITY_LOW = 10
+
+# --- Speculative Tasks ---
+# Each task receives (project_id, project_path, should_yield) and must check
+# should_yield() between units of work. Returning False means "preempted, retry later".
+
+def _task_render_stills(project_id, project_path, should_yield):
+    """Pre-converts every input image into the cached still used by the renderer (project's video format)."""
+    from utils.video_renderer import get_render_still
+    from utils import image_index
+    from core.run_context import RunContext
+    video_format = RunContext.resolve(project_path, project_id).video_format
+    input_dir = os.path.join(project_path, "input")
+    if not os.path.exists(input_dir):
+        return True
+
+    images_meta = image_index.entries(project_path)
+    candidates = [(os.path.join(input_dir, f), images_meta[f]) for f in sorted(images_meta)
+                  if f.lower().endswith(image_index.IMAGE_EXTS)]
+    cover_path = os.path.join(project_path, "cover.jpg")
+    if os.path.exists(cover_path):
+        candidates.insert(0, (cover_path, None))
+
+    for img_path, meta in candidates:
+        if should_yield():
+            return False
+        get_render_still(project_path, img_path, video_format, meta=meta)
+    return True
+
+def _task_processed_voice(project_id, project_path, should_yield):
+    """Runs voice normalization ahead of step 05 if the cached result is missing."""
+    from utils.voice_paths import raw_voice_path, processed_voice_path
+    if not raw_voice_path(project_path):
+        return True
+    if processed_voice_path(project_path):
+        return True
+    if should_yield():
+        return False
+    from utils.voice_processor import process_voice
+    process_voice(project_id, project_path)
+    return True
+
+def _task_draft_timeline(project_id, project_path, should_yield):
+    """Builds a draft timeline only when none exists, so user edits are never overwritten."""
+    if os.path.exists(os.path.join(project_path, "timeline.json")):
+        return True
+    if should_yield():
+        return False
+    from utils.timeline_manager import build_timeline
+    build_timeline(project_path)
+    return True
+
+# event -> [(task_name, func, priority)]
+SPECULATIVE_TASKS = {
+    "images": [
+        ("render_stills", _task_render_stills, PRIORITY_LOW),
+    ],
+    "voice": [
+        ("processed_voice", _task_processed_voice, PRIORITY_HIGH),
+        ("draft_timeline", _task_draft_timeline, PRIORITY_LOW),
+    ],
+}
+
+# --- Executor ---
+
+class SpeculativeExecutor:
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(SpeculativeExecutor, cls).__new__(cls)
+            cls._instance._queue = queue.PriorityQueue()
+            cls._instance._pending = set() # (project_id, task_name), queued or running
+            cls._instance._running = None # (project_id, task_name) of the task in progress
+            cls._instance._dirty = {} # running key -> project_path, re-queued when it completes
+            cls._instance._lock = threading.Lock()
+            cls._instance._foreground = 0
+            cls._instance._idle = threading.Condition(cls._instance._lock)
+            cls._instance._seq = itertools.count()
+            cls._instance._thread = None
+        return cls._instance
+
+    def _settings(self):
+        from core.global_settings import get_settings
+        return get_settings().speculative
+
+    def notify(self, project_id, project_path, event):
+        """
+        Called after an upstream change (images, voice).
+        Queues the downstream tasks for that event; duplicates are coalesced.
+        A task that is already running is marked dirty and runs again once it
+        completes, so changes made mid-run are picked up.
+        """
+        if not self._settings().enabled:
+            return
+        tasks = SPECULATIVE_TASKS.get(event, [])
+        with self._lock:
+            for name, func, priority in tasks:
+                key = (project_id, name)
+                if key == self._running:
+                    self._dirty[key] = project_path
+                    continue
+                if key in self._pending:
+                    continue
+                self._pending.add(key)
+                self._queue.put((priority, next(self._seq), key, func, project_path))
+            if tasks and (self._thread is None or not self._thread.is_alive()):
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+
+    @contextmanager
+    def foreground(self, project_id=None):
+        """
+        Marks real (user-requested) work; speculative tasks yield while any is active.
+        A speculative task already running for project_id (any project if None) is
+        waited for first, so both never write the same files (voice_processed.wav,
+        timeline.json) at once. Tasks yield at their next check, so this is at most
+        one unit of work.
+        """
+        with self._lock:
+            self._foreground += 1
+            while self._running is not None and project_id in (None, self._running[0]):
+                self._idle.wait()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._foreground -= 1
+                if self._foreground == 0:
+                    self._idle.notify_all()
+
+    def is_idle(self):
+        return self._foreground == 0
+
+    def should_yield(self):
+        return not self.is_idle()
+
+    def status(self):
+        with self._lock:
+            return {
+                "enabled": self._settings().enabled,
+                "idle": self._foreground == 0,
+                "foreground_jobs": self._foreground,
+                "running": {"project_id": self._running[0], "task": self._running[1]} if self._running else None,
+                "pending": [{"project_id": p, "task": t} for p, t in sorted(self._pending)]
+            }
+
+    def _lower_priority(self):
+        # setpriority on a thread id only scopes to that thread on Linux
+        if not sys.platform.startswith("linux"):
+            return
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), self._settings().niceness)
+        except Exception:
+            pass
+
+    def _start_when_idle(self, key):
+        """Waits for idle and marks key running in one step (see foreground)."""
+        with self._lock:
+            while self._foreground > 0:
+                self._idle.wait(timeout=self._settings().idle_poll_sec)
+            self._running = key
+
+    def _finish(self, key):
+        """Clears the running task; returns the project path to re-queue it with if it went dirty."""
+        with self._lock:
+            self._running = None
+            self._idle.notify_all()
+            return self._dirty.pop(key, None)
+
+    def _worker(self):
+        self._lower_priority()
+        while True:
+            try:
+                item = self._queue.get(timeout=30)
+            except queue.Empty:
+                with self._lock:
+                    if self._queue.empty():
+                        self._thread = None
+                        return
+                continue
+
+            priority, _, key, func, project_path = item
+            project_id, task_name = key
+            self._start_when_idle(key)
+
+            if not os.path.exists(project_path):
+                # Project deleted while queued
+                with self._lock:
+                    self._pending.discard(key)
+                self._finish(key)
+                continue
+
+            finished = True
+            try:
+                finished = func(project_id, project_path, self.should_yield) is not False
+            except Exception:
+                log_event(project_path, "speculative.log", f"[SPECULATIVE] {task_name} failed: {traceback.format_exc()}")
+
+            dirty_path = self._finish(key)
+            if finished and dirty_path is None:
+                with self._lock:
+                    self._pending.discard(key)
+                log_event(project_path, "speculative.log", f"[SPECULATIVE] {task_name} done")
+            else:
+                # Preempted by real work, or upstream changed while running: requeue,
+                # it will wait for the next idle window
+                if finished:
+                    log_event(project_path, "speculative.log", f"[SPECULATIVE] {task_name} done, inputs changed meanwhile: queued again")
+                self._queue.put((priority, next(self._seq), key, func, dirty_path or project_path))
+
+speculative = SpeculativeExecutor()
@@ -7,9 +7,19 @@ class PipelineStep(ABC):
         self.label = label
 
     @abstractmethod
-    def run(self, project_id: str, project_path: str) -> bool:
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
+        """
+        ctx is the RunContext resolved once per pipeline run.
+        Steps resolve their own when run standalone (ctx=None).
+        """
         pass
 
+    def resolve_context(self, project_id: str, project_path: str, ctx=None):
+        if ctx is not None:
+            return ctx
+        from core.run_context import RunContext
+        return RunContext.resolve(project_path, project_id)
+
     def is_completed(self, project_path: str) -> bool:
         # Check if step_name.done exists in state/
         done_file = os.path.join(project_path, "state", f"{self.step_id}.done")
@@ -16,10 +16,10 @@ mimetypes.init()
 mimetypes.add_type('audio/mpeg', '.mp3')
 mimetypes.add_type('audio/wav', '.wav')
 
-from fastapi import FastAPI, HTTPException, File, UploadFile, BackgroundTasks
+from fastapi import FastAPI, HTTPException, File, UploadFile, BackgroundTasks, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from datetime import datetime
 from typing import Optional, List
@@ -30,6 +30,7 @@ from core import project as project_utils
 from core.errors import PipelineError
 from core.logger import log_event
 from core.state import set_done # Import here
+from core.speculative import speculative
 from upload import downloader
 from core import step_registry
 from utils.cover_generator import (
@@ -37,6 +38,7 @@ from utils.cover_generator import (
     generate_cover_text_ai, generate_cover_image_ai, generate_cover_prompt_ai
 )
 from utils.gemini_tts import GEMINI_VOICES, generate_gemini_tts
+from utils import thumbnails
 from fastapi.responses import Response
 
 # --- CORS Static Files ---
@@ -110,6 +112,11 @@ class GeminiTTSPreviewRequest(BaseModel):
     voice: str
     style: Optional[str] = ""
 
+class GeminiTTSStreamRequest(GeminiTTSPreviewRequest):
+    voice: str = "Puck"
+    chunked: Optional[bool] = None # settings.voice.chunked_synthesis
+    pause: Optional[float] = None # settings.voice.sentence_pause_sec
+
 @app.get("/voice/gemini/voices")
 def get_gemini_voices():
     return GEMINI_VOICES
@@ -117,10 +124,14 @@ def get_gemini_voices():
 @app.post("/api/tts/gemini/preview")
 def preview_gemini_tts(request: GeminiTTSPreviewRequest):
     try:
-        audio_data = generate_gemini_tts(
-            text=request.text,
-            voice_name=request.voice,
-            style_instructions=request.style
+        from utils.tts_cache import synthesize_cached
+        audio_data, _ = synthesize_cached(
+            "gemini", request.voice, request.style, 1.0, request.text, "wav",
+            lambda: generate_gemini_tts(
+                text=request.text,
+                voice_name=request.voice,
+                style_instructions=request.style
+            )
         )
         # We return the raw binary audio data
         return Response(content=audio_data, media_type="audio/wav")
@@ -129,6 +140,63 @@ def preview_gemini_tts(request: GeminiTTSPreviewRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/tts/gemini/preview/stream")
+def stream_gemini_tts_preview(request: GeminiTTSStreamRequest):
+    """
+    Streaming preview: a WAV header with open-ended sizes followed by PCM as it is
+    synthesized, so the client starts playing before synthesis finishes.
+    With chunked synthesis (request or settings.voice.chunked_synthesis), multi-sentence
+    text is synthesized per sentence (concurrently) and sentence 1 plays while the
+    rest are still generating. POST so long scripts don't hit URL length limits.
+    """
+    from core.global_settings import get_settings
+    from utils import tts_cache
+    from utils.gemini_tts import stream_gemini_tts_pcm, iter_gemini_tts_chunked_pcm
+    from utils.sentence_utils import split_sentences
+    from utils.pcm import streaming_wav_header, write_wav
+
+    voice_settings = get_settings().voice
+    text, voice, style = request.text, request.voice, request.style
+    pause = voice_settings.sentence_pause_sec if request.pause is None else request.pause
+    chunked = voice_settings.chunked_synthesis if request.chunked is None else request.chunked
+    chunked = chunked and len(split_sentences(text)) > 1
+    # Stitched previews (per-sentence takes + pauses) are cached apart from whole-text takes
+    key = tts_cache.cache_key(f"gemini-chunked-{pause:g}" if chunked else "gemini", voice, style, 1.0, text)
+    cached = tts_cache.get(key, "wav")
+    if cached is not None:
+        return Response(content=cached, media_type="audio/wav")
+
+    if chunked:
+        pcm = iter_gemini_tts_chunked_pcm(text, voice, style, pause_sec=pause)
+    else:
+        pcm = stream_gemini_tts_pcm(text, voice, style)
+    # The whole preview is cached (with real RIFF sizes) once it has been streamed completely,
+    # so a replay or download is served from the cache
+    on_complete = lambda frames: tts_cache.put(key, "wav", write_wav(frames))
+
+    # Pull the first chunk here so setup errors (API key, quota) still become an HTTP error
+    try:
+        first = next(pcm)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    def body():
+        received = [first]
+        yield streaming_wav_header()
+        yield first
+        for chunk in pcm:
+            received.append(chunk)
+            yield chunk
+        on_complete(b"".join(received))
+
+    return StreamingResponse(body(), media_type="audio/wav", headers={"Cache-Control": "no-cache"})
+
+@app.get("/api/tts/metrics")
+def get_tts_metrics():
+    """TTS cache usage, per-provider latency percentiles, hedging outcomes and speech-rate fits."""
+    from utils import tts_cache, tts_hedge, speech_model
+    return {"cache": tts_cache.stats(), **tts_hedge.stats(), "speech_rate": speech_model.stats()}
+
 @app.get("/projects/{project_id}/settings")
 def get_project_settings(project_id: str):
     project_path = os.path.join(PROJECTS_DIR, project_id)
@@ -180,6 +248,56 @@ def get_project_voice_files(project_id: str):
     project_path = os.path.join(PROJECTS_DIR, project_id)
     return list_voice_files(project_path, project_id)
 
+@app.get("/projects/{project_id}/peaks/{filename}")
+def get_audio_peaks(project_id: str, filename: str, width: Optional[int] = None, format: str = "json"):
+    """
+    Waveform min/max peaks of a project audio file (audio/ or output/).
+    JSON returns the zoom level closest to `width` peaks; format=bin returns the
+    whole multi-level sidecar.
+    """
+    from utils import waveform
+    project_path = os.path.join(PROJECTS_DIR, project_id)
+    filename = os.path.basename(filename)
+    path = next((p for p in (os.path.join(project_path, "audio", filename), os.path.join(project_path, "output", filename))
+                 if os.path.isfile(p)), None)
+    if not path:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    try:
+        if format == "bin":
+            sidecar = waveform.ensure(path)
+            if not sidecar:
+                raise HTTPException(status_code=503, detail="Waveform peaks unavailable")
+            return FileResponse(sidecar, media_type="application/octet-stream")
+        peaks = waveform.load(path, width=width)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Waveform peaks failed: {e}")
+    if peaks is None:
+        raise HTTPException(status_code=503, detail="Waveform peaks unavailable")
+    return peaks
+
+@app.get("/projects/{project_id}/thumb/{width}/{filename}")
+def get_image_thumbnail(project_id: str, width: int, filename: str, root: bool = False, v: Optional[str] = None):
+    """
+    WebP thumbnail of a project image (input/, or the project root with root=1, e.g. cover.jpg),
+    at the nearest fixed width >= width. Generated on first request and cached by
+    content hash; versioned URLs (?v=) may be cached by the browser indefinitely.
+    """
+    project_path = os.path.join(PROJECTS_DIR, project_id)
+    filename = os.path.basename(filename)
+    path = os.path.join(project_path, filename) if root else os.path.join(project_path, "input", filename)
+    if not os.path.isfile(path) or not thumbnails.is_image(path):
+        raise HTTPException(status_code=404, detail="Image not found")
+
+    try:
+        thumb = thumbnails.ensure(path, width)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Thumbnail failed: {e}")
+    cache_control = "public, max-age=31536000, immutable" if v else "no-cache"
+    return FileResponse(thumb, media_type="image/webp", headers={"Cache-Control": cache_control})
+
 class VoiceGenerateRequest(BaseModel):
     profile_id: str
     text: str
@@ -206,16 +324,17 @@ def generate_project_voice(project_id: str, request: VoiceGenerateRequest):
 
     try:
         from utils import tts_handler
-        result = tts_handler.generate_voice(
-            project_id=project_id,
-            project_path=project_path,
-            script_content=content,
-            profile_id=request.profile_id,
-            speed=request.speed,
-            provider=request.provider,
-            voice_name=request.voice,
-            style_instructions=request.style
-        )
+        with speculative.foreground(project_id):
+            result = tts_handler.generate_voice(
+                project_id=project_id,
+                project_path=project_path,
+                script_content=content,
+                profile_id=request.profile_id,
+                speed=request.speed,
+                provider=request.provider,
+                voice_name=request.voice,
+                style_instructions=request.style
+            )
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -226,9 +345,56 @@ def generate_project_voice(project_id: str, request: VoiceGenerateRequest):
     
     # Update project timestamp
     timestamp_update(project_path)
+    speculative.notify(project_id, project_path, "voice")
 
     return result
 
+class VoiceAuditionRequest(BaseModel):
+    voices: List[str] # VOICE_PROFILES or GEMINI_VOICES ids
+    text: Optional[str] = None
+    speed: float = 1.0
+    style: Optional[str] = None
+
+@app.post("/projects/{project_id}/voice/audition")
+def audition_project_voices(project_id: str, request: VoiceAuditionRequest):
+    """
+    Generates a variant per requested voice concurrently and streams one NDJSON line
+    per variant as it completes, then a final {"done": true} line.
+    Variants use the voice---{profile}---{speed}---{ts} naming; the active voice is not changed.
+    """
+    project_path = os.path.join(PROJECTS_DIR, project_id)
+    if not os.path.exists(project_path):
+        raise HTTPException(status_code=404, detail="Project not found")
+    if not request.voices:
+        raise HTTPException(status_code=400, detail="No voices selected.")
+
+    content = request.text or ""
+    if not content:
+        script_path = os.path.join(project_path, "script", "script.txt")
+        if os.path.exists(script_path):
+            with open(script_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+    if not content:
+        raise HTTPException(status_code=400, detail="Script content is empty.")
+
+    from utils import tts_handler
+    from core.global_settings import get_settings
+    max_workers = get_settings().voice.tts_max_concurrency
+
+    def stream():
+        ok = 0
+        with speculative.foreground(project_id):
+            for result in tts_handler.audition_voices(project_id, project_path, content, request.voices,
+                                                      speed=request.speed, style_instructions=request.style,
+                                                      max_workers=max_workers):
+                ok += result.get("status") == "OK"
+                yield json.dumps(result, ensure_ascii=False) + "\n"
+        if ok:
+            timestamp_update(project_path)
+        yield json.dumps({"done": True, "generated": ok, "requested": len(set(request.voices))}) + "\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
 def timestamp_update(project_path):
     project_json_path = os.path.join(project_path, "project.json")
     if os.path.exists(project_json_path):
@@ -263,6 +429,7 @@ def activate_project_voice(project_id: str, request: VoiceActivateRequest):
     success, msg = set_active_voice(project_path, request.filename)
     if not success:
         raise HTTPException(status_code=400, detail=msg)
+    speculative.notify(project_id, project_path, "voice")
     
     # Update project timestamp
     project_json_path = os.path.join(project_path, "project.json")
@@ -321,13 +488,12 @@ def dry_run_valication(project_id: str):
 
 # --- Music Support ---
 @app.get("/music/files")
-def list_music_files():
-    assets_dir = os.path.join(os.path.dirname(__file__), "assets", "music")
-    if not os.path.exists(assets_dir):
-        return []
-    valid_exts = {".mp3", ".wav"}
-    files = [f for f in os.listdir(assets_dir) if any(f.lower().endswith(ext) for ext in valid_exts)]
-    return sorted(files)
+def list_music_files(details: bool = False):
+    """Library track names, or full metadata (duration, loudness, energy, tempo) with ?details=true."""
+    from utils import music_library
+    if details:
+        return music_library.list_tracks()
+    return music_library.track_names()
 
 class MusicConfig(BaseModel):
     music_file: str
@@ -352,7 +518,8 @@ def mix_project_audio(project_id: str, config: MusicConfig):
     
     # Run Mixer
     music_file = config.music_file if config.enabled else "none"
-    result = mix_background_music(project_path, music_file, config.volume_adj)
+    with speculative.foreground(project_id):
+        result = mix_background_music(project_path, music_file, config.volume_adj)
     
     if result.get("status") == "FAIL":
         raise HTTPException(status_code=500, detail=result.get("error"))
@@ -375,13 +542,14 @@ def render_project_video(project_id: str, request: RenderRequest):
     # Generate custom output path
     output_file = project_utils.get_video_output_path(project_path)
 
-    result = render_video(
-        project_path, 
-        video_format=request.video_format,
-        transition_id=request.transition_id,
-        transition_duration=request.transition_duration,
-        output_file=output_file
-    )
+    with speculative.foreground(project_id):
+        result = render_video(
+            project_path, 
+            video_format=request.video_format,
+            transition_id=request.transition_id,
+            transition_duration=request.transition_duration,
+            output_file=output_file
+        )
     
     if result.get("status") == "FAIL":
         raise HTTPException(status_code=500, detail=result.get("error"))
@@ -484,7 +652,9 @@ def get_timeline_preview(project_id: str):
 
     # 2. Enrich with Crop Data
     from utils.crop_manager import load_crops
+    from utils import image_index
     crops_data = load_crops(project_path)
+    images_meta = image_index.entries(project_path)
     
     enriched_segments = []
     input_dir = os.path.join(project_path, "input")
@@ -505,14 +675,17 @@ def get_timeline_preview(project_id: str):
             img_path = os.path.join(input_dir, img_name)
             image_url = f"/media/{project_id}/input/{quote(img_name)}"
         
-        # Check existence
-        exists = os.path.exists(img_path)
+        # Check existence (input/ images from the index, root files like cover.jpg on disk)
+        meta = None if raw_img_name.startswith("../") else images_meta.get(img_name)
+        exists = meta is not None or (raw_img_name.startswith("../") and os.path.exists(img_path))
         if not exists:
             print(f"DEBUG: Segment {i} asset MISSING: {img_path}")
             
         # Get actual dimensions to help frontend draw boxes
         w, h = 0, 0
-        if exists:
+        if meta:
+            w, h = meta.get("width", 0), meta.get("height", 0)
+        elif exists:
             try:
                 from PIL import Image
                 with Image.open(img_path) as img:
@@ -524,14 +697,19 @@ def get_timeline_preview(project_id: str):
             **seg,
             "crop_data": crops_data.get(img_name),
             "dimensions": {"w": w, "h": h},
-            "image_url": image_url
+            "image_url": image_url,
+            "thumb_url": thumbnails.thumb_url(project_id, raw_img_name, width=640, source_path=img_path,
+                                              version=meta["mtime_ns"] if meta else None) if exists else None
         })
 
-    # 3. Add Audio URL (voice.mp3)
+    # 3. Add Audio URL (voice.wav, or voice.mp3 for older projects)
+    from utils.voice_paths import raw_voice_path
     audio_url = None
-    voice_path = os.path.join(project_path, "audio", "voice.mp3")
-    if os.path.exists(voice_path):
-        audio_url = f"/media/{project_id}/audio/voice.mp3"
+    peaks_url = None
+    voice_path = raw_voice_path(project_path)
+    if voice_path:
+        audio_url = f"/media/{project_id}/audio/{os.path.basename(voice_path)}"
+        peaks_url = f"/projects/{project_id}/peaks/{os.path.basename(voice_path)}"
     else:
         print(f"DEBUG: Preview VOICE missing: {voice_path}")
 
@@ -541,7 +719,8 @@ def get_timeline_preview(project_id: str):
         "intro_duration": timeline.get("silence_start_duration"),
         "outro_duration": timeline.get("silence_end_duration"),
         "segments": enriched_segments,
-        "audio_url": audio_url
+        "audio_url": audio_url,
+        "peaks_url": peaks_url
     }
 
 @app.get("/projects/{project_id}/logs")
@@ -562,10 +741,18 @@ class ImageProcessRequest(BaseModel):
     mode: str = "fit" # fit, fill, normalize
     bg_color: str = "#000000"
     ai_smart_crop: bool = False
+    roi_detector: Optional[str] = None # local, gemini, auto (None = smart_crop setting)
+    stream: bool = False # NDJSON: one line per image as it finishes, then {"done": true}
+
+def _check_roi_detector(roi_detector):
+    from utils.image_processor import ROI_DETECTORS
+    if roi_detector is not None and roi_detector not in ROI_DETECTORS:
+        raise HTTPException(status_code=400, detail=f"roi_detector must be one of {', '.join(ROI_DETECTORS)}")
 
 @app.post("/projects/{project_id}/images/process")
 def process_project_images(project_id: str, request: ImageProcessRequest):
-    from utils.image_processor import process_batch_images
+    from utils.image_processor import process_batch_images, iter_batch_images
+    from utils import image_index
     project_path = os.path.join(PROJECTS_DIR, project_id)
     
     target_images = request.images
@@ -582,21 +769,43 @@ def process_project_images(project_id: str, request: ImageProcessRequest):
              
     if not target_images:
         raise HTTPException(status_code=400, detail="No images selected")
+    _check_roi_detector(request.roi_detector)
         
     config = {
         "width": request.width,
         "height": request.height,
         "mode": request.mode,
         "bg_color": request.bg_color,
-        "ai_smart_crop": request.ai_smart_crop
+        "ai_smart_crop": request.ai_smart_crop,
+        "roi_detector": request.roi_detector
     }
     
-    results = process_batch_images(project_path, target_images, config)
+    if request.stream:
+        def stream():
+            ok = 0
+            with speculative.foreground(project_id):
+                for result in iter_batch_images(project_path, target_images, config):
+                    image_index.update(project_path, result["name"])
+                    ok += result.get("status") == "OK"
+                    yield json.dumps(result, ensure_ascii=False) + "\n"
+            timestamp_update(project_path)
+            speculative.notify(project_id, project_path, "images")
+            yield json.dumps({"done": True, "processed": ok, "requested": len(set(target_images))}) + "\n"
+
+        return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+    with speculative.foreground(project_id):
+        results = process_batch_images(project_path, target_images, config)
+    for result in results:
+        image_index.update(project_path, result["name"])
     timestamp_update(project_path)
+    speculative.notify(project_id, project_path, "images")
     return {"results": results}
 
 @app.post("/projects/{project_id}/upload/image")
-def upload_project_image(project_id: str, file: UploadFile = File(...), auto_normalize: bool = True, ai_smart_crop: bool = False):
+def upload_project_image(project_id: str, file: UploadFile = File(...), auto_normalize: bool = True, ai_smart_crop: bool = False,
+                         roi_detector: Optional[str] = None):
+    _check_roi_detector(roi_detector)
     project_path = os.path.join(PROJECTS_DIR, project_id)
     input_dir = os.path.join(project_path, "input")
     backup_dir = os.path.join(input_dir, "backups")
@@ -610,6 +819,7 @@ def upload_project_image(project_id: str, file: UploadFile = File(...), auto_nor
     if os.path.exists(file_path):
         import shutil
         shutil.copy2(file_path, backup_path)
+        thumbnails.invalidate(file_path)
         log_event(project_path, "asset_edit.log", f"Backed up {file.filename} before overwrite")
 
     try:
@@ -620,12 +830,15 @@ def upload_project_image(project_id: str, file: UploadFile = File(...), auto_nor
         # 2. Auto-Normalize if requested
         if auto_normalize:
             from utils.image_processor import normalize_asset
-            normalize_asset(project_path, file.filename, ai_smart_crop=ai_smart_crop)
+            normalize_asset(project_path, file.filename, ai_smart_crop=ai_smart_crop, roi_detector=roi_detector)
             log_event(project_path, "asset_edit.log", f"Auto-Normalized {file.filename} (AI={ai_smart_crop})")
-            
+
+        from utils import image_index
+        image_index.update(project_path, file.filename)
     except Exception as e:
          raise HTTPException(status_code=500, detail=f"Failed to save/normalize file: {e}")
          
+    speculative.notify(project_id, project_path, "images")
     return {"status": "OK", "filename": file.filename, "backed_up": os.path.exists(backup_path), "normalized": auto_normalize}
 
 @app.delete("/projects/{project_id}/assets/{filename}")
@@ -638,9 +851,12 @@ def delete_project_asset(project_id: str, filename: str):
         raise HTTPException(status_code=404, detail="File not found")
         
     try:
+        thumbnails.invalidate(file_path)
         os.remove(file_path)
         if os.path.exists(backup_path):
             os.remove(backup_path)
+        from utils import image_index
+        image_index.remove(project_path, filename)
         log_event(project_path, "asset_edit.log", f"Deleted asset: {filename}")
         return {"status": "OK"}
     except Exception as e:
@@ -657,8 +873,12 @@ def restore_project_asset(project_id: str, filename: str):
         
     try:
         import shutil
+        thumbnails.invalidate(file_path)
         shutil.copy2(backup_path, file_path)
+        from utils import image_index
+        image_index.update(project_path, filename)
         log_event(project_path, "asset_edit.log", f"Restored original asset: {filename}")
+        speculative.notify(project_id, project_path, "images")
         return {"status": "OK"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -702,7 +922,8 @@ def run_pipeline_step(project_id: str, request: PipelineStepRequest):
             raise PipelineError("INVALID_STEP", f"Step '{request.step_name}' is not recognized", message_th=f"ไม่พบขั้นตอน '{request.step_name}' ในระบบ")
 
         # Run the step
-        step_obj.run(project_id, project_path)
+        with speculative.foreground(project_id):
+            step_obj.run(project_id, project_path)
         set_done(project_path, f"{request.step_name}.done")
 
         # RELOAD project.json to capture changes made by step.run()
@@ -790,6 +1011,44 @@ def get_background_tasks():
     from upload.downloader import get_active_tasks
     return get_active_tasks()
 
+@app.get("/api/tasks/speculative")
+def get_speculative_tasks():
+    return speculative.status()
+
+# --- Live Events (Server-Sent Events) ---
+# Push replacement for polling pipeline/status, tasks/background and logs.
+# Each stream starts with a snapshot of the current state, then forwards
+# job, render_progress, download and log events as they happen.
+# ?types=job,download narrows a stream to the listed event types.
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+def _event_types(types):
+    return [t.strip() for t in types.split(",") if t.strip()] if types else None
+
+@app.get("/projects/{project_id}/events")
+async def project_events(project_id: str, request: Request, types: Optional[str] = None):
+    from core.events import event_bus
+    job = runner.get_job(project_id)
+    initial = [{"type": "job", "project_id": project_id, "data": job or {"status": "idle"}}]
+    return StreamingResponse(
+        event_bus.stream(project_id, request.is_disconnected, initial=initial, types=_event_types(types)),
+        media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
+@app.get("/events")
+async def global_events(request: Request, types: Optional[str] = None):
+    from core.events import event_bus, GLOBAL_CHANNEL
+    from upload.downloader import get_active_tasks
+    initial = [
+        {"type": "download", "project_id": task.get("project_id"), "data": {"task_id": task_id, **task}}
+        for task_id, task in list(get_active_tasks().items())
+    ]
+    return StreamingResponse(
+        event_bus.stream(GLOBAL_CHANNEL, request.is_disconnected, initial=initial, types=_event_types(types)),
+        media_type="text/event-stream", headers=SSE_HEADERS
+    )
+
 
 # Project Management
 # Project Management
@@ -979,6 +1238,10 @@ def run_pipeline_auto(project_id: str):
 
     execution_results = []
     
+    # Resolve settings once so every step of this run sees the same values
+    from core.run_context import RunContext
+    ctx = RunContext.resolve(project_path, project_id)
+    
     for step in STEP_REGISTRY:
         # Skip if disabled
         if step.step_id in disabled_steps:
@@ -997,7 +1260,8 @@ def run_pipeline_auto(project_id: str):
         # For this refactor, let's just use the step object directly.
         try:
             # We need to manually handle the project.json update here or share a helper
-            step.run(project_id, project_path)
+            with speculative.foreground(project_id):
+                step.run(project_id, project_path, ctx)
             set_done(project_path, f"{step.step_id}.done")
             
             # Record success in project.json
@@ -1277,7 +1541,7 @@ def set_project_cover(project_id: str, request: CoverSetRequest):
         from utils.image_processor import render_cover_overlay
         render_cover_overlay(project_path, text_overlay)
 
-
+    speculative.notify(project_id, project_path, "images")
     return {"status": "OK", "cover_url": f"/media/{project_id}/{cover_filename}?t={datetime.now().timestamp()}"}
 
 class CoverOptionsRequest(BaseModel):
@@ -1342,6 +1606,7 @@ async def upload_project_cover(project_id: str, file: UploadFile = File(...), us
             
             with open(json_path, 'w') as f: json.dump(data, f, indent=2)
             
+        speculative.notify(project_id, project_path, "images")
         return {"status": "OK", "cover_url": f"/media/{project_id}/{cover_filename}?t={datetime.now().timestamp()}"}
     except Exception as e:
          raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
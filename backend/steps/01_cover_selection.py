@@ -9,7 +9,7 @@ class CoverSelectionStep(PipelineStep):
     def __init__(self):
         super().__init__("01_cover_selection", "Select Cover image")
 
-    def run(self, project_id: str, project_path: str) -> bool:
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
         log_event(project_path, "pipeline.log", "[STEP 01] Selecting cover image (Goal: 2nd Image)...")
         
         input_dir = os.path.join(project_path, "input")
@@ -10,8 +10,9 @@ class TextHookStep(PipelineStep):
     def __init__(self):
         super().__init__("02_text_hook", "Generate Hook & Overlay")
 
-    def run(self, project_id: str, project_path: str) -> bool:
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
         log_event(project_path, "pipeline.log", "[STEP 02] Generating AI Hook for cover...")
+        ctx = self.resolve_context(project_id, project_path, ctx)
         
         project_json_path = os.path.join(project_path, "project.json")
         if not os.path.exists(project_json_path):
@@ -20,23 +21,11 @@ class TextHookStep(PipelineStep):
         with open(project_json_path, 'r') as f:
             data = json.load(f)
             
-        # Try to get product_name from input/product.json first, then project.json
-        product_name = None
-        product_json_path = os.path.join(project_path, "input", "product.json")
-        if os.path.exists(product_json_path):
-            try:
-                with open(product_json_path, 'r') as f:
-                    product_data = json.load(f)
-                    product_name = product_data.get("product_name")
-            except:
-                pass
-        
-        # Fallback to project.json
-        if not product_name:
-            product_name = data.get("product_name", "น่าสนใจ")
+        # product_name from input/product.json first, then project.json
+        product_name = ctx.product_name("น่าสนใจ")
         
         # 1. Generate Hook Text
-        res = generate_cover_text_ai(project_path, product_name)
+        res = generate_cover_text_ai(project_path, product_name, settings=ctx.settings)
         
         # Initialize with default styling
         text_overlay = {
@@ -65,7 +54,7 @@ class TextHookStep(PipelineStep):
             
         # 2. Render Overlay
         log_event(project_path, "pipeline.log", f"[STEP 02] Rendering overlay: {text_overlay['title']}")
-        render_res = render_cover_overlay(project_path, text_overlay)
+        render_res = render_cover_overlay(project_path, text_overlay, settings=ctx.settings)
         
         if render_res.get("status") == "FAIL":
             log_event(project_path, "pipeline.log", f"[STEP 02] WARN: Overlay failed: {render_res.get('error')}")
@@ -8,10 +8,10 @@ class ScriptGenStep(PipelineStep):
     def __init__(self):
         super().__init__("03_script_gen", "Auto generate Script")
 
-    def run(self, project_id: str, project_path: str) -> bool:
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
         log_event(project_path, "pipeline.log", "[STEP 03] Generating script...")
         
-        script, success = generate_script(project_id, project_path)
+        script, success = generate_script(project_id, project_path, ctx=self.resolve_context(project_id, project_path, ctx))
         
         if not success:
             log_event(project_path, "pipeline.log", "[STEP 03] WARN: Script generation used fallback.")
@@ -3,14 +3,17 @@ import random
 from core.logger import log_event
 from core.errors import TTSError
 from core.step_base import PipelineStep
-from core.global_settings import get_settings
 from utils.tts_handler import generate_voice, get_voice_profiles
+from utils import speech_model
+
+# Providers whose API has a speaking-rate control
+SPEED_CONTROL_PROVIDERS = ("openai",)
 
 class TTSStep(PipelineStep):
     def __init__(self):
         super().__init__("04_tts", "Generate Neural Voice")
 
-    def run(self, project_id: str, project_path: str) -> bool:
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
         log_event(project_path, "pipeline.log", "[STEP 04] Generating voiceover...")
         
         script_path = os.path.join(project_path, "script", "script.txt")
@@ -20,9 +23,9 @@ class TTSStep(PipelineStep):
         with open(script_path, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # Use default voice profile from global settings
-        settings = get_settings()
-        profile_id = settings.voice.default_voice_profile
+        # Use default voice profile from global settings (as resolved for this run)
+        ctx = self.resolve_context(project_id, project_path, ctx)
+        profile_id = ctx.settings.voice.default_voice_profile
         
         # If random, pick a random voice from available profiles
         if profile_id == "random":
@@ -31,7 +34,42 @@ class TTSStep(PipelineStep):
             profile_id = selected_profile["id"]
             log_event(project_path, "pipeline.log", f"[STEP 04] Randomly selected voice: {selected_profile['name']} ({profile_id})")
         
-        result = generate_voice(project_id, project_path, content, profile_id=profile_id, speed=1.0)
+        speed = self._fit_speed(project_path, content, profile_id, ctx)
+        result = generate_voice(project_id, project_path, content, profile_id=profile_id, speed=speed, ctx=ctx)
+        if result.get("status") != "OK":
+            raise TTSError("Voice generation failed", message_th="สร้างเสียงพากย์ไม่สำเร็จ", detail=result.get("error"))
+        if not result.get("activated"):
+            # Step 05 processes voice.wav: don't let it pick up a stale or missing one
+            raise TTSError("Generated voice could not be set as active", message_th="ไม่สามารถตั้งเสียงพากย์ที่สร้างเป็นเสียงหลักได้",
+                           detail=result.get("filename"))
+        if result.get("backup"):
+            log_event(project_path, "pipeline.log", f"[STEP 04] Voice came from the hedge backup ({result.get('provider')}/{result.get('voice')})")
         
         log_event(project_path, "pipeline.log", f"[STEP 04] Completed: {result['filename']}")
         return True
+
+    def _fit_speed(self, project_path, content, profile_id, ctx):
+        """
+        Predicts the voice length before any API call. If it won't fit the video
+        duration (and would be trimmed), speeds up providers that support it,
+        up to settings.voice.auto_speed_max; otherwise just warns.
+        """
+        provider, voice = speech_model.resolve_voice(profile_id)
+        predicted, source = speech_model.predict_total(provider, voice, 1.0, content, ctx.breathing_pause,
+                                                       ctx.voice_intro_silence, ctx.voice_outro_silence, ctx.sentence_pause)
+        max_duration = ctx.max_duration
+        log_event(project_path, "pipeline.log", f"[STEP 04] Predicted voice length: {predicted:.1f}s ({source}), max {max_duration}s")
+        if predicted <= max_duration:
+            return 1.0
+
+        max_speed = ctx.settings.voice.auto_speed_max
+        if provider in SPEED_CONTROL_PROVIDERS and max_speed > 1.0:
+            fixed = predicted - speech_model.predict_speech(provider, voice, 1.0, content)[0]
+            needed = (predicted - fixed) / max(0.1, max_duration - fixed)
+            speed = round(min(max_speed, needed), 2)
+            log_event(project_path, "pipeline.log", f"[STEP 04] Speeding voice up to {speed}x to fit {max_duration}s")
+            return speed
+
+        log_event(project_path, "pipeline.log",
+                  f"[STEP 04] [WARNING] Voice is predicted to exceed {max_duration}s by {predicted - max_duration:.1f}s and will be trimmed")
+        return 1.0
@@ -8,10 +8,10 @@ class TimelineGenStep(PipelineStep):
     def __init__(self):
         super().__init__("06_timeline_gen", "Generate New Timeline")
 
-    def run(self, project_id: str, project_path: str) -> bool:
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
         log_event(project_path, "pipeline.log", "[STEP 06] Generating timeline...")
         
-        result = build_timeline(project_path)
+        result = build_timeline(project_path, ctx=self.resolve_context(project_id, project_path, ctx))
         
         if result.get("status") == "FAIL":
             raise PipelineError(f"Timeline failed: {result.get('error')}", message_th="สร้างไทม์ไลน์ไม่สำเร็จ")
@@ -8,7 +8,7 @@ class DryRunStep(PipelineStep):
     def __init__(self):
         super().__init__("07_dryrun", "Run Diagnostics (Dryrun)")
 
-    def run(self, project_id: str, project_path: str) -> bool:
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
         log_event(project_path, "pipeline.log", "[STEP 07] Running diagnostics...")
         
         report = validate_render(project_path)
@@ -10,21 +10,19 @@ class RenderStep(PipelineStep):
     def __init__(self):
         super().__init__("08_render", "Final Video Render")
 
-    def run(self, project_id: str, project_path: str) -> bool:
+    def run(self, project_id: str, project_path: str, ctx=None) -> bool:
         log_event(project_path, "pipeline.log", "[STEP 08] Starting final video rendering...")
         
         project_json_path = os.path.join(project_path, "project.json")
+        ctx = self.resolve_context(project_id, project_path, ctx)
         video_format = "portrait"
         transition_id = "none"
         transition_duration = 0.5
         
-        if os.path.exists(project_json_path):
-            with open(project_json_path, 'r') as f:
-                pdata = json.load(f)
-                v_set = pdata.get("settings", {}).get("video", {})
-                video_format = v_set.get("format", "portrait")
-                transition_id = v_set.get("transition", "slideright") # Use slideright as default for premium feel
-                transition_duration = v_set.get("transition_duration", 1.0)
+        if ctx.has_project_json:
+            video_format = ctx.video_format
+            transition_id = ctx.transition_id # Defaults to slideright for premium feel
+            transition_duration = ctx.transition_duration
 
         from core.project import get_video_output_path
         output_file = get_video_output_path(project_path)
@@ -0,0 +1,81 @@
+import os
+import re
+import sys
+import subprocess
+
+# Measures cold import time of the API module with `python -X importtime`
+# and fails (exit 1) if it exceeds the budget. Run from anywhere:
+#   python backend/tools/import_benchmark.py [module] [--budget-ms N] [--top N]
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_MODULE = "main"
+DEFAULT_BUDGET_MS = 1000
+
+# Modules that must not be imported at startup (loaded lazily on first use)
+LAZY_MODULES = [
+    "google.generativeai",
+    "google.genai",
+    "gtts",
+    "pydub",
+    "steps",
+]
+
+LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+def measure(module=DEFAULT_MODULE):
+    """Returns {module_name: (self_us, cumulative_us)} for a fresh interpreter importing `module`."""
+    env = os.environ.copy()
+    env["PYTHONDONTWRITEBYTECODE"] = "1"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, env=env
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed:\n{result.stderr[-2000:]}")
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        m = LINE_RE.match(line)
+        if m:
+            timings[m.group(4)] = (int(m.group(1)), int(m.group(2)))
+    return timings
+
+def main(argv):
+    module = DEFAULT_MODULE
+    budget_ms = DEFAULT_BUDGET_MS
+    top = 15
+
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == "--budget-ms":
+            budget_ms = float(args.pop(0))
+        elif arg == "--top":
+            top = int(args.pop(0))
+        else:
+            module = arg
+
+    timings = measure(module)
+    total_ms = timings.get(module, (0, 0))[1] / 1000.0
+
+    print(f"Slowest imports for '{module}' (cumulative):")
+    for name, (self_us, cum_us) in sorted(timings.items(), key=lambda kv: kv[1][1], reverse=True)[:top]:
+        print(f"  {cum_us / 1000.0:8.1f} ms  {name}")
+
+    eager = [m for m in LAZY_MODULES if any(n == m or n.startswith(m + ".") for n in timings)]
+    ok = True
+    if eager:
+        ok = False
+        print(f"FAIL: lazily-loaded modules imported at startup: {', '.join(eager)}")
+
+    print(f"Total: {total_ms:.1f} ms (budget {budget_ms:.0f} ms)")
+    if total_ms > budget_ms:
+        ok = False
+        print("FAIL: import time over budget")
+
+    if ok:
+        print("OK")
+    return 0 if ok else 1
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
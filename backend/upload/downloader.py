@@ -6,6 +6,7 @@ from datetime import datetime
 from core.config import PROJECTS_DIR
 from core.logger import log_event
 from core.state import set_done
+from core.events import publish
 
 # Global status tracker for background tasks
 active_tasks = {}
@@ -25,10 +26,12 @@ def download_images_from_urls(project_id, urls):
         "status": "downloading",
         "started_at": datetime.now().isoformat()
     }
+    publish(project_id, "download", {"task_id": task_id, **active_tasks[task_id]})
     
     if not os.path.exists(project_path):
         active_tasks[task_id]["status"] = "failed"
         active_tasks[task_id]["error"] = "Project directory not found"
+        publish(project_id, "download", {"task_id": task_id, **active_tasks[task_id]})
         return None
     
     results = []
@@ -75,6 +78,15 @@ def download_images_from_urls(project_id, urls):
                 for chunk in response.iter_content(chunk_size=8192):
                     f.write(chunk)
             
+            from utils import image_index
+            image_index.update(project_path, final_filename)
+            # Flag near-duplicates of images already in the project (the timeline skips them)
+            from core.global_settings import get_settings
+            groups = image_index.duplicates(project_path, get_settings().video.duplicate_max_distance)
+            status["duplicate_of"] = image_index.duplicate_of(groups).get(final_filename)
+            if status["duplicate_of"]:
+                log_event(project_path, "pipeline.log", f"[DOWNLOAD] {final_filename} is a near-duplicate of {status['duplicate_of']}")
+
             status["success"] = True
             status["filename"] = final_filename
             success_count += 1
@@ -82,6 +94,7 @@ def download_images_from_urls(project_id, urls):
             
             # Update background task tracker
             active_tasks[task_id]["completed"] = success_count
+            publish(project_id, "download", {"task_id": task_id, **active_tasks[task_id]})
             
         except Exception as e:
             status["error"] = str(e)
@@ -91,9 +104,12 @@ def download_images_from_urls(project_id, urls):
 
     active_tasks[task_id]["status"] = "completed"
     active_tasks[task_id]["finished_at"] = datetime.now().isoformat()
+    publish(project_id, "download", {"task_id": task_id, **active_tasks[task_id]})
 
     if success_count > 0:
         set_done(project_path, "upload.done")
+        from core.speculative import speculative
+        speculative.notify(project_id, project_path, "images")
             
     return {"results": results, "success_count": success_count}
 
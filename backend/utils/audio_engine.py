@@ -0,0 +1,203 @@
+import os
+import shutil
+import subprocess
+import wave
+
+try:
+    import numpy as np
+except ImportError: # pydub fallback in audio_mixer
+    np = None
+
+# Small NumPy mixing engine used by audio_mixer.
+# Audio is handled as float32 arrays shaped (frames, channels) in [-1, 1].
+# The mix is produced block by block: the music track is looped with modulo
+# indexing (no tiled copy), gain/fades/ducking are applied in place on each
+# block, and each block is written to the output WAV before the next one.
+
+MIX_RATE = 44100
+MIX_CHANNELS = 2
+BLOCK_SEC = 1.0
+
+# Sidechain ducking defaults (music is pulled down while the voice is active)
+DUCK_THRESHOLD_DB = -40.0  # Voice level where ducking starts
+DUCK_DEPTH_DB = 10.0       # Maximum reduction applied to the music
+DUCK_RANGE_DB = 15.0       # Voice level above threshold that reaches full depth
+DUCK_ATTACK_SEC = 0.05
+DUCK_RELEASE_SEC = 0.40
+ENVELOPE_HOP_SEC = 0.01
+
+def available():
+    return np is not None
+
+def db_to_gain(db):
+    return 10.0 ** (db / 20.0)
+
+# --- Decoding ---
+
+def _read_wav(path):
+    """Native PCM WAV reader (8/16/24/32-bit). Returns (float32 array (n, ch), rate)."""
+    with wave.open(path, 'rb') as wav_file:
+        channels = wav_file.getnchannels()
+        width = wav_file.getsampwidth()
+        rate = wav_file.getframerate()
+        raw = wav_file.readframes(wav_file.getnframes())
+
+    if width == 1:
+        data = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        data = np.frombuffer(raw, dtype="<i2").astype(np.float32) / 32768.0
+    elif width == 3:
+        b = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3).astype(np.int32)
+        ints = b[:, 0] | (b[:, 1] << 8) | (b[:, 2] << 16)
+        ints = np.where(ints & 0x800000, ints - 0x1000000, ints)
+        data = ints.astype(np.float32) / 8388608.0
+    elif width == 4:
+        data = np.frombuffer(raw, dtype="<i4").astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"Unsupported WAV sample width: {width}")
+    return data.reshape(-1, channels), rate
+
+def _decode_ffmpeg(path, rate, channels):
+    cmd = ["ffmpeg", "-v", "error", "-i", path, "-f", "f32le", "-ac", str(channels), "-ar", str(rate), "-"]
+    result = subprocess.run(cmd, capture_output=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg decode failed: {result.stderr.decode('utf-8', 'ignore')[-200:]}")
+    return np.frombuffer(result.stdout, dtype="<f4").reshape(-1, channels).copy()
+
+def resample(data, src_rate, dst_rate):
+    """Linear-interpolation resampler (used only when ffmpeg isn't available)."""
+    if src_rate == dst_rate or len(data) == 0:
+        return data
+    n_out = int(round(len(data) * dst_rate / src_rate))
+    positions = np.arange(n_out, dtype=np.float64) * (src_rate / dst_rate)
+    src_index = np.arange(len(data), dtype=np.float64)
+    out = np.empty((n_out, data.shape[1]), dtype=np.float32)
+    for ch in range(data.shape[1]):
+        out[:, ch] = np.interp(positions, src_index, data[:, ch])
+    return out
+
+def match_channels(data, channels):
+    if data.shape[1] == channels:
+        return data
+    if data.shape[1] == 1:
+        return np.repeat(data, channels, axis=1)
+    mono = data.mean(axis=1, keepdims=True)
+    return mono if channels == 1 else np.repeat(mono, channels, axis=1)
+
+def load_audio(path, rate=MIX_RATE, channels=MIX_CHANNELS):
+    """
+    Decodes any file to float32 (frames, channels) at the given rate.
+    WAV is read natively; other formats need ffmpeg.
+    """
+    if path.lower().endswith(".wav"):
+        try:
+            data, src_rate = _read_wav(path)
+            if src_rate != rate and shutil.which("ffmpeg"):
+                return _decode_ffmpeg(path, rate, channels)
+            return match_channels(resample(data, src_rate, rate), channels)
+        except wave.Error:
+            pass # e.g. float WAV; let ffmpeg handle it
+    if not shutil.which("ffmpeg"):
+        raise RuntimeError(f"Cannot decode {os.path.basename(path)} without ffmpeg")
+    return _decode_ffmpeg(path, rate, channels)
+
+# --- Processing ---
+
+def rms_envelope_db(data, rate, hop_sec=ENVELOPE_HOP_SEC):
+    """RMS level (dBFS) of the mono downmix per hop. Returns (levels_db, hop_frames)."""
+    hop = max(1, int(rate * hop_sec))
+    mono = data.mean(axis=1) if data.shape[1] > 1 else data[:, 0]
+    n_hops = int(np.ceil(len(mono) / hop)) if len(mono) else 0
+    padded = np.zeros(n_hops * hop, dtype=np.float32)
+    padded[:len(mono)] = mono
+    frames = padded.reshape(n_hops, hop)
+    rms = np.sqrt(np.mean(frames * frames, axis=1) + 1e-12)
+    return 20.0 * np.log10(rms), hop
+
+def duck_gain_curve(voice, rate, threshold_db=DUCK_THRESHOLD_DB, depth_db=DUCK_DEPTH_DB,
+                    range_db=DUCK_RANGE_DB, attack_sec=DUCK_ATTACK_SEC, release_sec=DUCK_RELEASE_SEC):
+    """
+    Envelope-follower sidechain: per-hop linear gain for the music, driven by the voice RMS.
+    Returns (gains, hop_frames).
+    """
+    levels, hop = rms_envelope_db(voice, rate)
+    if len(levels) == 0:
+        return np.ones(0, dtype=np.float32), hop
+    target_db = -depth_db * np.clip((levels - threshold_db) / range_db, 0.0, 1.0)
+
+    # One-pole smoothing: fast when ducking down (attack), slow when recovering (release)
+    hop_sec = hop / rate
+    a_att = np.exp(-hop_sec / max(attack_sec, 1e-6))
+    a_rel = np.exp(-hop_sec / max(release_sec, 1e-6))
+    smoothed = np.empty_like(target_db)
+    current = 0.0
+    for i, t in enumerate(target_db):
+        coeff = a_att if t < current else a_rel
+        current = coeff * current + (1.0 - coeff) * t
+        smoothed[i] = current
+    return db_to_gain(smoothed).astype(np.float32), hop
+
+def _fade_ramp(start, count, total, fade_frames):
+    """Combined fade-in/fade-out multiplier for output frames [start, start+count)."""
+    idx = np.arange(start, start + count, dtype=np.float32)
+    fade_in = np.minimum(idx / fade_frames, 1.0)
+    fade_out = np.minimum((total - idx) / fade_frames, 1.0)
+    return np.clip(np.minimum(fade_in, fade_out), 0.0, 1.0)
+
+def _to_int16(block):
+    np.clip(block, -1.0, 1.0, out=block)
+    return (block * 32767.0).astype("<i2").tobytes()
+
+def mix(voice, music, output_path, rate=MIX_RATE, voice_gain=1.0, music_gain=1.0,
+        fade_sec=0.5, duck=True, block_sec=BLOCK_SEC):
+    """
+    Mixes voice with looped music into a 16-bit WAV at output_path, block by block.
+    voice/music are float32 (frames, channels) arrays at `rate` with equal channel counts;
+    music may be a read-only memmap. Output length = voice length.
+    Returns the output duration in seconds.
+    """
+    total = len(voice)
+    channels = voice.shape[1]
+    block = max(1, int(rate * block_sec))
+
+    has_music = music is not None and len(music) > 0 and music_gain > 0
+    if has_music:
+        music_len = len(music)
+        fade_frames = max(1, int(rate * fade_sec))
+        use_fades = total > fade_frames * 2
+        if duck:
+            duck_gains, hop = duck_gain_curve(voice, rate)
+            hop_centers = (np.arange(len(duck_gains), dtype=np.float64) + 0.5) * hop
+
+    with wave.open(output_path, 'wb') as out:
+        out.setnchannels(channels)
+        out.setsampwidth(2)
+        out.setframerate(rate)
+
+        for start in range(0, total, block):
+            count = min(block, total - start)
+            out_block = voice[start:start + count].copy()
+            if voice_gain != 1.0:
+                out_block *= voice_gain
+
+            if has_music:
+                # Modulo indexing loops the track without building a tiled copy
+                positions = np.arange(start, start + count) % music_len
+                music_block = np.asarray(music[positions], dtype=np.float32)
+
+                gain = np.full(count, music_gain, dtype=np.float32)
+                if use_fades:
+                    gain *= _fade_ramp(start, count, total, fade_frames)
+                if duck and len(duck_gains):
+                    gain *= np.interp(np.arange(start, start + count, dtype=np.float64),
+                                      hop_centers, duck_gains).astype(np.float32)
+                music_block *= gain[:, None]
+                out_block += music_block
+
+            out.writeframes(_to_int16(out_block))
+
+    return total / float(rate)
+
+def write_wav(data, output_path, rate=MIX_RATE, voice_gain=1.0, block_sec=BLOCK_SEC):
+    """Voice-only output (optional gain), streamed in blocks like mix()."""
+    return mix(data, None, output_path, rate=rate, voice_gain=voice_gain, block_sec=block_sec)
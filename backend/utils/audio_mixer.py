@@ -1,111 +1,71 @@
 import os
 import math
 import json
-from pydub import AudioSegment
 from core.logger import log_event
 from utils.tts_handler import get_actual_duration
 
-def mix_background_music(project_path, music_filename=None, bgm_volume_adj=None):
+def mix_background_music(project_path, music_filename=None, bgm_volume_adj=None, ctx=None):
     """
-    Mixes voice.mp3 with a background music file.
+    Mixes the voice (voice_processed.wav / voice.wav) with a background music file.
     Respects project settings for gain and ducking if available.
+    Explicit arguments (legacy or manual override) win over the run context.
     """
+    result = _mix(project_path, music_filename, bgm_volume_adj, ctx)
+    if result.get("status") in ("OK", "WARNING") and os.path.exists(result.get("output", "")):
+        # Waveform peaks for the timeline preview
+        from utils.waveform import ensure_quietly
+        ensure_quietly(result["output"], project_path)
+    return result
+
+def _mix(project_path, music_filename, bgm_volume_adj, ctx):
     try:
         # Runtime Path Fix for FFmpeg
         base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         bin_dir = os.path.join(base_dir, "bin")
         if os.path.exists(bin_dir):
             os.environ["PATH"] = bin_dir + os.pathsep + os.environ.get("PATH", "")
-            from pydub import AudioSegment
-            AudioSegment.converter = os.path.join(bin_dir, "ffmpeg")
 
-        # Load Settings from project.json
-        settings_gain_voice = 1.0
-        settings_gain_music = 0.2
-        settings_ducking = True
-        
-        project_json_path = os.path.join(project_path, "project.json")
-        if os.path.exists(project_json_path):
-            with open(project_json_path, 'r') as f:
-                pdata = json.load(f)
-                
-            # If arguments are passed (legacy or manual override), use them. 
-            # Otherwise fall back to settings.
-            
-            # Mix Settings (Legacy)
-            mix_settings = pdata.get("settings", {}).get("mix", {})
-            settings_gain_voice = mix_settings.get("voice_gain", 1.0)
-            settings_gain_music = mix_settings.get("music_gain", 0.2)
-            
-            # Music Settings (Legacy)
-            music_settings = pdata.get("settings", {}).get("music", {})
-            legacy_track = music_settings.get("track", "")
-            
-            # Music Config (New - from MusicManager)
-            music_config = pdata.get("music_config", {})
-            
-            # Resolve Music Filename
-            if not music_filename:
-                # 1. Try new config
-                if music_config.get("enabled", True):
-                    music_filename = music_config.get("music_file", legacy_track)
-                else:
-                    music_filename = "none" # Explicitly disabled
-                
-                # 2. Fallback to legacy if still empty
-                if not music_filename:
-                    music_filename = legacy_track
-                
-                # 3. Final fallback to default music from global settings
-                if not music_filename:
-                    from core.global_settings import get_settings
-                    settings = get_settings()
-                    music_filename = settings.music.default_music_file
-
-            # Resolve Volume (if not provided in args)
-            if bgm_volume_adj is None:
-                # 1. Try new config
-                if "volume_adj" in music_config:
-                    bgm_volume_adj = music_config.get("volume_adj") # It's in dB already
-                else:
-                    # 2. Fallback to settings.music_gain (Multiplier)
-                    pass # logic below handles settings_gain_music conversion
-            
-            settings_ducking = music_settings.get("duck_voice", True)
+        # Resolved settings (project.json > global defaults)
+        if ctx is None:
+            from core.run_context import RunContext
+            ctx = RunContext.resolve(project_path)
+
+        settings_gain_voice = ctx.voice_gain
+        settings_gain_music = ctx.music_gain
+        settings_ducking = ctx.duck_voice
+
+        if not music_filename:
+            music_filename = ctx.music_track
+
+        # Resolve Volume (if not provided in args); None falls back to settings.music_gain below
+        if bgm_volume_adj is None:
+            bgm_volume_adj = ctx.music_volume_db
 
         # Paths
-        voice_raw_path = os.path.join(project_path, "audio", "voice.mp3")
-        voice_processed_path = os.path.join(project_path, "audio", "voice_processed.mp3")
+        from utils.voice_paths import raw_voice_path, processed_voice_path
+        voice_raw_path = raw_voice_path(project_path)
+        voice_processed_path = processed_voice_path(project_path)
         
-        # Prefer processed voice.mp3 first (normalized and trimmed) to match timeline
-        if os.path.exists(voice_processed_path):
+        # Prefer processed voice first (normalized and trimmed) to match timeline
+        if voice_processed_path:
             voice_path = voice_processed_path
             log_event(project_path, "pipeline.log", "[AUDIO_MIX] Using processed voice (recommended)")
-        elif os.path.exists(voice_raw_path):
+        elif voice_raw_path:
             voice_path = voice_raw_path
             log_event(project_path, "pipeline.log", "[AUDIO_MIX] Using raw voice (fallback)")
         else:
             return {"status": "FAIL", "error": "No voice file found"}
             
-        assets_dir = os.path.join(os.path.dirname(os.path.dirname(__file__)), "assets", "music")
+        from utils.music_library import MUSIC_DIR as assets_dir
         
         # Output
         output_path = os.path.join(project_path, "output", "final_audio_mix.wav")
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
             
         if not music_filename or music_filename == "none":
-            voice = AudioSegment.from_file(voice_path)
-            # Apply Voice Gain
-            # Pydub: gain in dB. multiplier -> dB = 20 * math.log10(gain)
-            if settings_gain_voice != 1.0:
-                 db_change = 0
-                 if settings_gain_voice > 0.01:
-                    db_change = 20 * math.log10(settings_gain_voice)
-                 voice = voice + db_change
-                 
-            voice.export(output_path, format="wav")
+            duration = _render_voice_only(voice_path, output_path, settings_gain_voice, project_path)
             log_event(project_path, "pipeline.log", "[AUDIO_MIX] No music selected. Output voice only.")
-            return {"status": "OK", "output": output_path, "duration": len(voice)/1000.0}
+            return {"status": "OK", "output": output_path, "duration": duration}
 
         # Find Music File (Prioritize Local Project Files)
         music_path = None
@@ -124,28 +84,10 @@ def mix_background_music(project_path, music_filename=None, bgm_volume_adj=None)
         
         if not music_path:
             log_event(project_path, "pipeline.log", f"[AUDIO_MIX] WARNING: Music file {music_filename} not found in project or assets. Skipping music.")
-            voice = AudioSegment.from_file(voice_path)
-            voice.export(output_path, format="wav")
+            _render_voice_only(voice_path, output_path, 1.0, project_path)
             return {"status": "WARNING", "message": f"Music file {music_filename} missing, using voice only", "output": output_path}
 
-        # Load Audio
-        log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Mixing voice with {music_filename}...")
-        log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Music path: {music_path}")
-        voice = AudioSegment.from_file(voice_path)
-        music = AudioSegment.from_file(music_path)
-        
-        log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Voice File: {voice_path}, Duration: {len(voice)}ms")
-        log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Music File: {music_path}, Duration: {len(music)}ms")
-        
-        # Apply Voice Gain
-        if settings_gain_voice != 1.0:
-             if isinstance(settings_gain_voice, (int, float)) and settings_gain_voice > 0.01:
-                voice = voice + (20 * math.log10(settings_gain_voice))
-        
-        voice_duration_ms = len(voice)
-        
-        # Apply Music Gain
-        # Priority: explicit dB arg > settings gain
+        # Music gain: explicit dB arg > settings gain
         music_db_adj = 0
         if bgm_volume_adj is not None:
              music_db_adj = bgm_volume_adj
@@ -154,35 +96,55 @@ def mix_background_music(project_path, music_filename=None, bgm_volume_adj=None)
                  music_db_adj = 20 * math.log10(settings_gain_music)
              else:
                  music_db_adj = -100 # Silence
-        
-        music = music + music_db_adj
-        
-        # Loop Music
-        if len(music) < voice_duration_ms:
-            loops = math.ceil(voice_duration_ms / len(music))
-            music = music * loops
-            
-        # Trim
-        music = music[:voice_duration_ms]
-        
-        # Fade
-        fade_duration = 500
-        if len(music) > fade_duration * 2:
-            music = music.fade_in(fade_duration).fade_out(fade_duration)
-            
-        # Ducking? (Not fully implemented here for simplicity, just overlay)
-        # Real ducking requires analyzing voice volume. 
-        # For now, "Duck" just implies we keep music lower, which Gain handles.
-        # If user wants "Autoduck", we might assume standard -20dB equivalent was handled by gain.
-            
-        # Mix
-        final_mix = voice.overlay(music, position=0)
-        
-        final_mix.export(output_path, format="wav")
-        
-        duration_sec = len(final_mix) / 1000.0
-        log_event(project_path, "pipeline.log", f"[AUDIO_MIX] SUCCESS: Mixed audio generated ({duration_sec:.2f}s)")
-        
+
+        # Tracks are levelled to a common loudness first (cached measurement),
+        # so the configured music volume means the same thing for every track
+        from utils import music_library
+        try:
+            library_entry = music_library.find_track(music_path)
+        except Exception as e:
+            log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Music library unavailable ({e}), decoding track directly")
+            library_entry = None
+        if music_db_adj > -100:
+            if library_entry:
+                norm_db = library_entry.get("gain_db", 0.0)
+            else:
+                from utils import loudness
+                norm_db = loudness.static_gain_db(music_path)
+            if norm_db:
+                log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Music loudness normalization: {norm_db:+.2f} dB")
+                music_db_adj += norm_db
+
+        voice_gain = settings_gain_voice if isinstance(settings_gain_voice, (int, float)) and settings_gain_voice > 0.01 else 1.0
+
+        log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Mixing voice with {music_filename}...")
+        log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Music path: {music_path}")
+
+        from utils import audio_engine
+        if audio_engine.available():
+            try:
+                voice = audio_engine.load_audio(voice_path)
+                if library_entry:
+                    # Pre-decoded library track, memory-mapped (no MP3 decode per mix)
+                    music = music_library.load_pcm(library_entry)
+                else:
+                    music = audio_engine.load_audio(music_path)
+                log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Voice File: {voice_path}, Duration: {len(voice) * 1000 // audio_engine.MIX_RATE}ms")
+                log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Music File: {music_path}, Duration: {len(music) * 1000 // audio_engine.MIX_RATE}ms")
+
+                duration_sec = audio_engine.mix(
+                    voice, music, output_path,
+                    voice_gain=voice_gain,
+                    music_gain=audio_engine.db_to_gain(music_db_adj) if music_db_adj > -100 else 0.0,
+                    fade_sec=0.5,
+                    duck=bool(settings_ducking)
+                )
+                log_event(project_path, "pipeline.log", f"[AUDIO_MIX] SUCCESS: Mixed audio generated ({duration_sec:.2f}s, numpy engine, ducking={'on' if settings_ducking else 'off'})")
+                return {"status": "OK", "output": output_path, "duration": duration_sec}
+            except Exception as e:
+                log_event(project_path, "pipeline.log", f"[AUDIO_MIX] NumPy engine failed ({e}), falling back to pydub")
+
+        duration_sec = _mix_with_pydub(voice_path, music_path, output_path, settings_gain_voice, music_db_adj, project_path)
         return {"status": "OK", "output": output_path, "duration": duration_sec}
         
     except Exception as e:
@@ -191,3 +153,73 @@ def mix_background_music(project_path, music_filename=None, bgm_volume_adj=None)
              error_msg += " (FFmpeg error)"
         log_event(project_path, "pipeline.log", f"[AUDIO_MIX] FAIL: {error_msg}")
         return {"status": "FAIL", "error": error_msg}
+
+def _pydub():
+    from pydub import AudioSegment
+    bin_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "bin")
+    if os.path.exists(bin_dir):
+        AudioSegment.converter = os.path.join(bin_dir, "ffmpeg")
+    return AudioSegment
+
+def _render_voice_only(voice_path, output_path, settings_gain_voice, project_path):
+    """Writes the voice (with optional gain) as the mix output. Returns duration in seconds."""
+    from utils import audio_engine
+    if audio_engine.available():
+        try:
+            voice = audio_engine.load_audio(voice_path)
+            gain = settings_gain_voice if settings_gain_voice > 0.01 else 1.0
+            return audio_engine.write_wav(voice, output_path, voice_gain=gain)
+        except Exception as e:
+            log_event(project_path, "pipeline.log", f"[AUDIO_MIX] NumPy engine failed ({e}), falling back to pydub")
+
+    AudioSegment = _pydub()
+    voice = AudioSegment.from_file(voice_path)
+    # Apply Voice Gain
+    # Pydub: gain in dB. multiplier -> dB = 20 * math.log10(gain)
+    if settings_gain_voice != 1.0:
+         db_change = 0
+         if settings_gain_voice > 0.01:
+            db_change = 20 * math.log10(settings_gain_voice)
+         voice = voice + db_change
+    voice.export(output_path, format="wav")
+    return len(voice)/1000.0
+
+def _mix_with_pydub(voice_path, music_path, output_path, settings_gain_voice, music_db_adj, project_path):
+    """Original pydub mixer, used when NumPy (or a decoder for the track) is unavailable."""
+    AudioSegment = _pydub()
+    voice = AudioSegment.from_file(voice_path)
+    music = AudioSegment.from_file(music_path)
+    
+    log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Voice File: {voice_path}, Duration: {len(voice)}ms")
+    log_event(project_path, "pipeline.log", f"[AUDIO_MIX] Music File: {music_path}, Duration: {len(music)}ms")
+    
+    # Apply Voice Gain
+    if settings_gain_voice != 1.0:
+         if isinstance(settings_gain_voice, (int, float)) and settings_gain_voice > 0.01:
+            voice = voice + (20 * math.log10(settings_gain_voice))
+    
+    voice_duration_ms = len(voice)
+    
+    music = music + music_db_adj
+    
+    # Loop Music
+    if len(music) < voice_duration_ms:
+        loops = math.ceil(voice_duration_ms / len(music))
+        music = music * loops
+        
+    # Trim
+    music = music[:voice_duration_ms]
+    
+    # Fade
+    fade_duration = 500
+    if len(music) > fade_duration * 2:
+        music = music.fade_in(fade_duration).fade_out(fade_duration)
+        
+    # Mix (no ducking in this fallback; gain alone keeps the music under the voice)
+    final_mix = voice.overlay(music, position=0)
+    
+    final_mix.export(output_path, format="wav")
+    
+    duration_sec = len(final_mix) / 1000.0
+    log_event(project_path, "pipeline.log", f"[AUDIO_MIX] SUCCESS: Mixed audio generated ({duration_sec:.2f}s, pydub)")
+    return duration_sec
@@ -1,8 +1,49 @@
 import os
-import re
+import shutil
 import subprocess
 import tempfile
 from core.logger import log_event
+from utils import pcm, sentence_utils
+
+def _export_format(path):
+    """pydub export format from the output extension (WAV inside the pipeline, MP3 for legacy files)."""
+    ext = os.path.splitext(path)[1].lower().lstrip(".")
+    return ext if ext in ("wav", "mp3", "flac") else "wav"
+
+def decode_to_wav(audio_path, output_path):
+    """
+    Decodes a compressed file (e.g. provider MP3) to 16-bit PCM WAV once, so the
+    rest of the voice chain never re-encodes. Returns True on success.
+    """
+    try:
+        if shutil.which("ffmpeg"):
+            result = subprocess.run(
+                ["ffmpeg", "-y", "-i", audio_path, "-c:a", "pcm_s16le", output_path],
+                capture_output=True
+            )
+            return result.returncode == 0 and os.path.exists(output_path)
+        from pydub import AudioSegment
+        AudioSegment.from_file(audio_path).export(output_path, format="wav")
+        return True
+    except Exception:
+        return False
+
+def _is_wav(path):
+    return os.path.splitext(path)[1].lower() == ".wav"
+
+def compose_wav(data, output_path, start_silence=0.0, end_silence=0.0, sentence_count=1, pause_duration=0.0):
+    """
+    Writes WAV bytes to output_path with silence padding and sentence pauses added
+    directly on the PCM: the original samples are written untouched between
+    precomputed silence blocks, so lengths are exact to the frame and nothing is
+    decoded or re-encoded. Raises ValueError if data is not PCM WAV.
+    """
+    frames, params = pcm.frames_view(data)
+    parts = pcm.compose(frames, params, start_silence, end_silence, sentence_count, pause_duration)
+    tmp_path = output_path + ".tmp"
+    pcm.write_wav_parts(tmp_path, parts, *params)
+    os.replace(tmp_path, output_path)
+    return True
 
 def add_silence_padding(audio_path, output_path, start_silence=1.5, end_silence=1.5, project_path=None):
     """
@@ -19,8 +60,19 @@ def add_silence_padding(audio_path, output_path, start_silence=1.5, end_silence=
         bool: True if successful, False otherwise
     """
     try:
+        if _is_wav(audio_path) and _is_wav(output_path):
+            try:
+                with open(audio_path, "rb") as f:
+                    compose_wav(f.read(), output_path, start_silence, end_silence)
+                if project_path:
+                    log_event(project_path, "pipeline.log",
+                             f"[AUDIO] Added silence: {start_silence}s start, {end_silence}s end (pcm)")
+                return True
+            except ValueError:
+                pass # Not plain PCM: fall through to sox/pydub
+
         # Check if sox is available (preferred for audio manipulation)
-        if subprocess.run(['which', 'sox'], capture_output=True).returncode == 0:
+        if shutil.which('sox'):
             return _add_silence_sox(audio_path, output_path, start_silence, end_silence, project_path)
         else:
             # Fallback to Python-based solution
@@ -84,7 +136,7 @@ def _add_silence_pydub(audio_path, output_path, start_silence, end_silence, proj
         padded_audio = silence_start + audio + silence_end
         
         # Export
-        padded_audio.export(output_path, format="mp3")
+        padded_audio.export(output_path, format=_export_format(output_path))
         
         if project_path:
             log_event(project_path, "pipeline.log", 
@@ -96,7 +148,6 @@ def _add_silence_pydub(audio_path, output_path, start_silence, end_silence, proj
             log_event(project_path, "pipeline.log", 
                      "[AUDIO] pydub not available, silence padding skipped")
         # Copy file as-is if no tools available
-        import shutil
         shutil.copy2(audio_path, output_path)
         return False
     except Exception as e:
@@ -118,24 +169,33 @@ def add_sentence_pauses(audio_path, output_path, script_text, pause_duration=0.4
     Returns:
         bool: True if successful, False otherwise
     
-    Note: This is a simplified implementation. For production, you'd want to use
-    speech recognition to detect actual sentence boundaries in the audio.
+    Note: This is a simplified implementation. The audio is cut into equal slices,
+    so pauses can fall mid-word; only chunked Gemini synthesis (settings.voice.
+    chunked_synthesis) puts them at the real sentence boundaries.
     """
     try:
-        from pydub import AudioSegment
-        
-        # Load audio
-        audio = AudioSegment.from_file(audio_path)
-        
-        # Detect sentence count (Thai sentences typically end with . or space after clause)
-        sentences = re.split(r'[.!?]\s+', script_text)
-        sentence_count = len([s for s in sentences if s.strip()])
-        
+        sentence_count = sentence_utils.sentence_count(script_text)
+
         if sentence_count <= 1:
             # No sentences to split, just copy
-            import shutil
             shutil.copy2(audio_path, output_path)
             return True
+
+        if _is_wav(audio_path) and _is_wav(output_path):
+            try:
+                with open(audio_path, "rb") as f:
+                    compose_wav(f.read(), output_path, sentence_count=sentence_count, pause_duration=pause_duration)
+                if project_path:
+                    log_event(project_path, "pipeline.log",
+                             f"[AUDIO] Added {sentence_count-1} sentence pauses ({pause_duration}s each, pcm)")
+                return True
+            except ValueError:
+                pass # Not plain PCM: fall back to pydub
+
+        from pydub import AudioSegment
+        
+        # Load audio
+        audio = AudioSegment.from_file(audio_path)
         
         # Estimate duration per sentence
         total_duration_ms = len(audio)
@@ -159,7 +219,7 @@ def add_sentence_pauses(audio_path, output_path, script_text, pause_duration=0.4
                 result += silence
         
         # Export
-        result.export(output_path, format="mp3")
+        result.export(output_path, format=_export_format(output_path))
         
         if project_path:
             log_event(project_path, "pipeline.log", 
@@ -170,7 +230,6 @@ def add_sentence_pauses(audio_path, output_path, script_text, pause_duration=0.4
         if project_path:
             log_event(project_path, "pipeline.log", 
                      "[AUDIO] pydub not available, sentence pauses skipped")
-        import shutil
         shutil.copy2(audio_path, output_path)
         return False
     except Exception as e:
@@ -182,33 +241,5 @@ def get_audio_duration(file_path):
     """
     Get duration of audio file in seconds.
     """
-    try:
-        # Try afinfo first (Mac)
-        result = subprocess.run(['afinfo', '-b', file_path], capture_output=True, text=True)
-        if result.returncode == 0:
-            for line in result.stdout.split('\n'):
-                if 'sec' in line:
-                    parts = line.strip().split(' ')
-                    if len(parts) > 0:
-                        try:
-                            return float(parts[0])
-                        except ValueError:
-                            continue
-        
-        # Try ffprobe
-        if subprocess.run(['which', 'ffprobe'], capture_output=True).returncode == 0:
-            cmd = [
-                "ffprobe", "-v", "error", "-show_entries", "format=duration",
-                "-of", "default=noprint_wrappers=1:nokey=1", file_path
-            ]
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            if result.returncode == 0 and result.stdout.strip():
-                return round(float(result.stdout.strip()), 3)
-        
-        # Fallback to pydub
-        from pydub import AudioSegment
-        audio = AudioSegment.from_file(file_path)
-        return len(audio) / 1000.0
-        
-    except Exception:
-        return 0.0
+    from utils import media_probe
+    return media_probe.duration(file_path)
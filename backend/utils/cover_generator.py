@@ -6,8 +6,11 @@ import time
 import requests
 from core.config import PROJECTS_DIR
 from core.logger import log_event
-import google.generativeai as genai
-from PIL import Image
+
+# Heavy SDKs are imported on first use so importing this module (main.py does) stays cheap
+def get_genai():
+    import google.generativeai as genai
+    return genai
 
 # Helper for OpenAI Image Gen (DALL-E)
 def generate_dalle_image(prompt, size="1024x1024"):
@@ -47,20 +50,23 @@ class CoverPromptGenRequest(BaseModel):
 # --- Router Logic (to be merged into main.py or separate router) ---
 # For now, implemented as functions to be called by main.py endpoints
 
-def generate_cover_text_ai(project_path, product_name, tone="engaging"):
+def generate_cover_text_ai(project_path, product_name, tone="engaging", settings=None):
     """
     Generates 3 options for Short Title (Hook) and Tagline using Gemini.
+    settings: a GlobalSettings snapshot (e.g. from the run context); defaults to the live settings.
     """
     api_key = os.environ.get("GEMINI_API_KEY")
     if not api_key:
         return {"error": "Gemini API Key missing"}
         
     try:
+        genai = get_genai()
         genai.configure(api_key=api_key)
         model = genai.GenerativeModel('gemini-2.0-flash-exp') # Use faster model
         
-        from core.global_settings import get_settings
-        settings = get_settings()
+        if settings is None:
+            from core.global_settings import get_settings
+            settings = get_settings()
         
         max_words = settings.hook.max_words
         max_chars = settings.hook.max_characters
@@ -111,6 +117,7 @@ def generate_cover_prompt_ai(project_path, product_name, image_filename=None):
         return {"error": "Gemini API Key missing"}
         
     try:
+        genai = get_genai()
         genai.configure(api_key=api_key)
         model = genai.GenerativeModel('gemini-2.0-flash-exp') # supports vision features
         
@@ -137,6 +144,7 @@ def generate_cover_prompt_ai(project_path, product_name, image_filename=None):
         if image_filename:
             img_path = os.path.join(project_path, "input", image_filename)
             if os.path.exists(img_path):
+                from PIL import Image
                 img = Image.open(img_path)
                 inputs.append(img)
         
@@ -0,0 +1,39 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+# Content hashes of files, shared by every cache keyed by file content
+# (loudness measurements, waveform peaks, thumbnails, the image index, the
+# music library, the processed-voice sidecar).
+# content_hash() is memoized per (path, size, mtime_ns) in a bounded LRU, so
+# repeated lookups of an unchanged file don't read it again.
+
+CACHE_MAX_ENTRIES = 4096
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+def sha256_file(path, chunk_size=1024 * 1024):
+    """sha256 hex digest of the file's bytes (always reads the file)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def content_hash(path):
+    """sha256 of the file, memoized per (path, size, mtime_ns)."""
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+    digest = sha256_file(path)
+    with _lock:
+        _cache[key] = digest
+        _cache.move_to_end(key)
+        while len(_cache) > CACHE_MAX_ENTRIES:
+            _cache.popitem(last=False)
+    return digest
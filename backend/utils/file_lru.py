@@ -0,0 +1,105 @@
+import os
+import threading
+
+# Size-bounded LRU eviction for on-disk caches (TTS audio, thumbnails, waveform
+# peaks). File mtime is the last-access time: callers touch() entries on a hit.
+# The store size is kept as a running total, so a write only costs a directory
+# walk when the store is actually over budget. Eviction then goes down to
+# LOW_WATER of the budget, so the next walk is many writes away.
+# The total is per process and re-synced from disk on every eviction walk;
+# writes from other processes only delay eviction until the next one.
+
+LOW_WATER = 0.9
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def store(root):
+    """The shared LRUFileStore for a cache directory (one running total per root)."""
+    with _stores_lock:
+        if root not in _stores:
+            _stores[root] = LRUFileStore(root)
+        return _stores[root]
+
+class LRUFileStore:
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock()
+        self._total = None # Bytes on disk; None until the first walk
+
+    def _walk(self):
+        entries = []
+        for root, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+        return entries
+
+    def total_bytes(self):
+        with self._lock:
+            if self._total is None:
+                self._total = sum(size for _, size, _ in self._walk())
+            return self._total
+
+    def added(self, size, replaced=0):
+        """Records a write of `size` bytes (replacing a `replaced`-byte entry)."""
+        with self._lock:
+            if self._total is not None:
+                self._total += size - replaced
+
+    def removed(self, size):
+        """Records an entry deleted outside evict()."""
+        with self._lock:
+            if self._total is not None:
+                self._total = max(0, self._total - size)
+
+    def remove(self, path):
+        """Deletes one entry and records it. False if it didn't exist."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return False
+        self.removed(size)
+        return True
+
+    @staticmethod
+    def touch(path):
+        """Refreshes an entry's LRU position. False if it doesn't exist."""
+        try:
+            os.utime(path, None)
+            return True
+        except OSError:
+            return False
+
+    def evict(self, max_bytes, keep=None):
+        """
+        If the store is over max_bytes, deletes least recently used entries (never
+        `keep`) until it is under LOW_WATER * max_bytes. Returns the number removed.
+        """
+        if self.total_bytes() <= max_bytes:
+            return 0
+        with self._lock:
+            entries = self._walk()
+            total = sum(size for _, size, _ in entries)
+            target = max_bytes * LOW_WATER if total > max_bytes else total
+            removed = 0
+            for _, size, path in sorted(entries):
+                if total <= target:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.remove(path)
+                    total -= size
+                    removed += 1
+                except OSError:
+                    pass
+            self._total = total
+            return removed
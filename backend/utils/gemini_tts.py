@@ -1,8 +1,9 @@
 import os
 import time
-from google import genai
-from google.genai import types
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+from utils.sentence_utils import split_sentences
 
 load_dotenv()
 
@@ -41,10 +42,17 @@ GEMINI_VOICES = [
     {"id": "Zubenelgenubi", "name": "Zubenelgenubi", "gender": "neutral"}
 ]
 
+def get_genai():
+    """google.genai is heavy to import; load it on first use."""
+    from google import genai
+    from google.genai import types
+    return genai, types
+
 def get_gemini_client():
     api_key = os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
     if not api_key:
         return None
+    genai, _ = get_genai()
     # Using v1alpha for latest TTS features compatibility
     return genai.Client(api_key=api_key, http_options={'api_version': 'v1alpha'})
 
@@ -76,16 +84,7 @@ def generate_gemini_tts(text: str, voice_name: str = "Puck", style_instructions:
     response = client.models.generate_content(
         model='gemini-2.5-flash-preview-tts',
         contents=prompt,
-        config=types.GenerateContentConfig(
-            response_modalities=['AUDIO'],
-            speech_config=types.SpeechConfig(
-                voice_config=types.VoiceConfig(
-                    prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                        voice_name=voice_name
-                    )
-                )
-            )
-        )
+        config=_tts_config(voice_name)
     )
 
     for part in response.candidates[0].content.parts:
@@ -93,14 +92,119 @@ def generate_gemini_tts(text: str, voice_name: str = "Puck", style_instructions:
             pcm_data = part.inline_data.data
             
             # Gemini returns raw L16 PCM (24kHz). Browsers need a WAV header.
-            import io
-            import wave
-            with io.BytesIO() as wav_io:
-                with wave.open(wav_io, 'wb') as wav_file:
-                    wav_file.setnchannels(1)
-                    wav_file.setsampwidth(2) # 16-bit
-                    wav_file.setframerate(24000)
-                    wav_file.writeframes(pcm_data)
-                return wav_io.getvalue()
+            from utils.pcm import write_wav
+            return write_wav(pcm_data, nchannels=1, sampwidth=2, framerate=24000)
             
     raise Exception("No audio data returned from Gemini API")
+
+def _tts_config(voice_name):
+    _, types = get_genai()
+    return types.GenerateContentConfig(
+        response_modalities=['AUDIO'],
+        speech_config=types.SpeechConfig(
+            voice_config=types.VoiceConfig(
+                prebuilt_voice_config=types.PrebuiltVoiceConfig(voice_name=voice_name)
+            )
+        )
+    )
+
+def stream_gemini_tts_pcm(text: str, voice_name: str = "Puck", style_instructions: str = ""):
+    """
+    Like generate_gemini_tts, but yields raw 24 kHz mono 16-bit PCM as the
+    API streams it (no WAV header), so playback can start before synthesis ends.
+    """
+    client = get_gemini_client()
+    if not client:
+        raise ValueError("Google API Key missing or client initialization failed")
+
+    prompt = f"Speak the following text. Style: {style_instructions}\n\nText: {text}" if style_instructions else text
+    received = False
+    for chunk in client.models.generate_content_stream(
+        model='gemini-2.5-flash-preview-tts',
+        contents=prompt,
+        config=_tts_config(voice_name)
+    ):
+        for candidate in chunk.candidates or []:
+            for part in (candidate.content.parts if candidate.content else None) or []:
+                if part.inline_data and part.inline_data.data:
+                    received = True
+                    yield part.inline_data.data
+    if not received:
+        raise Exception("No audio data returned from Gemini API")
+
+# --- Chunked Synthesis ---
+
+# Shared across all jobs so concurrent projects together stay within the provider's rate limit
+_request_slots = None
+_request_slots_lock = threading.Lock()
+
+def request_slots():
+    """Semaphore every Gemini TTS API call (chunked or whole-text) is made under."""
+    global _request_slots
+    with _request_slots_lock:
+        if _request_slots is None:
+            from core.global_settings import get_settings
+            _request_slots = threading.BoundedSemaphore(max(1, get_settings().voice.tts_max_concurrency))
+        return _request_slots
+
+def _synth_sentence(sentence, voice_name, style_instructions, cancelled=None):
+    """
+    One sentence through the shared TTS cache; API calls take a global request slot.
+    A set `cancelled` event (lost hedge, see tts_hedge) stops it before the request is sent.
+    """
+    from utils.tts_cache import synthesize_cached
+    from utils.tts_hedge import check_cancelled
+
+    def call_api():
+        with request_slots():
+            check_cancelled(cancelled)
+            return generate_gemini_tts(sentence, voice_name, style_instructions)
+    data, _ = synthesize_cached("gemini", voice_name, style_instructions, 1.0, sentence, "wav", call_api)
+    return data
+
+def generate_gemini_tts_chunked(text: str, voice_name: str = "Puck", style_instructions: str = "", pause_sec: float = 0.0, cancelled=None):
+    """
+    Synthesizes each sentence as its own request (concurrently, bounded by
+    settings.voice.tts_max_concurrency) and joins the PCM in order with
+    pause_sec of silence at the real sentence boundaries.
+    Each sentence goes through the shared TTS cache, so editing one sentence
+    only re-synthesizes that sentence. Sentences not yet sent are skipped once
+    `cancelled` is set (CancelledError).
+
+    Returns:
+        bytes: WAV audio (24 kHz mono 16-bit), same format as generate_gemini_tts.
+    """
+    from utils.pcm import concat_wav
+
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        sentences = [text]
+
+    with ThreadPoolExecutor(max_workers=min(len(sentences), 8)) as pool:
+        chunks = list(pool.map(lambda s: _synth_sentence(s, voice_name, style_instructions, cancelled), sentences))
+    return concat_wav(chunks, gap_sec=pause_sec)
+
+def iter_gemini_tts_chunked_pcm(text: str, voice_name: str = "Puck", style_instructions: str = "", pause_sec: float = 0.0):
+    """
+    Streaming variant of generate_gemini_tts_chunked: all sentences are requested
+    concurrently, and each sentence's PCM (plus the pause after it) is yielded as
+    soon as it and every sentence before it are ready. Sentence 1 can play while
+    the rest are still being synthesized.
+    """
+    from utils.pcm import read_wav, silence
+
+    sentences = split_sentences(text)
+    if len(sentences) <= 1:
+        sentences = [text]
+
+    pool = ThreadPoolExecutor(max_workers=min(len(sentences), 8))
+    try:
+        futures = [pool.submit(_synth_sentence, sentence, voice_name, style_instructions) for sentence in sentences]
+        for i, future in enumerate(futures):
+            frames, params = read_wav(future.result())
+            if i > 0 and pause_sec > 0:
+                yield silence(pause_sec, *params)
+            yield frames
+    finally:
+        # Listener gone or a sentence failed: don't start sentences nobody will hear
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,48 @@
+try:
+    import numpy as np
+except ImportError: # Duplicate detection is skipped without numpy
+    np = None
+
+# Perceptual hashing for near-duplicate product photos (same shot from
+# different CDN URLs, sizes or recompressions).
+# dHash: the image is shrunk to 9x8 grayscale and each bit records whether a
+# pixel is brighter than its right neighbour. Resizing and JPEG artefacts barely
+# move these gradients, so copies land within a few bits of each other.
+
+HASH_SIZE = 8 # 8x8 = 64-bit hash
+DEFAULT_MAX_DISTANCE = 6 # Bits out of 64
+
+def available():
+    return np is not None
+
+def dhash(path):
+    """64-bit dHash of an image file as a 16-char hex string."""
+    from PIL import Image
+    from utils.image_processor import open_reduced
+    img, _ = open_reduced(path, 64, 64, mode="fill")
+    with img:
+        small = img.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.LANCZOS)
+        px = np.asarray(small, dtype=np.int16)
+    bits = (px[:, 1:] > px[:, :-1]).flatten()
+    return f"{int(np.packbits(bits).view('>u8')[0]):016x}"
+
+def distance(a, b):
+    """Hamming distance between two hex hashes."""
+    return bin(int(a, 16) ^ int(b, 16)).count("1")
+
+def duplicate_groups(hashes, max_distance=DEFAULT_MAX_DISTANCE):
+    """
+    Groups near-duplicates. hashes: [(name, hex)] in preference order; the first
+    member of each group is the one to keep.
+    Returns [[keep, duplicate, ...]] for groups with more than one image.
+    """
+    groups = [] # [(keeper hash as int, [names])]
+    for name, hex_hash in hashes:
+        value = int(hex_hash, 16)
+        for keeper, members in groups:
+            if bin(keeper ^ value).count("1") <= max_distance:
+                members.append(name)
+                break
+        else:
+            groups.append((value, [name]))
+    return [members for _, members in groups if len(members) > 1]
@@ -0,0 +1,164 @@
+import os
+import json
+import threading
+
+# Per-project image metadata index (image_index.json in the project root).
+# One entry per input/ asset: width, height, format, mode, EXIF orientation,
+# content hash, perceptual hash (dhash, see image_hash), size, mtime and
+# whether a backup exists, so the asset list,
+# the timeline preview, normalization, the dry run and the renderer don't
+# each re-open every image.
+#
+# Upload, download, normalize, restore and delete update entries directly.
+# Anything else that adds or removes files changes input/'s mtime, which
+# triggers a reconcile (listdir + stat) on the next read. The index lives
+# outside input/ so its own writes don't.
+
+INDEX_NAME = "image_index.json"
+VERSION = 2 # 2: dhash
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp")
+ASSET_EXTS = IMAGE_EXTS + (".mp4", ".webm")
+ORIENTATION_TAG = 0x0112
+
+_lock = threading.Lock()
+
+def index_path(project_path):
+    return os.path.join(project_path, INDEX_NAME)
+
+def _input_dir(project_path):
+    return os.path.join(project_path, "input")
+
+def _load(project_path):
+    try:
+        with open(index_path(project_path), "r") as f:
+            index = json.load(f)
+        if index.get("version") == VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+    return {"version": VERSION, "dir_mtime_ns": None, "images": {}}
+
+def _save(project_path, index):
+    path = index_path(project_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, path)
+
+def probe(path):
+    """Metadata of one asset file (image headers only; nothing is decoded)."""
+    st = os.stat(path)
+    entry = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "width": 0, "height": 0,
+             "format": os.path.splitext(path)[1].lstrip(".").upper(), "mode": None, "orientation": 1}
+    if path.lower().endswith(IMAGE_EXTS):
+        from PIL import Image
+        from utils.file_hash import content_hash
+        try:
+            with Image.open(path) as img:
+                entry.update(width=img.width, height=img.height, format=img.format, mode=img.mode,
+                             orientation=int(img.getexif().get(ORIENTATION_TAG, 1) or 1))
+        except Exception as e:
+            entry["error"] = str(e)
+        entry["hash"] = content_hash(path)
+        from utils import image_hash
+        if image_hash.available() and "error" not in entry:
+            try:
+                entry["dhash"] = image_hash.dhash(path)
+            except Exception:
+                pass
+    return entry
+
+def _probe_entry(project_path, filename):
+    entry = probe(os.path.join(_input_dir(project_path), filename))
+    entry["has_backup"] = os.path.exists(os.path.join(_input_dir(project_path), "backups", filename))
+    return entry
+
+def _reconcile(project_path, index):
+    """Brings the index in line with input/ (new, changed and removed files)."""
+    input_dir = _input_dir(project_path)
+    current = {}
+    for f in os.listdir(input_dir):
+        if not f.lower().endswith(ASSET_EXTS):
+            continue
+        path = os.path.join(input_dir, f)
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        entry = index["images"].get(f)
+        if entry and entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns:
+            current[f] = entry
+        else:
+            try:
+                current[f] = _probe_entry(project_path, f)
+            except OSError:
+                continue
+    index["images"] = current
+
+def entries(project_path):
+    """{filename: metadata} for every asset in input/ ({} if the folder is missing)."""
+    input_dir = _input_dir(project_path)
+    try:
+        dir_mtime = os.stat(input_dir).st_mtime_ns
+    except OSError:
+        return {}
+    with _lock:
+        index = _load(project_path)
+        if index.get("dir_mtime_ns") != dir_mtime:
+            _reconcile(project_path, index)
+            index["dir_mtime_ns"] = dir_mtime
+            _save(project_path, index)
+        return dict(index["images"])
+
+def get(project_path, filename):
+    return entries(project_path).get(filename)
+
+def update(project_path, filename):
+    """Re-reads one asset after it was written (upload, download, normalize, restore)."""
+    if not os.path.exists(os.path.join(_input_dir(project_path), filename)):
+        return remove(project_path, filename)
+    with _lock:
+        index = _load(project_path)
+        index["images"][filename] = _probe_entry(project_path, filename)
+        _save(project_path, index)
+
+def remove(project_path, filename):
+    with _lock:
+        index = _load(project_path)
+        if index["images"].pop(filename, None) is not None:
+            _save(project_path, index)
+
+def cached_size(project_path, filename):
+    """
+    (width, height) from the index if its entry still matches the file, else None.
+    Read-only, so it is safe from worker processes.
+    """
+    entry = _load(project_path)["images"].get(filename)
+    if not entry or not entry.get("width"):
+        return None
+    try:
+        st = os.stat(os.path.join(_input_dir(project_path), filename))
+    except OSError:
+        return None
+    if entry.get("size") != st.st_size or entry.get("mtime_ns") != st.st_mtime_ns:
+        return None
+    return entry["width"], entry["height"]
+
+def duplicates(project_path, max_distance=None, images=None):
+    """
+    Near-duplicate groups among the project's images: [[keep, duplicate, ...]].
+    The naturally first file of a group (1.jpg before 7.jpg) is the one kept.
+    images: the entries() result, if already loaded.
+    """
+    from utils import image_hash
+    from utils.sort_utils import natural_sort_key
+    images = entries(project_path) if images is None else images
+    hashes = [(name, meta["dhash"]) for name, meta in images.items() if meta.get("dhash")]
+    hashes.sort(key=lambda item: natural_sort_key(item[0]))
+    if max_distance is None:
+        max_distance = image_hash.DEFAULT_MAX_DISTANCE
+    return image_hash.duplicate_groups(hashes, max_distance)
+
+def duplicate_of(groups):
+    """{duplicate name: kept name} for duplicate groups."""
+    return {name: group[0] for group in groups for name in group[1:]}
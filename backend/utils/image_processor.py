@@ -1,7 +1,14 @@
 import os
+import math
 import textwrap
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from PIL import Image, ImageDraw, ImageFont
 import utils.crop_manager as crop_manager
+from utils import thumbnails
+from core import governor
 
 # Font mapping for Mac (Extendable)
 FONTS = {
@@ -35,11 +42,12 @@ def get_font_path(font_name="Thai_Default", weight="regular"):
                 
     return None # Pillow default font
 
-def render_cover_overlay(project_path, overlay_config):
+def render_cover_overlay(project_path, overlay_config, settings=None):
     """
     Reads 'cover_source.jpg' (or 'cover.jpg' if source missing),
     overlays text based on config,
     saves to 'cover.jpg'.
+    settings: a GlobalSettings snapshot (e.g. from the run context); defaults to the live settings.
     """
     
     # 1. Load Source Image
@@ -56,11 +64,13 @@ def render_cover_overlay(project_path, overlay_config):
             return {"status": "FAIL", "error": "No cover image found to overlay text on."}
             
     try:
-        img = Image.open(source_path).convert("RGBA")
+        # The cover is shown at video size: decode large sources at a reduced scale
+        img, _ = open_reduced(source_path, 1080, 1920, mode="fill")
+        img = img.convert("RGBA")
     except Exception as e:
         return {"status": "FAIL", "error": f"Failed to open source image: {e}"}
     
-    # Resize to standard if needed? For now, we work on actual resolution.
+    # Otherwise we work on the (decoded) source resolution.
     W, H = img.size
     draw = ImageDraw.Draw(img)
     
@@ -69,8 +79,9 @@ def render_cover_overlay(project_path, overlay_config):
     subtitle = overlay_config.get("subtitle", "").strip()
     
     # Enforce Global Constraints
-    from core.global_settings import get_settings
-    settings = get_settings()
+    if settings is None:
+        from core.global_settings import get_settings
+        settings = get_settings()
     
     if len(title) > settings.text_overlay.title_max_characters:
         title = title[:settings.text_overlay.title_max_characters]
@@ -215,6 +226,40 @@ def hex_to_rgb(hex_color):
     hex_color = hex_color.lstrip('#')
     return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
 
+def decode_size(img_w, img_h, target_w, target_h, mode="fill"):
+    """
+    Smallest source size that still serves a target_w x target_h output:
+    'fill' (cover/crop) keeps both sides at or above the covering scale,
+    'fit' (pad) only needs the fitting scale. None if no reduction is possible.
+    """
+    if mode == "fill":
+        scale = max(target_w / img_w, target_h / img_h)
+    else:
+        scale = min(target_w / img_w, target_h / img_h)
+    if scale >= 1:
+        return None
+    return (max(1, math.ceil(img_w * scale)), max(1, math.ceil(img_h * scale)))
+
+def open_reduced(path, target_w, target_h, mode="fill"):
+    """
+    Opens an image for an output of target_w x target_h, decoded at reduced
+    resolution when it is larger than needed: JPEG uses decoder-side DCT scaling
+    (draft: 1/2, 1/4 or 1/8, the smallest that still covers the target), other
+    formats a box reduce() that keeps at least 2x the target before LANCZOS.
+    Returns (loaded image, original (width, height)).
+    """
+    img = Image.open(path)
+    original = img.size
+    need = decode_size(original[0], original[1], target_w, target_h, mode)
+    if need and img.format == "JPEG":
+        img.draft(None, need)
+    img.load()
+    if need and img.format != "JPEG":
+        factor = min(img.width // (need[0] * 2), img.height // (need[1] * 2))
+        if factor >= 2:
+            img = img.reduce(factor)
+    return img, original
+
 def calculate_smart_crop(img_w, img_h, roi, target_ratio=0.5625):
     """
     Calculates the best crop box for a target ratio (default 9:16)
@@ -257,39 +302,44 @@ def calculate_smart_crop(img_w, img_h, roi, target_ratio=0.5625):
     
     return (int(left), int(top), int(left + crop_w), int(top + crop_h))
 
-def normalize_image_to_916(img, bg_color="#000000", roi_data=None):
+def layout_916(img_w, img_h, roi_data=None):
+    """
+    How an image of this size is normalized to 9:16:
+    - 'crop' if roi_data is provided (AI Smart Crop).
+    - 'resize' if it already is 9:16.
+    - 'fit' (pad) for Landscape/Square.
+    - 'fill' for Portrait close to 9:16 (minor crop), else 'fit'.
+    """
+    target_ratio = 1080 / 1920 # 0.5625
+    img_ratio = img_w / img_h
+    if roi_data and roi_data.get('roi'):
+        return "crop"
+    if abs(img_ratio - target_ratio) < 0.01:
+        return "resize"
+    if img_ratio < target_ratio and (target_ratio - img_ratio) / target_ratio < 0.15:
+        return "fill"
+    return "fit"
+
+def normalize_image_to_916(img, bg_color="#000000", roi_data=None, layout=None):
     """
-    Normalizes an image to 9:16 (1080x1920) based on specific rules:
-    - If roi_data is provided: Perform AI Smart Crop.
-    - If Landscape/Square (No ROI): Pad to fit.
-    - If Portrait (No ROI): Minor crop if close, else pad.
+    Normalizes an image to 9:16 (1080x1920) based on specific rules (see layout_916).
+    layout: decided up front (e.g. from the original size, before a reduced decode).
     """
     target_w, target_h = 1080, 1920
     target_ratio = target_w / target_h # 0.5625
-    img_ratio = img.width / img.height
+    layout = layout or layout_916(img.width, img.height, roi_data)
     
     # 1. AI Smart Crop (If ROI is available and reliable)
-    if roi_data and roi_data.get('roi'):
+    if layout == "crop":
         roi = roi_data['roi']
         crop_box = calculate_smart_crop(img.width, img.height, roi, target_ratio)
         img = img.crop(crop_box)
         return img.resize((target_w, target_h), Image.LANCZOS)
 
     # 2. Heuristic fallback (Previous logic)
-    if abs(img_ratio - target_ratio) < 0.01:
+    if layout == "resize":
         return img.resize((target_w, target_h), Image.LANCZOS)
-    
-    if img_ratio > target_ratio:
-        return resize_image_logic(img, target_w, target_h, mode="fit", bg_color=bg_color)
-    
-    if img_ratio < target_ratio:
-        loss_percentage = (target_ratio - img_ratio) / target_ratio
-        if loss_percentage < 0.15:
-            return resize_image_logic(img, target_w, target_h, mode="fill", bg_color=bg_color)
-        else:
-            return resize_image_logic(img, target_w, target_h, mode="fit", bg_color=bg_color)
-
-    return resize_image_logic(img, target_w, target_h, mode="fit", bg_color=bg_color)
+    return resize_image_logic(img, target_w, target_h, mode=layout, bg_color=bg_color)
 
 def resize_image_logic(img, target_width, target_height, mode="fit", bg_color="#000000"):
     """
@@ -353,17 +403,38 @@ def normalize_video_to_916(input_path, output_path, bg_color="#000000"):
         output_path
     ]
     
-    import subprocess
     try:
-        subprocess.run(cmd, check=True, capture_output=True)
+        governor.run(cmd, check=True, capture_output=True)
         return True
     except Exception as e:
         print(f"FFmpeg normalization failed: {e}")
         return False
 
-def normalize_asset(project_path, filename, bg_color="#000000", ai_smart_crop=False):
+ROI_DETECTORS = ("local", "gemini", "auto")
+
+def detect_roi(image_path, detector=None):
+    """
+    Subject box for smart crop (ai_detector.detect_roi format).
+    detector: 'local' (offline saliency), 'gemini', or 'auto' (local, then Gemini when
+    the local confidence is low); None uses the smart_crop setting.
+    """
+    from core.global_settings import get_settings
+    settings = get_settings().smart_crop
+    detector = detector or settings.roi_detector
+    if detector in ("local", "auto"):
+        from utils import saliency
+        roi_data = saliency.detect_roi(image_path)
+        if detector == "local":
+            return roi_data
+        if roi_data and roi_data.get("roi") and roi_data.get("confidence", 0) >= settings.local_min_confidence:
+            return roi_data
+    from .ai_detector import detect_roi as gemini_detect_roi
+    return gemini_detect_roi(image_path)
+
+def normalize_asset(project_path, filename, bg_color="#000000", ai_smart_crop=False, roi_detector=None):
     """
     High-level dispatcher to normalize any asset to 9:16.
+    roi_detector: see detect_roi (used with ai_smart_crop).
     """
     input_dir = os.path.join(project_path, "input")
     file_path = os.path.join(input_dir, filename)
@@ -375,7 +446,6 @@ def normalize_asset(project_path, filename, bg_color="#000000", ai_smart_crop=Fa
     
     roi_data = None
     if ai_smart_crop:
-        from .ai_detector import detect_roi
         # For videos, we analyze a middle frame
         if ext in ['mp4', 'webm']:
             # For simplicity, extract frame 0 for now as 'middle' is expensive to find accurately without full probe
@@ -384,21 +454,30 @@ def normalize_asset(project_path, filename, bg_color="#000000", ai_smart_crop=Fa
             import subprocess
             subprocess.run(["ffmpeg", "-y", "-i", file_path, "-ss", "00:00:01", "-vframes", "1", temp_frame], capture_output=True)
             if os.path.exists(temp_frame):
-                roi_data = detect_roi(temp_frame)
+                roi_data = detect_roi(temp_frame, roi_detector)
                 os.remove(temp_frame)
         else:
-            roi_data = detect_roi(file_path)
+            roi_data = detect_roi(file_path, roi_detector)
 
     if ext in ['jpg', 'jpeg', 'png', 'webp']:
         try:
-            with Image.open(file_path) as img:
-                img = img.convert("RGB")
-                processed = normalize_image_to_916(img, bg_color, roi_data)
+            from utils import image_index
+            size = image_index.cached_size(project_path, filename)
+            if size is None:
+                with Image.open(file_path) as probe:
+                    size = probe.size
+            orig_w, orig_h = size
+            # Decide the layout on the original size, then decode only what it needs
+            layout = layout_916(orig_w, orig_h, roi_data)
+            img, _ = open_reduced(file_path, 1080, 1920, mode="fit" if layout == "fit" else "fill")
+            with img:
+                processed = normalize_image_to_916(img.convert("RGB"), bg_color, roi_data, layout=layout)
+                thumbnails.invalidate(file_path)
                 processed.save(file_path, quality=95)
                 
-                # Save Metadata
+                # Save Metadata (crop box in original pixels)
                 if roi_data and roi_data.get('roi'):
-                    crop_box = calculate_smart_crop(img.width, img.height, roi_data['roi'])
+                    crop_box = calculate_smart_crop(orig_w, orig_h, roi_data['roi'])
                     crop_manager.save_crop(
                         project_path, filename, 
                         roi_data['roi'], 
@@ -441,7 +520,7 @@ def normalize_asset(project_path, filename, bg_color="#000000", ai_smart_crop=Fa
         ]
         
         try:
-            subprocess.run(cmd, check=True, capture_output=True)
+            governor.run(cmd, check=True, capture_output=True)
             os.replace(temp_path, file_path)
             
             # Save Metadata
@@ -459,43 +538,95 @@ def normalize_asset(project_path, filename, bg_color="#000000", ai_smart_crop=Fa
             return False
     return False
 
-def process_batch_images(project_path, image_names, config):
-    """
-    Batch process images: resize, crop, pad, or normalize.
-    """
-    input_dir = os.path.join(project_path, "input")
-    results = []
-    
+def _process_one(project_path, name, config):
+    """Processes a single image of a batch (runs in a worker process)."""
+    img_path = os.path.join(project_path, "input", name)
+    if not os.path.exists(img_path):
+        return {"name": name, "status": "FAIL", "error": "File not found"}
+
     target_w = int(config.get("width", 1080))
     target_h = int(config.get("height", 1920))
     mode = config.get("mode", "fit")
     bg_color = config.get("bg_color", "#000000")
-    
-    for name in image_names:
-        img_path = os.path.join(input_dir, name)
-        if not os.path.exists(img_path):
-            results.append({"name": name, "status": "FAIL", "error": "File not found"})
-            continue
-            
+    try:
+        if mode == "normalize":
+            ai_smart = config.get("ai_smart_crop", False)
+            if normalize_asset(project_path, name, bg_color, ai_smart_crop=ai_smart,
+                               roi_detector=config.get("roi_detector")):
+                return {"name": name, "status": "OK"}
+            return {"name": name, "status": "FAIL", "error": "Normalization failed"}
+
+        # Standard Resize/Crop
+        img, _ = open_reduced(img_path, target_w, target_h, mode="fill" if mode == "fill" else "fit")
+        with img:
+            processed_img = resize_image_logic(
+                img.convert("RGB"), target_w, target_h, mode, bg_color
+            )
+            thumbnails.invalidate(img_path)
+            processed_img.save(img_path, quality=95)
+        return {"name": name, "status": "OK"}
+    except Exception as e:
+        return {"name": name, "status": "FAIL", "error": str(e)}
+
+# Batch image work is CPU bound (decode, LANCZOS, JPEG encode) and holds the
+# GIL, so it runs in a process pool. The pool is created once and reused;
+# workers are spawned (not forked) because the API process is multithreaded.
+_pool = None
+_pool_lock = threading.Lock()
+
+def image_workers():
+    from core.global_settings import get_settings
+    workers = get_settings().resources.image_workers
+    return workers if workers > 0 else (os.cpu_count() or 1)
+
+def _get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=image_workers(),
+                                        mp_context=multiprocessing.get_context("spawn"))
+        return _pool
+
+def _reset_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+def iter_batch_images(project_path, image_names, config):
+    """
+    Processes images in the worker pool and yields each result as it finishes
+    (completion order). Single images run inline (no pool start-up cost).
+    """
+    names = list(dict.fromkeys(image_names))
+    if len(names) <= 1 or image_workers() <= 1:
+        for name in names:
+            yield _process_one(project_path, name, config)
+        return
+
+    try:
+        pool = _get_pool()
+        futures = {pool.submit(_process_one, project_path, name, config): name for name in names}
+    except BrokenProcessPool:
+        _reset_pool()
+        pool = _get_pool()
+        futures = {pool.submit(_process_one, project_path, name, config): name for name in names}
+
+    for future in as_completed(futures):
         try:
-            if mode == "normalize":
-                ai_smart = config.get("ai_smart_crop", False)
-                success = normalize_asset(project_path, name, bg_color, ai_smart_crop=ai_smart)
-                if success:
-                    results.append({"name": name, "status": "OK"})
-                else:
-                    results.append({"name": name, "status": "FAIL", "error": "Normalization failed"})
-            else:
-                # Standard Resize/Crop
-                with Image.open(img_path) as img:
-                    img = img.convert("RGB")
-                    processed_img = resize_image_logic(
-                        img, target_w, target_h, mode, bg_color
-                    )
-                    processed_img.save(img_path, quality=95)
-                    results.append({"name": name, "status": "OK"})
-                
+            yield future.result()
+        except BrokenProcessPool:
+            # A worker died (e.g. out of memory): retry this image inline
+            _reset_pool()
+            yield _process_one(project_path, futures[future], config)
         except Exception as e:
-            results.append({"name": name, "status": "FAIL", "error": str(e)})
-            
-    return results
+            yield {"name": futures[future], "status": "FAIL", "error": str(e)}
+
+def process_batch_images(project_path, image_names, config):
+    """
+    Batch process images: resize, crop, pad, or normalize.
+    Runs in parallel; results are returned in input order.
+    """
+    results = {r["name"]: r for r in iter_batch_images(project_path, image_names, config)}
+    return [results[name] for name in dict.fromkeys(image_names)]
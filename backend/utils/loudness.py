@@ -0,0 +1,117 @@
+import os
+import re
+import json
+import math
+import shutil
+from core.config import CACHE_DIR
+from core import governor
+from utils import file_hash
+
+# Loudness measurements (EBU R128 via ffmpeg loudnorm's analysis pass), cached
+# by file content hash under cache/loudness so each file is measured once no
+# matter how many projects or runs use it.
+#
+# Normalization plan:
+#   - "gain": integrated loudness can reach the target with a static linear gain
+#     without pushing the true peak over the ceiling and the loudness range is
+#     already within target -> cheap, transparent volume change.
+#   - "loudnorm": otherwise, a second loudnorm pass fed with the cached
+#     measurements (linear mode where ffmpeg can, dynamic where it must).
+
+LOUDNESS_CACHE_DIR = os.path.join(CACHE_DIR, "loudness")
+
+TARGET_I = -16.0
+TARGET_TP = -1.5
+TARGET_LRA = 11.0
+
+def _analysis_filter(target_i, target_tp, target_lra):
+    return f"loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}:print_format=json"
+
+def _run_analysis(path, target_i=TARGET_I, target_tp=TARGET_TP, target_lra=TARGET_LRA):
+    cmd = ["ffmpeg", "-hide_banner", "-nostats", "-i", path,
+           "-af", _analysis_filter(target_i, target_tp, target_lra), "-f", "null", "-"]
+    result = governor.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"loudnorm analysis failed: {result.stderr[-200:]}")
+    # The JSON block is the last {...} in stderr
+    match = re.search(r"\{[^{}]*\"input_i\"[^{}]*\}", result.stderr, re.S)
+    if not match:
+        raise RuntimeError("loudnorm analysis returned no measurements")
+    raw = json.loads(match.group(0))
+    return {
+        "input_i": float(raw["input_i"]),
+        "input_tp": float(raw["input_tp"]),
+        "input_lra": float(raw["input_lra"]),
+        "input_thresh": float(raw["input_thresh"]),
+        "target_offset": float(raw.get("target_offset", 0.0)),
+    }
+
+def measure(path, content_hash=None):
+    """
+    Returns the cached loudness measurement for the file's content, measuring
+    it first if needed. Returns None if ffmpeg is unavailable or analysis fails.
+    """
+    content_hash = content_hash or file_hash.content_hash(path)
+    cache_path = os.path.join(LOUDNESS_CACHE_DIR, f"{content_hash}.json")
+    if os.path.exists(cache_path):
+        try:
+            with open(cache_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    if not shutil.which("ffmpeg"):
+        return None
+    try:
+        measurement = _run_analysis(path)
+    except Exception:
+        return None
+    measurement["hash"] = content_hash
+
+    os.makedirs(LOUDNESS_CACHE_DIR, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(measurement, f, indent=2)
+    os.replace(tmp_path, cache_path)
+    return measurement
+
+def plan(measurement, target_i=TARGET_I, target_tp=TARGET_TP, target_lra=TARGET_LRA):
+    """Decides between a static gain and a two-pass loudnorm for a measurement."""
+    if not measurement or not math.isfinite(measurement["input_i"]):
+        return {"mode": "none"}
+
+    gain_db = target_i - measurement["input_i"]
+    if measurement["input_tp"] + gain_db <= target_tp and measurement["input_lra"] <= target_lra:
+        return {"mode": "gain", "gain_db": round(gain_db, 2)}
+
+    loudnorm = (
+        f"loudnorm=I={target_i}:TP={target_tp}:LRA={target_lra}"
+        f":measured_I={measurement['input_i']}:measured_TP={measurement['input_tp']}"
+        f":measured_LRA={measurement['input_lra']}:measured_thresh={measurement['input_thresh']}"
+        f":offset={measurement['target_offset']}:linear=true"
+    )
+    return {"mode": "loudnorm", "filter": loudnorm}
+
+def gain_db_for(measurement, target_i=TARGET_I):
+    """dB needed to bring a measured integrated loudness to target_i (0.0 if unmeasurable)."""
+    if not measurement or not math.isfinite(measurement["input_i"]):
+        return 0.0
+    return round(target_i - measurement["input_i"], 2)
+
+def static_gain_db(path, target_i=TARGET_I):
+    """dB needed to bring a file's integrated loudness to target_i (0.0 if unmeasurable)."""
+    return gain_db_for(measure(path), target_i)
+
+def apply_gain(src, dst, gain_db, sample_rate):
+    """Writes src scaled by gain_db to dst as 16-bit PCM WAV."""
+    from utils import audio_engine
+    if audio_engine.available() and src.lower().endswith(".wav"):
+        try:
+            data, rate = audio_engine._read_wav(src)
+            audio_engine.write_wav(data, dst, rate=rate, voice_gain=audio_engine.db_to_gain(gain_db))
+            return
+        except Exception:
+            pass # e.g. float WAV; let ffmpeg handle it
+    cmd = ["ffmpeg", "-y", "-i", src, "-af", f"volume={gain_db}dB",
+           "-ar", str(sample_rate), "-c:a", "pcm_s16le", dst]
+    governor.run(cmd, check=True, capture_output=True)
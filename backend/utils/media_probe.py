@@ -0,0 +1,279 @@
+import os
+import struct
+import shutil
+import threading
+import subprocess
+from collections import OrderedDict
+
+# Duration probing without subprocesses for the formats this app produces
+# (WAV from TTS/mixing, MP3 from TTS/music, MP4 from render). Headers are
+# parsed in pure Python; ffprobe (then pydub) is only used for anything else.
+# Results are cached per (path, size, mtime_ns), so repeated lookups
+# (e.g. listing voice variants) don't touch the file again.
+
+CACHE_MAX_ENTRIES = 4096
+
+_cache = OrderedDict()
+_lock = threading.Lock()
+
+# --- WAV ---
+
+def _probe_wav(f, file_size):
+    header = f.read(12)
+    if len(header) < 12 or header[:4] not in (b"RIFF", b"RF64") or header[8:12] != b"WAVE":
+        return None
+    rf64 = header[:4] == b"RF64"
+    data_size_64 = None
+    fmt = None
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            return None
+        chunk_id, size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if chunk_id == b"ds64":
+            body = f.read(size)
+            data_size_64 = struct.unpack("<Q", body[8:16])[0]
+            f.seek(size % 2, 1)
+        elif chunk_id == b"fmt ":
+            body = f.read(size)
+            channels, rate, byte_rate, block_align = struct.unpack("<HIIH", body[2:14])
+            fmt = (channels, rate, byte_rate, block_align)
+            f.seek(size % 2, 1)
+        elif chunk_id == b"data":
+            if fmt is None or fmt[2] == 0:
+                return None
+            if rf64 and data_size_64 is not None:
+                size = data_size_64
+            # Streamed/unfinished writers leave 0 or 0xFFFFFFFF: use what's on disk
+            available = file_size - f.tell()
+            if size == 0 or size > available:
+                size = available
+            channels, rate, byte_rate, block_align = fmt
+            return {"format": "wav", "duration": size / float(byte_rate),
+                    "sample_rate": rate, "channels": channels}
+        else:
+            f.seek(size + size % 2, 1)
+
+# --- MP3 ---
+
+_MP3_BITRATES = {
+    # (version_is_mpeg1, layer) -> kbps table
+    (True, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (True, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (True, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (False, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (False, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (False, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_RATES = {3: [44100, 48000, 32000], 2: [22050, 24000, 16000], 0: [11025, 12000, 8000]}
+
+def _mp3_frame(header):
+    """Parses a 4-byte MPEG audio frame header. Returns a dict or None if invalid."""
+    if len(header) < 4 or header[0] != 0xFF or (header[1] & 0xE0) != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03   # 3 = MPEG1, 2 = MPEG2, 0 = MPEG2.5
+    layer = 4 - ((header[1] >> 1) & 0x03)
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    mpeg1 = version == 3
+    bitrate = _MP3_BITRATES[(mpeg1, layer)][bitrate_index] * 1000
+    rate = _MP3_RATES[version][rate_index]
+    padding = (header[2] >> 1) & 0x01
+    mono = (header[3] >> 6) == 3
+
+    if layer == 1:
+        samples = 384
+        length = (12 * bitrate // rate + padding) * 4
+    else:
+        samples = 1152 if (layer == 2 or mpeg1) else 576
+        length = samples // 8 * bitrate // rate + padding
+    if mpeg1:
+        side_info = 17 if mono else 32
+    else:
+        side_info = 9 if mono else 17
+    return {"bitrate": bitrate, "rate": rate, "samples": samples, "length": length,
+            "channels": 1 if mono else 2, "side_info": side_info}
+
+def _skip_id3v2(f):
+    header = f.read(10)
+    if len(header) == 10 and header[:3] == b"ID3":
+        size = (header[6] << 21) | (header[7] << 14) | (header[8] << 7) | header[9]
+        footer = 10 if header[5] & 0x10 else 0
+        return 10 + size + footer
+    return 0
+
+def _find_sync(f, start, limit=64 * 1024):
+    f.seek(start)
+    buf = f.read(limit)
+    for i in range(len(buf) - 3):
+        if buf[i] == 0xFF and _mp3_frame(buf[i:i + 4]):
+            return start + i
+    return None
+
+def _probe_mp3(f, file_size):
+    offset = _find_sync(f, _skip_id3v2(f))
+    if offset is None:
+        return None
+    f.seek(offset)
+    first = f.read(4 + 32 + 40)
+    frame = _mp3_frame(first)
+    if not frame:
+        return None
+    info = {"format": "mp3", "sample_rate": frame["rate"], "channels": frame["channels"]}
+
+    # VBR headers carry the frame count directly
+    xing_at = 4 + frame["side_info"]
+    tag = first[xing_at:xing_at + 4]
+    if tag in (b"Xing", b"Info"):
+        flags = struct.unpack(">I", first[xing_at + 4:xing_at + 8])[0]
+        if flags & 0x1:
+            frames = struct.unpack(">I", first[xing_at + 8:xing_at + 12])[0]
+            info["duration"] = frames * frame["samples"] / float(frame["rate"])
+            return info
+    if first[36:40] == b"VBRI":
+        frames = struct.unpack(">I", first[36 + 14:36 + 18])[0]
+        info["duration"] = frames * frame["samples"] / float(frame["rate"])
+        return info
+
+    # No header: walk the frames (header reads only)
+    end = file_size
+    f.seek(max(0, file_size - 128))
+    if f.read(3) == b"TAG":
+        end -= 128
+    frames = 0
+    samples = 0
+    pos = offset
+    while pos + 4 <= end:
+        f.seek(pos)
+        current = _mp3_frame(f.read(4))
+        if not current or current["length"] <= 0:
+            resync = _find_sync(f, pos + 1, limit=4096)
+            if resync is None or resync >= end:
+                break
+            pos = resync
+            continue
+        frames += 1
+        samples += current["samples"]
+        pos += current["length"]
+    if frames == 0:
+        return None
+    info["duration"] = samples / float(frame["rate"])
+    return info
+
+# --- MP4 / MOV ---
+
+def _iter_boxes(f, start, end):
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack(">I4s", header)
+        header_len = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]
+            header_len = 16
+        elif size == 0:
+            size = end - pos
+        if size < header_len:
+            return
+        yield box_type, pos + header_len, pos + size
+        pos += size
+
+def _probe_mp4(f, file_size):
+    f.seek(4)
+    if f.read(4) not in (b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip"):
+        return None
+    for box_type, body, end in _iter_boxes(f, 0, file_size):
+        if box_type != b"moov":
+            continue
+        for child, child_body, _ in _iter_boxes(f, body, end):
+            if child != b"mvhd":
+                continue
+            f.seek(child_body)
+            version = f.read(4)[0]
+            if version == 1:
+                _, _, timescale, duration = struct.unpack(">QQIQ", f.read(28))
+            else:
+                _, _, timescale, duration = struct.unpack(">IIII", f.read(16))
+            if not timescale:
+                return None
+            return {"format": "mp4", "duration": duration / float(timescale)}
+    return None
+
+# --- Fallback ---
+
+def _probe_ffprobe(path):
+    if not shutil.which("ffprobe"):
+        return None
+    cmd = ["ffprobe", "-v", "error", "-show_entries", "format=duration",
+           "-of", "default=noprint_wrappers=1:nokey=1", path]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True)
+    except OSError:
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        return {"format": "ffprobe", "duration": float(result.stdout.strip())}
+    except ValueError:
+        return None
+
+def _probe_pydub(path):
+    """Last resort when ffprobe is missing or fails (decodes the whole file)."""
+    try:
+        from pydub import AudioSegment
+        audio = AudioSegment.from_file(path)
+    except Exception:
+        return None
+    return {"format": "pydub", "duration": len(audio) / 1000.0}
+
+_PARSERS = {
+    ".wav": _probe_wav,
+    ".mp3": _probe_mp3,
+    ".mp4": _probe_mp4, ".m4a": _probe_mp4, ".mov": _probe_mp4,
+}
+
+def _probe_uncached(path, file_size):
+    parser = _PARSERS.get(os.path.splitext(path)[1].lower())
+    if parser:
+        try:
+            with open(path, "rb") as f:
+                info = parser(f, file_size)
+            if info:
+                return info
+        except (OSError, struct.error, IndexError, KeyError):
+            pass
+    return _probe_ffprobe(path) or _probe_pydub(path)
+
+def probe(path):
+    """
+    Returns {"format", "duration", ...} for a media file, or None if it can't be read.
+    Cached by (path, size, mtime_ns); failures are not cached.
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    with _lock:
+        if key in _cache:
+            _cache.move_to_end(key)
+            return _cache[key]
+
+    info = _probe_uncached(path, st.st_size)
+    if info:
+        info["duration"] = round(info["duration"], 3)
+        with _lock:
+            _cache[key] = info
+            while len(_cache) > CACHE_MAX_ENTRIES:
+                _cache.popitem(last=False)
+    return info
+
+def duration(path):
+    """Duration in seconds, or 0.0 if unknown."""
+    info = probe(path)
+    return info["duration"] if info else 0.0
@@ -0,0 +1,253 @@
+import os
+import json
+import threading
+from core.config import CACHE_DIR
+
+# Background music library for backend/assets/music.
+# Each track is decoded once to float32 PCM at the mix rate and stored as .npy
+# under cache/music, so mixes memory-map it instead of decoding the MP3 again.
+# index.json keeps per-track metadata: duration, loudness (and the gain that
+# levels the track to the reference loudness), a per-second energy curve and
+# a rough tempo / beat grid.
+#
+# Decoding and analysis never run inside a listing request: list_tracks()
+# serves what is indexed and refreshes stale tracks in a background thread,
+# and get_track() (the mix path) refreshes only the track it needs.
+
+MUSIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets", "music")
+LIBRARY_DIR = os.path.join(CACHE_DIR, "music")
+INDEX_PATH = os.path.join(LIBRARY_DIR, "index.json")
+VALID_EXTS = (".mp3", ".wav")
+
+ENERGY_HOP_SEC = 1.0
+ONSET_HOP_SEC = 0.01
+TEMPO_RANGE_BPM = (60, 180)
+
+_lock = threading.Lock() # index.json read-modify-write
+_track_locks = {} # filename -> lock held while that track is decoded
+_track_locks_lock = threading.Lock()
+_background = None
+
+def _load_index():
+    try:
+        with open(INDEX_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_index(index):
+    os.makedirs(LIBRARY_DIR, exist_ok=True)
+    tmp_path = INDEX_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(tmp_path, INDEX_PATH)
+
+def _track_files():
+    if not os.path.isdir(MUSIC_DIR):
+        return []
+    return sorted(f for f in os.listdir(MUSIC_DIR) if f.lower().endswith(VALID_EXTS))
+
+def _is_current(entry, path):
+    st = os.stat(path)
+    return entry.get("size") == st.st_size and entry.get("mtime_ns") == st.st_mtime_ns
+
+def _energy_db(data, rate):
+    """RMS level (dBFS) per ENERGY_HOP_SEC, rounded for the index."""
+    from utils import audio_engine
+    levels, _ = audio_engine.rms_envelope_db(data, rate, hop_sec=ENERGY_HOP_SEC)
+    return [round(float(x), 1) for x in levels]
+
+def _tempo(data, rate):
+    """Rough tempo (BPM) and beat times from the autocorrelation of the onset envelope."""
+    from utils import audio_engine
+    np = audio_engine.np
+    levels, hop = audio_engine.rms_envelope_db(data, rate, hop_sec=ONSET_HOP_SEC)
+    if len(levels) < 200:
+        return None, []
+    onset = np.maximum(np.diff(levels), 0.0)
+    onset -= onset.mean()
+    corr = np.correlate(onset, onset, mode="full")[len(onset) - 1:]
+
+    hop_sec = hop / rate
+    min_lag = int(60.0 / TEMPO_RANGE_BPM[1] / hop_sec)
+    max_lag = min(len(corr) - 1, int(60.0 / TEMPO_RANGE_BPM[0] / hop_sec))
+    if max_lag <= min_lag:
+        return None, []
+    lag = min_lag + int(np.argmax(corr[min_lag:max_lag + 1]))
+    period = lag * hop_sec
+
+    # Phase: the offset within one period with the strongest onsets
+    phase = int(np.argmax([onset[i::lag].sum() for i in range(lag)]))
+    beats = np.arange(phase * hop_sec, len(levels) * hop_sec, period)
+    return round(60.0 / period, 1), [round(float(t), 3) for t in beats]
+
+def _build_entry(filename):
+    from utils import audio_engine, loudness, file_hash
+    np = audio_engine.np
+    path = os.path.join(MUSIC_DIR, filename)
+    st = os.stat(path)
+    content_hash = file_hash.content_hash(path)
+
+    entry = {
+        "file": filename,
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+        "hash": content_hash,
+        "rate": audio_engine.MIX_RATE,
+        "channels": audio_engine.MIX_CHANNELS,
+    }
+
+    measurement = loudness.measure(path, content_hash=content_hash)
+    entry["loudness"] = measurement
+    entry["gain_db"] = loudness.gain_db_for(measurement)
+
+    data = audio_engine.load_audio(path)
+    pcm_name = f"{os.path.splitext(filename)[0]}-{content_hash[:12]}.npy"
+    os.makedirs(LIBRARY_DIR, exist_ok=True)
+    tmp_path = os.path.join(LIBRARY_DIR, pcm_name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, data)
+    os.replace(tmp_path, os.path.join(LIBRARY_DIR, pcm_name))
+
+    entry["pcm"] = pcm_name
+    entry["frames"] = len(data)
+    entry["duration"] = round(len(data) / float(audio_engine.MIX_RATE), 3)
+    entry["energy_db"] = _energy_db(data, audio_engine.MIX_RATE)
+    entry["tempo_bpm"], entry["beats"] = _tempo(data, audio_engine.MIX_RATE)
+    return entry
+
+def _track_lock(filename):
+    with _track_locks_lock:
+        return _track_locks.setdefault(filename, threading.Lock())
+
+def _refresh_track(filename, force=False):
+    """
+    Decodes and analyses one track if its entry is missing or stale, and stores it.
+    Only this track is locked while it is decoded. Returns the entry (None if the file is gone).
+    """
+    from utils import audio_engine
+    path = os.path.join(MUSIC_DIR, filename)
+    with _track_lock(filename):
+        if not os.path.exists(path):
+            return None
+        entry = _load_index().get(filename)
+        if entry and not force and _is_current(entry, path) and "error" not in entry:
+            return entry
+        try:
+            if not audio_engine.available():
+                raise RuntimeError("numpy not available")
+            entry = _build_entry(filename)
+        except Exception as e:
+            st = os.stat(path)
+            entry = {"file": filename, "size": st.st_size, "mtime_ns": st.st_mtime_ns,
+                     "gain_db": 0.0, "error": str(e)}
+        with _lock:
+            index = _load_index()
+            previous = index.get(filename)
+            if previous and previous.get("pcm") != entry.get("pcm"):
+                _remove_pcm(previous)
+            index[filename] = entry
+            _save_index(index)
+        return entry
+
+def _stale_tracks(index, files):
+    return [f for f in files
+            if f not in index or not _is_current(index[f], os.path.join(MUSIC_DIR, f))]
+
+def _drop_removed(files):
+    with _lock:
+        index = _load_index()
+        removed = [f for f in index if f not in files]
+        for filename in removed:
+            _remove_pcm(index.pop(filename))
+        if removed:
+            _save_index(index)
+        return index
+
+def build_index(force=False):
+    """
+    Brings the index up to date with assets/music: new or changed tracks are decoded
+    and analysed, removed tracks are dropped. Returns the index.
+    Tracks that can't be decoded (no numpy/ffmpeg) are listed without "pcm".
+    """
+    files = _track_files()
+    index = _drop_removed(files)
+    for filename in (files if force else _stale_tracks(index, files)):
+        _refresh_track(filename, force=force)
+    return _load_index()
+
+def build_index_async():
+    """Starts build_index() in a background thread (no-op while one is running)."""
+    global _background
+    with _track_locks_lock:
+        if _background is not None and _background.is_alive():
+            return
+        _background = threading.Thread(target=build_index, name="music-index", daemon=True)
+        _background.start()
+
+def _remove_pcm(entry):
+    pcm = entry.get("pcm")
+    if pcm:
+        try: os.remove(os.path.join(LIBRARY_DIR, pcm))
+        except OSError: pass
+
+def _warm(files, index):
+    """Starts a background refresh if any track is new, changed or removed."""
+    if _stale_tracks(index, files) or any(f not in files for f in index):
+        build_index_async()
+
+def track_names():
+    """Library track filenames (no decoding; stale tracks are analysed in the background)."""
+    files = _track_files()
+    _warm(files, _load_index())
+    return files
+
+def list_tracks():
+    """
+    Track metadata (without beat lists) sorted by filename. New or changed tracks are
+    analysed in the background and listed as {"file", "size", "pending": True} meanwhile.
+    """
+    files = _track_files()
+    index = _load_index()
+    _warm(files, index)
+    tracks = []
+    for f in files:
+        path = os.path.join(MUSIC_DIR, f)
+        entry = index.get(f)
+        if entry and _is_current(entry, path):
+            tracks.append({k: v for k, v in entry.items() if k != "beats"})
+        else:
+            tracks.append({"file": f, "size": os.path.getsize(path), "pending": True})
+    return tracks
+
+def get_track(filename):
+    """Index entry for an assets/music track (refreshed if the file changed), or None."""
+    filename = os.path.basename(filename)
+    path = os.path.join(MUSIC_DIR, filename)
+    if not os.path.exists(path):
+        return None
+    entry = _load_index().get(filename)
+    if entry and _is_current(entry, path) and "error" not in entry:
+        return entry
+    return _refresh_track(filename)
+
+def find_track(music_path):
+    """
+    Library entry for a music file if it is (or is an identical copy of) a library track.
+    Older projects have a copy of the default track in input/; those map back here too.
+    """
+    filename = os.path.basename(music_path)
+    entry = get_track(filename)
+    if not entry or not entry.get("pcm"):
+        return None
+    if os.path.dirname(os.path.abspath(music_path)) == os.path.abspath(MUSIC_DIR):
+        return entry
+    from utils import file_hash
+    if os.path.getsize(music_path) == entry["size"] and file_hash.content_hash(music_path) == entry["hash"]:
+        return entry
+    return None
+
+def load_pcm(entry):
+    """Memory-maps the decoded track: read-only float32 (frames, channels) at the mix rate."""
+    from utils import audio_engine
+    return audio_engine.np.load(os.path.join(LIBRARY_DIR, entry["pcm"]), mmap_mode="r")
@@ -0,0 +1,133 @@
+import io
+import wave
+import struct
+
+# Small in-memory helpers for 16-bit PCM WAV audio (what Gemini TTS returns).
+# Everything here works on bytes so audio can be stitched without temp files,
+# sox or pydub, and without any lossy re-encode.
+
+GEMINI_RATE = 24000 # Gemini TTS: mono 16-bit PCM at 24 kHz
+
+def read_wav(data):
+    """Returns (frames, (nchannels, sampwidth, framerate)) from WAV bytes."""
+    with wave.open(io.BytesIO(data), 'rb') as wav_file:
+        params = (wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate())
+        frames = wav_file.readframes(wav_file.getnframes())
+    return frames, params
+
+def write_wav(frames, nchannels=1, sampwidth=2, framerate=GEMINI_RATE):
+    """Wraps raw PCM frames in a WAV container."""
+    with io.BytesIO() as wav_io:
+        with wave.open(wav_io, 'wb') as wav_file:
+            wav_file.setnchannels(nchannels)
+            wav_file.setsampwidth(sampwidth)
+            wav_file.setframerate(framerate)
+            wav_file.writeframes(frames)
+        return wav_io.getvalue()
+
+def silence(seconds, nchannels=1, sampwidth=2, framerate=GEMINI_RATE):
+    """Digital silence of the given length, rounded to whole frames."""
+    n_frames = max(0, int(round(seconds * framerate)))
+    return b"\x00" * (n_frames * nchannels * sampwidth)
+
+def concat_wav(chunks, gap_sec=0.0):
+    """
+    Concatenates WAV byte strings with gap_sec of silence between them.
+    All chunks must share the same format.
+    """
+    if not chunks:
+        raise ValueError("No audio chunks to concatenate")
+    parts = []
+    params = None
+    for i, data in enumerate(chunks):
+        frames, chunk_params = read_wav(data)
+        if params is None:
+            params = chunk_params
+        elif chunk_params != params:
+            raise ValueError(f"Chunk {i} format {chunk_params} differs from {params}")
+        if i > 0 and gap_sec > 0:
+            parts.append(silence(gap_sec, *params))
+        parts.append(frames)
+    return write_wav(b"".join(parts), *params)
+
+def streaming_wav_header(nchannels=1, sampwidth=2, framerate=GEMINI_RATE):
+    """
+    44-byte PCM WAV header for a stream of unknown length: the RIFF and data sizes
+    are 0xFFFFFFFF, which browsers and ffmpeg read as "until end of stream".
+    """
+    unknown = 0xFFFFFFFF
+    block_align = nchannels * sampwidth
+    return (b"RIFF" + struct.pack("<I", unknown) + b"WAVE"
+            + b"fmt " + struct.pack("<IHHIIHH", 16, 1, nchannels, framerate,
+                                    framerate * block_align, block_align, sampwidth * 8)
+            + b"data" + struct.pack("<I", unknown))
+
+def frames_view(data):
+    """
+    Zero-copy view of the PCM frames in WAV bytes: (memoryview, (nchannels, sampwidth, framerate)).
+    Only plain PCM / extensible-PCM WAV is accepted.
+    """
+    view = memoryview(data)
+    if bytes(view[:4]) != b"RIFF" or bytes(view[8:12]) != b"WAVE":
+        raise ValueError("Not a RIFF/WAVE file")
+    pos = 12
+    params = None
+    while pos + 8 <= len(view):
+        chunk_id = bytes(view[pos:pos + 4])
+        size = struct.unpack("<I", view[pos + 4:pos + 8])[0]
+        body = pos + 8
+        if chunk_id == b"fmt ":
+            fmt_tag, nchannels, framerate = struct.unpack("<HHI", view[body:body + 8])
+            sampwidth = struct.unpack("<H", view[body + 14:body + 16])[0] // 8
+            if fmt_tag not in (1, 0xFFFE):
+                raise ValueError(f"Unsupported WAV format tag: {fmt_tag}")
+            params = (nchannels, sampwidth, framerate)
+        elif chunk_id == b"data":
+            if params is None:
+                raise ValueError("WAV data chunk before fmt chunk")
+            end = min(len(view), body + size)
+            block = params[0] * params[1]
+            end -= (end - body) % block
+            return view[body:end], params
+        pos = body + size + (size % 2)
+    raise ValueError("WAV has no data chunk")
+
+def split_frames(frames, count, nchannels=1, sampwidth=2):
+    """Splits PCM into `count` equal parts on frame boundaries (views, no copies)."""
+    block = nchannels * sampwidth
+    total = len(frames) // block
+    bounds = [int(i * total / count) * block for i in range(count + 1)]
+    return [frames[bounds[i]:bounds[i + 1]] for i in range(count)]
+
+def compose(frames, params, start_sec=0.0, end_sec=0.0, segments=1, pause_sec=0.0):
+    """
+    Parts for: start silence + frames split into `segments` with pause_sec between
+    them + end silence. Audio parts are views of `frames`; silence lengths are
+    round(sec * rate) frames, so the result is exact to the sample. The segments
+    are equal-length (split_frames), not aligned to sentences or words.
+    """
+    parts = []
+    if start_sec > 0:
+        parts.append(silence(start_sec, *params))
+    pieces = split_frames(frames, segments, params[0], params[1]) if segments > 1 else [frames]
+    gap = silence(pause_sec, *params) if pause_sec > 0 and len(pieces) > 1 else b""
+    for i, piece in enumerate(pieces):
+        if i > 0 and gap:
+            parts.append(gap)
+        parts.append(piece)
+    if end_sec > 0:
+        parts.append(silence(end_sec, *params))
+    return parts
+
+def write_wav_parts(path, parts, nchannels=1, sampwidth=2, framerate=GEMINI_RATE):
+    """Writes a WAV file from PCM parts without joining them in memory first."""
+    data_size = sum(len(p) for p in parts)
+    block_align = nchannels * sampwidth
+    header = (b"RIFF" + struct.pack("<I", 36 + data_size) + b"WAVE"
+              + b"fmt " + struct.pack("<IHHIIHH", 16, 1, nchannels, framerate,
+                                      framerate * block_align, block_align, sampwidth * 8)
+              + b"data" + struct.pack("<I", data_size))
+    with open(path, "wb") as f:
+        f.write(header)
+        for part in parts:
+            f.write(part)
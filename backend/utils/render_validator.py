@@ -19,10 +19,11 @@ def validate_render(project_path, fps=30):
 
     # 1. Asset Validation
     # Check Voice
-    voice_path = os.path.join(project_path, "audio", "voice.mp3")
-    if not os.path.exists(voice_path):
+    from utils.voice_paths import raw_voice_path
+    voice_path = raw_voice_path(project_path)
+    if not voice_path:
         report["status"] = "FAIL"
-        report["errors"].append("Missing audio file: voice.mp3")
+        report["errors"].append("Missing audio file: voice.wav")
     else:
         report["details"]["audio_exists"] = True
 
@@ -65,9 +66,12 @@ def validate_render(project_path, fps=30):
     
     expected_cursor = first_start
     
-    # 3. Image Existence Check
+    # 3. Image Existence Check (input/ images answered by the image index)
+    from utils import image_index
     input_dir = os.path.join(project_path, "input")
+    images_meta = image_index.entries(project_path)
     missing_images = []
+    rotated_images = []
 
     for i, seg in enumerate(segments):
         # Time continuity check
@@ -83,15 +87,22 @@ def validate_render(project_path, fps=30):
         if img_name.startswith("../"):
             # Resolve relative to input dir -> project root
             img_path = os.path.normpath(os.path.join(input_dir, img_name))
+            exists = os.path.exists(img_path)
         else:
-            img_path = os.path.join(input_dir, img_name)
+            meta = images_meta.get(img_name)
+            exists = meta is not None
+            if meta and meta.get("orientation", 1) != 1:
+                rotated_images.append(img_name)
             
-        if not os.path.exists(img_path):
+        if not exists:
             missing_images.append(img_name)
             report["status"] = "FAIL"
     
     if missing_images:
         report["errors"].append(f"Missing image files: {', '.join(missing_images)}")
+    if rotated_images:
+        # The renderer ignores EXIF orientation: these may appear rotated
+        report["warnings"].append(f"Images with EXIF rotation (normalize them first): {', '.join(sorted(set(rotated_images)))}")
 
     # Check trailing silence coverage
     # Updated logic: Segments should now cover the entire duration (including silence_end)
@@ -0,0 +1,139 @@
+try:
+    import numpy as np
+except ImportError: # Local detection is skipped without numpy
+    np = None
+
+# Local subject detection for smart crop, an offline alternative to the Gemini
+# ROI call (ai_detector) that runs in milliseconds on a thumbnail-sized decode.
+# Product shots on a plain background (the common case for scraped listings)
+# are segmented against the border colour; anything else falls back to
+# spectral-residual saliency (Hou & Zhang 2007). Returns the same shape as
+# ai_detector.detect_roi, with a confidence the caller can use to decide
+# whether to ask Gemini instead.
+
+ANALYSIS_SIZE = 128 # Longest side of the analysed image
+SALIENCY_SIZE = 64 # Spectral residual works on a small fixed grid
+BORDER = 3 # Border strip (px at ANALYSIS_SIZE) sampled for the background colour
+BG_TOLERANCE = 24 # Max channel difference from the background colour
+BG_MIN_UNIFORMITY = 0.9 # Share of border pixels that must match it
+MARGIN = 0.03 # Padding around the detected box (fraction of the image)
+
+def available():
+    return np is not None
+
+def _box_blur(a, size):
+    pad = size // 2
+    c = np.pad(a, pad, mode="edge").cumsum(0).cumsum(1)
+    c = np.pad(c, ((1, 0), (1, 0)))
+    return (c[size:, size:] - c[:-size, size:] - c[size:, :-size] + c[:-size, :-size]) / (size * size)
+
+def _mass_box(weights, trim):
+    """(y0, x0, y1, x1) holding all but `trim` of the weight on each side, None if empty."""
+    total = weights.sum()
+    if total <= 0:
+        return None
+    def span(profile):
+        cum = np.cumsum(profile) / total
+        return int(np.searchsorted(cum, trim)), int(np.searchsorted(cum, 1 - trim)) + 1
+    y0, y1 = span(weights.sum(axis=1))
+    x0, x1 = span(weights.sum(axis=0))
+    return y0, x0, min(y1, weights.shape[0]), min(x1, weights.shape[1])
+
+def _normalized(box, h, w):
+    y0, x0, y1, x1 = box
+    my, mx = MARGIN * h, MARGIN * w
+    return {
+        "ymin": int(max(0, y0 - my) * 1000 / h),
+        "xmin": int(max(0, x0 - mx) * 1000 / w),
+        "ymax": int(min(h, y1 + my) * 1000 / h),
+        "xmax": int(min(w, x1 + mx) * 1000 / w),
+    }
+
+def _background_box(rgb):
+    """Subject box against a uniform border colour: (box, confidence) or None."""
+    b = BORDER
+    border = np.concatenate([rgb[:b].reshape(-1, 3), rgb[-b:].reshape(-1, 3),
+                             rgb[:, :b].reshape(-1, 3), rgb[:, -b:].reshape(-1, 3)])
+    bg = np.median(border, axis=0)
+    uniformity = float((np.abs(border - bg).max(axis=1) < BG_TOLERANCE).mean())
+    if uniformity < BG_MIN_UNIFORMITY:
+        return None
+    mask = np.abs(rgb - bg).max(axis=2) >= BG_TOLERANCE
+    area = mask.mean()
+    if area < 0.01: # Blank image
+        return None
+    box = _mass_box(mask.astype(np.float32), 0.005)
+    # A "subject" filling the whole frame means the border match was a coincidence
+    confidence = uniformity if area < 0.9 else uniformity * 0.5
+    return box, confidence
+
+def _saliency_box(gray):
+    """Spectral-residual saliency box: (box, confidence) or None."""
+    from PIL import Image
+    small = np.asarray(Image.fromarray(gray).resize((SALIENCY_SIZE, SALIENCY_SIZE), Image.BILINEAR), dtype=np.float64)
+    spectrum = np.fft.fft2(small)
+    log_amp = np.log(np.abs(spectrum) + 1e-8)
+    residual = log_amp - _box_blur(log_amp, 3)
+    sal = np.abs(np.fft.ifft2(np.exp(residual + 1j * np.angle(spectrum)))) ** 2
+    sal = _box_blur(_box_blur(sal, 5), 5)
+    sal = np.asarray(Image.fromarray(sal.astype(np.float32)).resize((gray.shape[1], gray.shape[0]), Image.BILINEAR))
+
+    weights = np.where(sal > sal.mean() * 2, sal, 0)
+    box = _mass_box(weights, 0.05)
+    if box is None:
+        return None
+    y0, x0, y1, x1 = box
+    area = (y1 - y0) * (x1 - x0) / weights.size
+    if area <= 0:
+        return None
+    # Saliency packed into a small box is a clear subject; spread out is clutter
+    concentration = sal[y0:y1, x0:x1].sum() / sal.sum() / area
+    confidence = float(np.clip((concentration - 1) / 3, 0, 1)) * 0.8
+    return box, confidence
+
+def _not_found(error=None):
+    result = {"roi": None, "type": "none", "confidence": 0.0}
+    if error:
+        result["error"] = error
+    return result
+
+def detect_roi(image_path):
+    """
+    Detects the primary subject locally.
+    Returns: { "roi": { "ymin", "xmin", "ymax", "xmax" }, "type": "product|object|none", "confidence": 0-1 }
+    Coordinates are normalized (0-1000), as in ai_detector.detect_roi. Without numpy or
+    on error, roi is None and "error" gives the reason.
+    """
+    if np is None:
+        return _not_found("numpy not installed")
+    from PIL import Image
+    from utils.image_processor import open_reduced
+    try:
+        img, _ = open_reduced(image_path, ANALYSIS_SIZE * 2, ANALYSIS_SIZE * 2, mode="fit")
+        with img:
+            img.thumbnail((ANALYSIS_SIZE, ANALYSIS_SIZE), Image.BILINEAR)
+            if img.mode in ("RGBA", "LA") or "transparency" in img.info:
+                with img.convert("RGBA") as rgba:
+                    alpha = np.asarray(rgba.getchannel("A"))
+                # Cut-out product: the alpha channel is the mask
+                edges = (alpha[0], alpha[-1], alpha[:, 0], alpha[:, -1])
+                if max(e.max() for e in edges) < 16 and (alpha > 16).mean() > 0.01:
+                    h, w = alpha.shape
+                    box = _mass_box((alpha > 16).astype(np.float32), 0.005)
+                    return {"roi": _normalized(box, h, w), "type": "product", "confidence": 0.95}
+            with img.convert("RGB") as rgb_img, rgb_img.convert("L") as gray_img:
+                gray = np.asarray(gray_img)
+                rgb = np.asarray(rgb_img, dtype=np.int16)
+    except Exception as e:
+        return _not_found(f"Local ROI detection failed: {e}")
+
+    h, w = gray.shape
+    found = _background_box(rgb)
+    subject_type = "product"
+    if found is None:
+        found = _saliency_box(gray)
+        subject_type = "object"
+    if found is None:
+        return _not_found()
+    box, confidence = found
+    return {"roi": _normalized(box, h, w), "type": subject_type, "confidence": round(confidence, 2)}
@@ -46,51 +46,27 @@ def call_gemini_api(prompt, product_name):
         print(f"Gemini API Error: {str(e)}")
         return None
 
-def generate_script(project_id, project_path):
+def generate_script(project_id, project_path, ctx=None):
     """
     Generate a video review script using Gemini AI.
     Includes auto-regeneration if the script doesn't meet constraints.
-    Reads settings from project.json for template and word count target.
+    Template and word count target come from the run context (project over global).
     """
-    
-    from core.global_settings import get_settings
-    
-    settings = get_settings()
-    
-    # 1. Defaults from Global Settings
-    target_word_count = settings.script.target_word_count
-    prompt_template = settings.script.prompt_template
-    
-    # 2. Override with Project Settings (if available)
-    project_json_path = os.path.join(project_path, "project.json")
-    if os.path.exists(project_json_path):
-        try:
-            with open(project_json_path, 'r') as f:
-                pdata = json.load(f)
-                script_settings = pdata.get("settings", {}).get("script", {})
-                
-                # Only override if explicitly set in project config (non-zero/non-empty)
-                if "word_count" in script_settings:
-                    target_word_count = script_settings.get("word_count")
-                if "template" in script_settings and script_settings.get("template"):
-                    prompt_template = script_settings.get("template")
-        except:
-            pass
+    if ctx is None:
+        from core.run_context import RunContext
+        ctx = RunContext.resolve(project_path, project_id)
+
+    # 1. Template and target (project settings override global defaults)
+    target_word_count = ctx.target_word_count
+    prompt_template = ctx.prompt_template
 
     # Fallback/Safety (if template is somehow still empty)
     if not prompt_template:
         prompt_template = "Write a short product review for {{product_name}}"
 
     # 2. Get Product Information
-    product_name = "สินค้ายอดนิยม"
-    product_json = os.path.join(project_path, "input", "product.json")
-    if os.path.exists(product_json):
-        try:
-            with open(product_json, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                product_name = data.get("product_name", product_name)
-        except Exception as e:
-             log_event(project_path, "pipeline.log", f"[WARNING] Failed to read product.json: {str(e)}")
+    # input/product.json only; the project name is not used as a fallback here
+    product_name = ctx.product.get("product_name") or "สินค้ายอดนิยม"
              
     # 3. Resolve Prompt Variables
     # Supported: {{product_name}}, {{word_count}}, {{tone}}, {{cta}} (generic)
@@ -110,7 +86,19 @@ def generate_script(project_id, project_path):
     min_words = int(target_word_count * 0.8)
     max_words = int(target_word_count * 1.2)
     
-    log_event(project_path, "pipeline.log", f"[SCRIPT_GEN] Starting generation for: {product_name} (Target: {target_word_count} words)")
+    # Spoken length is predicted with the learned speech-rate model of the default voice
+    # ("random" -> pooled model of all voices); candidates must fit the video duration
+    from utils import speech_model
+    voice_provider, voice_name = speech_model.resolve_voice(ctx.settings.voice.default_voice_profile)
+    max_duration = ctx.max_duration
+    best_overshoot = None
+
+    def predict(text):
+        return speech_model.predict_total(voice_provider, voice_name, 1.0, text,
+                                          ctx.breathing_pause, ctx.voice_intro_silence, ctx.voice_outro_silence,
+                                          ctx.sentence_pause)
+
+    log_event(project_path, "pipeline.log", f"[SCRIPT_GEN] Starting generation for: {product_name} (Target: {target_word_count} words, max {max_duration}s)")
     
     for attempt in range(1, max_attempts + 1):
         # Try Gemini API first
@@ -124,23 +112,31 @@ def generate_script(project_id, project_path):
         # Validate constraints
         char_count = count_thai_chars(current_script)
         word_count = count_words(current_script)
+        predicted, model_source = predict(current_script)
         
         log_event(project_path, "pipeline.log", 
-                 f"[SCRIPT_GEN] Attempt {attempt}: {char_count} chars, {word_count} words")
+                 f"[SCRIPT_GEN] Attempt {attempt}: {char_count} chars, {word_count} words, ~{predicted:.1f}s spoken ({model_source})")
         
-        # Check if within acceptable range
-        if min_words <= word_count <= max_words:
+        # Check if within acceptable range and short enough to be spoken in full
+        if not min_words <= word_count <= max_words:
+            log_event(project_path, "pipeline.log", 
+                     f"[SCRIPT_GEN] Attempt {attempt}: ✗ OUT OF RANGE (target: {min_words}-{max_words} words)")
+        elif predicted > max_duration:
+            log_event(project_path, "pipeline.log", 
+                     f"[SCRIPT_GEN] Attempt {attempt}: ✗ TOO LONG (~{predicted:.1f}s > {max_duration}s, would be trimmed)")
+        else:
             log_event(project_path, "pipeline.log", 
                      f"[SCRIPT_GEN] Attempt {attempt}: ✓ ACCEPTED")
             final_script = current_script
             is_ok = True
             break
-        else:
-            log_event(project_path, "pipeline.log", 
-                     f"[SCRIPT_GEN] Attempt {attempt}: ✗ OUT OF RANGE (target: {min_words}-{max_words} words)")
-            # Retry logic could modify prompt to be shorter/longer but for now just retry
-            if attempt == max_attempts:
-                 final_script = current_script # Accept best effort
+
+        # Retry logic could modify prompt to be shorter/longer but for now just retry;
+        # best effort is the candidate that overshoots the duration the least
+        overshoot = max(0.0, predicted - max_duration)
+        if best_overshoot is None or overshoot < best_overshoot:
+            best_overshoot = overshoot
+            final_script = current_script
 
     if not final_script:
         log_event(project_path, "pipeline.log", "[SCRIPT_GEN] All attempts failed, using emergency fallback")
@@ -158,8 +154,9 @@ def generate_script(project_id, project_path):
     # 5. Log final stats
     final_chars = count_thai_chars(final_script)
     final_words = count_words(final_script)
+    final_predicted, _ = predict(final_script)
     log_event(project_path, "pipeline.log", 
-             f"[SCRIPT_GEN] FINAL: {final_chars} chars, {final_words} words, ~{final_words * 0.5:.1f}s estimated")
+             f"[SCRIPT_GEN] FINAL: {final_chars} chars, {final_words} words, ~{final_predicted:.1f}s estimated")
         
     return final_script, is_ok
 
@@ -0,0 +1,17 @@
+import re
+
+def split_sentences(text):
+    """
+    Splits a script at sentence punctuation (. ! ? followed by whitespace) and line
+    breaks, keeping the punctuation. Shared by chunked synthesis, breathing pauses
+    and the speech-rate model so they all agree on the sentence boundaries.
+    """
+    parts = re.split(r'(?<=[.!?])\s+|\n+', text or "")
+    return [p.strip() for p in parts if p.strip()]
+
+def sentence_count(text):
+    return len(split_sentences(text))
+
+def sentence_gaps(text):
+    """Boundaries between sentences (where breathing pauses go)."""
+    return max(0, sentence_count(text) - 1)
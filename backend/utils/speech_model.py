@@ -0,0 +1,127 @@
+import os
+import re
+import json
+import threading
+from core.config import CACHE_DIR
+from utils import sentence_utils
+
+# Learned speech-rate model: seconds of speech as a linear function of the
+# number of spoken characters, fitted per voice (provider/voice@speed) from
+# every generated voice file. Only running sums are stored, so each update
+# is O(1) and the least-squares fit is recomputed on demand. Older
+# observations decay so the model follows provider changes.
+#
+# Until a voice has data it falls back to the pooled fit of all voices, and
+# before that to the old heuristic (4 chars per word, 0.5 s per word).
+
+MODEL_PATH = os.path.join(CACHE_DIR, "speech_rate.json")
+DECAY = 0.98
+MIN_FIT_SAMPLES = 3
+POOLED_KEY = "*"
+SENTENCE_PAUSE_SEC = 0.4
+HEURISTIC_SEC_PER_CHAR = 0.5 / 4
+
+_lock = threading.Lock()
+
+def spoken_chars(text):
+    """Characters that are actually pronounced (letters, digits, Thai marks)."""
+    return len(re.sub(r"[^\w\u0E00-\u0E7F]|_", "", text or ""))
+
+def voice_key(provider, voice, speed=1.0):
+    return f"{provider}/{voice or ''}@{round(float(speed or 1.0), 2)}"
+
+def _load():
+    try:
+        with open(MODEL_PATH, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save(model):
+    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
+    tmp_path = MODEL_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(model, f, indent=2)
+    os.replace(tmp_path, MODEL_PATH)
+
+def _update(sums, x, y):
+    for k in ("n", "sx", "sy", "sxx", "sxy"):
+        sums[k] = sums.get(k, 0.0) * DECAY
+    sums["n"] += 1.0
+    sums["sx"] += x
+    sums["sy"] += y
+    sums["sxx"] += x * x
+    sums["sxy"] += x * y
+    sums["count"] = sums.get("count", 0) + 1
+
+def observe(provider, voice, speed, text, speech_sec):
+    """Adds one (text, speech duration without padding/pauses) observation."""
+    x = spoken_chars(text)
+    if x <= 0 or speech_sec <= 0:
+        return
+    with _lock:
+        model = _load()
+        _update(model.setdefault(voice_key(provider, voice, speed), {}), x, speech_sec)
+        _update(model.setdefault(POOLED_KEY, {}), x, speech_sec)
+        _save(model)
+
+def _fit(sums):
+    """Least-squares (intercept, sec_per_char); through the origin when the spread is too small."""
+    n = sums.get("n", 0.0)
+    if sums.get("count", 0) < 1 or sums.get("sx", 0) <= 0:
+        return None
+    if sums["count"] >= MIN_FIT_SAMPLES:
+        denom = n * sums["sxx"] - sums["sx"] ** 2
+        if denom > 1e-6 * n * sums["sxx"]:
+            slope = (n * sums["sxy"] - sums["sx"] * sums["sy"]) / denom
+            intercept = (sums["sy"] - slope * sums["sx"]) / n
+            if slope > 0:
+                return intercept, slope
+    return 0.0, sums["sy"] / sums["sx"]
+
+def predict_speech(provider, voice, speed, text):
+    """
+    Predicted speech seconds for text (no padding or pauses).
+    Returns (seconds, source) with source "voice", "speed-scaled", "pooled" or "heuristic".
+    """
+    x = spoken_chars(text)
+    model = _load()
+    fit = _fit(model.get(voice_key(provider, voice, speed), {}))
+    source = "voice"
+    if fit is None and round(float(speed or 1.0), 2) != 1.0:
+        # Same voice at normal speed, assuming duration scales with 1/speed
+        base = _fit(model.get(voice_key(provider, voice, 1.0), {}))
+        if base is not None:
+            fit = (base[0] / speed, base[1] / speed)
+            source = "speed-scaled"
+    if fit is None:
+        fit = _fit(model.get(POOLED_KEY, {}))
+        source = "pooled"
+    if fit is None:
+        return x * HEURISTIC_SEC_PER_CHAR, "heuristic"
+    intercept, slope = fit
+    return max(0.0, intercept + slope * x), source
+
+def predict_total(provider, voice, speed, text, breathing_pause=True, intro=0.0, outro=0.0, pause_sec=SENTENCE_PAUSE_SEC):
+    """Predicted length of the final voice file (speech + sentence pauses + padding)."""
+    speech, source = predict_speech(provider, voice, speed, text)
+    pauses = sentence_utils.sentence_gaps(text) * pause_sec if breathing_pause else 0.0
+    return round(speech + pauses + (intro or 0.0) + (outro or 0.0), 2), source
+
+def resolve_voice(profile_id):
+    """(provider, voice) for a voice profile id; (None, None) for 'random'/unknown (pooled model)."""
+    from utils.tts_handler import VOICE_PROFILES
+    profile = next((p for p in VOICE_PROFILES if p["id"] == profile_id), None)
+    if not profile:
+        return None, None
+    return profile.get("service", "gtts"), profile.get("voice") or profile.get("lang", "th")
+
+def stats():
+    model = _load()
+    out = {}
+    for key, sums in model.items():
+        fit = _fit(sums)
+        if fit:
+            out[key] = {"samples": sums.get("count", 0), "intercept_sec": round(fit[0], 3),
+                        "sec_per_char": round(fit[1], 4)}
+    return out
@@ -0,0 +1,109 @@
+import os
+import threading
+from urllib.parse import quote
+from core.config import CACHE_DIR
+from utils import file_lru
+from utils.file_hash import content_hash
+
+# WebP thumbnails of project images for the asset grid and timeline preview,
+# so the UI doesn't download and decode full-size originals.
+# Thumbnails are made at a few fixed widths on first request and stored by the
+# source's content hash in cache/thumbs (shared across projects). Writers of
+# input images call invalidate() before replacing a file so stale derivatives
+# don't pile up; URLs carry the file version so browsers can cache them.
+# Thumbnails are upright (EXIF orientation applied, as browsers do for the
+# originals). The store is size-bounded: least recently served thumbnails are
+# evicted (file_lru, like the TTS cache).
+
+THUMBS_DIR = os.path.join(CACHE_DIR, "thumbs")
+WIDTHS = (160, 320, 640)
+WEBP_QUALITY = 80
+VERSION = 2 # 2: EXIF orientation applied
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp")
+ORIENTATION_TAG = 0x0112
+
+def _settings():
+    from core.global_settings import get_settings
+    return get_settings().thumbnails
+
+def _transpose_table():
+    from PIL import Image
+    t = Image.Transpose
+    return {2: t.FLIP_LEFT_RIGHT, 3: t.ROTATE_180, 4: t.FLIP_TOP_BOTTOM, 5: t.TRANSPOSE,
+            6: t.ROTATE_270, 7: t.TRANSVERSE, 8: t.ROTATE_90}
+
+def is_image(filename):
+    return filename.lower().endswith(IMAGE_EXTS)
+
+def snap_width(width):
+    """Smallest fixed width >= width (the largest one for anything bigger)."""
+    return next((w for w in WIDTHS if w >= width), WIDTHS[-1])
+
+def thumb_path(digest, width):
+    return os.path.join(THUMBS_DIR, digest[:2], f"{digest}-{width}-v{VERSION}.webp")
+
+def thumb_url(project_id, filename, width=320, source_path=None, version=None):
+    """
+    URL of a thumbnail of an input/ image ('../name' for project root files such as
+    cover.jpg); versioned by `version` or else the source's mtime when source_path is given.
+    """
+    params = []
+    if filename.startswith("../"):
+        filename = filename[3:]
+        params.append("root=1")
+    if version is None and source_path:
+        try:
+            version = os.stat(source_path).st_mtime_ns
+        except OSError:
+            pass
+    if version is not None:
+        params.append(f"v={version}")
+    url = f"/projects/{project_id}/thumb/{snap_width(width)}/{quote(filename)}"
+    return url + ("?" + "&".join(params) if params else "")
+
+def ensure(path, width):
+    """Path of the WebP thumbnail of an image at a fixed width, generated if missing."""
+    from PIL import Image
+    from utils.image_processor import open_reduced
+    width = snap_width(width)
+    out = thumb_path(content_hash(path), width)
+    if file_lru.LRUFileStore.touch(out): # LRU position
+        return out
+
+    with Image.open(path) as probe:
+        orientation = int(probe.getexif().get(ORIENTATION_TAG, 1) or 1)
+    # Orientations 5-8 are turned 90 degrees: the stored height becomes the displayed width
+    turned = orientation in (5, 6, 7, 8)
+    img, _ = open_reduced(path, *((1 << 20, width) if turned else (width, 1 << 20)), mode="fit")
+    with img:
+        transpose = _transpose_table().get(orientation)
+        if transpose is not None:
+            img = img.transpose(transpose)
+        if img.mode not in ("RGB", "RGBA"):
+            img = img.convert("RGBA" if "transparency" in img.info else "RGB")
+        if img.width > width:
+            img = img.resize((width, max(1, round(img.height * width / img.width))), Image.LANCZOS)
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        tmp_path = out + f".{threading.get_ident()}.tmp"
+        img.save(tmp_path, "WEBP", quality=WEBP_QUALITY, method=4)
+    os.replace(tmp_path, out)
+    lru = file_lru.store(THUMBS_DIR)
+    lru.added(os.path.getsize(out))
+    lru.evict(_settings().max_size_mb * 1024 * 1024, keep=out)
+    return out
+
+def evict(max_bytes, keep=None):
+    """Deletes least recently served thumbnails once the store is over max_bytes (see file_lru)."""
+    return file_lru.store(THUMBS_DIR).evict(max_bytes, keep=keep)
+
+def invalidate(path):
+    """Removes the thumbnails of the file's current content (call before it is replaced or deleted)."""
+    if not os.path.isfile(path) or not is_image(path):
+        return
+    try:
+        digest = content_hash(path)
+    except OSError:
+        return
+    lru = file_lru.store(THUMBS_DIR)
+    for width in WIDTHS:
+        lru.remove(thumb_path(digest, width))
@@ -5,13 +5,17 @@ from utils.script_generator import count_words
 
 def get_audio_duration(audio_path, project_path):
     """
-    Detect audio duration. 
-    In a real production environment, this would use ffprobe or a library like mutagen.
-    For this implementation, we use a deterministic heuristic based on word count 
-    if the tool is missing, or return a mock value for the mock audio file.
+    Detect audio duration from the file header (media_probe).
+    If the file can't be read (e.g. a mock audio file), we use a deterministic
+    heuristic based on word count, or a fixed fallback value.
     """
     if not os.path.exists(audio_path):
         return None
+
+    from utils import media_probe
+    duration = media_probe.duration(audio_path)
+    if duration > 0:
+        return duration
     
     # Try to find the script to estimate duration if file is just a mock
     script_path = os.path.join(project_path, "script", "script.txt")
@@ -30,7 +34,8 @@ def build_timeline(project_id, project_path):
     Generates timeline.json.
     """
     # 1. Input Validation
-    audio_file = os.path.join(project_path, "audio", "voice.mp3")
+    from utils.voice_paths import raw_voice_path
+    audio_file = raw_voice_path(project_path) or os.path.join(project_path, "audio", "voice.wav")
     input_dir = os.path.join(project_path, "input")
     
     # Get images
@@ -39,7 +44,7 @@ def build_timeline(project_id, project_path):
     images.sort() # Ensure deterministic order
     
     if not os.path.exists(audio_file):
-        error_msg = "Audio file missing (voice.mp3)"
+        error_msg = "Audio file missing (voice.wav)"
         log_event(project_path, "pipeline.log", f"[STEP18] FAIL: {error_msg}")
         return None, error_msg
 
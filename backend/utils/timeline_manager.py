@@ -3,46 +3,32 @@ import json
 from utils.tts_handler import get_actual_duration
 from core.logger import log_event
 
-def build_timeline(project_path, bgm_config=None):
+def build_timeline(project_path, bgm_config=None, ctx=None):
     """
     Constructs a timeline.json based on ACTUAL voice duration (including silence padding).
-    Uses settings from project.json if available.
+    Uses the run context's resolved settings (project.json over global defaults).
     """
-    
-    from core.global_settings import get_settings
-    settings = get_settings()
-    
-    # Defaults from Global Settings
-    silence_start = settings.video.intro_silence_sec
-    silence_end = settings.video.outro_silence_sec
-    default_duration = settings.video.default_duration_sec # Used if we need target duration fallback logic
-    
-    log_event(project_path, "pipeline.log", f"[TIMELINE] Loaded global settings: Intro={silence_start}s, Outro={silence_end}s")
+    if ctx is None:
+        from core.run_context import RunContext
+        ctx = RunContext.resolve(project_path)
+
+    silence_start = ctx.intro_silence
+    silence_end = ctx.outro_silence
+    default_duration = ctx.max_duration # Used if we need target duration fallback logic
+    ken_burns_global = ctx.ken_burns_enabled
 
-    # Load Settings
+    log_event(project_path, "pipeline.log", f"[TIMELINE] Loaded settings: Intro={silence_start}s, Outro={silence_end}s")
     project_json_path = os.path.join(project_path, "project.json")
-    ken_burns_global = True
-    if os.path.exists(project_json_path):
-        try:
-            with open(project_json_path, 'r') as f:
-                pdata = json.load(f)
-                video_settings = pdata.get("settings", {}).get("video", {})
-                silence_start = video_settings.get("intro_silence", 0.0)
-                silence_end = video_settings.get("outro_silence", 0.0)
-                ken_burns_global = video_settings.get("ken_burns_enabled", True)
-        except:
-            pass
             
     # 1. Get Voice Duration
-    voice_path = os.path.join(project_path, "audio", "voice_processed.mp3")
-    if not os.path.exists(voice_path):
-        voice_path = os.path.join(project_path, "audio", "voice.mp3")
+    from utils.voice_paths import best_voice_path, raw_voice_path
+    voice_path = best_voice_path(project_path)
         
-    if not os.path.exists(voice_path):
+    if not voice_path:
         log_event(project_path, "pipeline.log", "[TIMELINE] FAIL: voice source not found")
         return {
             "status": "FAIL", 
-            "error": "Missing dependency: voice.mp3 not found",
+            "error": "Missing dependency: voice.wav not found",
             "detail": "Please generate the voiceover first in the Voice Studio step."
         }
     
@@ -107,6 +93,18 @@ def build_timeline(project_path, bgm_config=None):
     images = [img for img in images if img.lower() not in target_cover_names]
     if source_img_to_exclude:
          images = [img for img in images if img != source_img_to_exclude]
+
+    # Near-duplicate photos (same shot scraped from several URLs) get one segment
+    video_settings = ctx.settings.video
+    if video_settings.exclude_duplicate_images:
+        from utils import image_index
+        duplicate_of = image_index.duplicate_of(image_index.duplicates(project_path, video_settings.duplicate_max_distance))
+        skipped = [img for img in images if img in duplicate_of]
+        if skipped:
+            images = [img for img in images if img not in duplicate_of]
+            log_event(project_path, "pipeline.log",
+                      f"[TIMELINE] Skipped {len(skipped)} duplicate images: " +
+                      ", ".join(f"{img} (= {duplicate_of[img]})" for img in skipped))
     
     # Check if cover exists in root and should be included as a product image
     cover_path = os.path.join(project_path, "cover.jpg")
@@ -183,7 +181,7 @@ def build_timeline(project_path, bgm_config=None):
         "segments": segments,
         "audio": {
             "voice": {
-                "file": "voice.mp3",
+                "file": os.path.basename(raw_voice_path(project_path) or voice_path),
                 "volume": 1.0,
                 "trim_to": round(usable_audio_duration, 3) if usable_audio_duration < total_audio_duration else None
             },
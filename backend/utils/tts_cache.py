@@ -0,0 +1,102 @@
+import os
+import re
+import json
+import hashlib
+import threading
+from core.config import CACHE_DIR
+from utils import file_lru
+
+# Content-addressed store for raw synthesized TTS audio, shared by all projects.
+# Key = (provider, voice, style instructions, speed, normalized text). The
+# provider's own output is stored untouched (Gemini: 24 kHz PCM in a WAV
+# container, OpenAI/gTTS: MP3), so a hit replays exactly what the API returned.
+# Eviction is size-based LRU using file mtime as the last-access time (file_lru).
+
+TTS_CACHE_DIR = os.path.join(CACHE_DIR, "tts")
+
+def _settings():
+    from core.global_settings import get_settings
+    return get_settings().tts_cache
+
+def normalize_text(text):
+    """Whitespace differences don't change the synthesized speech."""
+    return re.sub(r"\s+", " ", (text or "")).strip()
+
+def cache_key(provider, voice, style, speed, text):
+    payload = json.dumps({
+        "provider": provider or "",
+        "voice": voice or "",
+        "style": normalize_text(style),
+        "speed": round(float(speed or 1.0), 3),
+        "text": hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+def _entry_path(key, ext):
+    # Two-level fan-out keeps directories small
+    return os.path.join(TTS_CACHE_DIR, key[:2], f"{key}.{ext}")
+
+def get(key, ext):
+    """Returns cached audio bytes or None. A hit refreshes the entry's LRU position."""
+    if not _settings().enabled:
+        return None
+    path = _entry_path(key, ext)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        file_lru.LRUFileStore.touch(path)
+        return data
+    except OSError:
+        return None
+
+def put(key, ext, data):
+    """Stores audio bytes atomically, then evicts least recently used entries over budget."""
+    cfg = _settings()
+    if not cfg.enabled or not data:
+        return
+    path = _entry_path(key, ext)
+    try:
+        replaced = os.path.getsize(path)
+    except OSError:
+        replaced = 0
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except OSError:
+        return
+    lru = file_lru.store(TTS_CACHE_DIR)
+    lru.added(len(data), replaced)
+    lru.evict(cfg.max_size_mb * 1024 * 1024)
+
+def evict(max_bytes):
+    """Deletes least recently used entries once the store is over max_bytes (see file_lru)."""
+    return file_lru.store(TTS_CACHE_DIR).evict(max_bytes)
+
+def synthesize_cached(provider, voice, style, speed, text, ext, synthesize):
+    """
+    Returns (audio_bytes, cache_hit). `synthesize()` is only called on a miss
+    and must return the provider's raw audio bytes.
+    """
+    key = cache_key(provider, voice, style, speed, text)
+    data = get(key, ext)
+    if data is not None:
+        return data, True
+    data = synthesize()
+    put(key, ext, data)
+    return data, False
+
+def stats():
+    count, size = 0, 0
+    for root, _, files in os.walk(TTS_CACHE_DIR):
+        for name in files:
+            if name.endswith(".tmp"):
+                continue
+            try:
+                size += os.path.getsize(os.path.join(root, name))
+                count += 1
+            except OSError:
+                pass
+    return {"entries": count, "size_mb": round(size / (1024 * 1024), 2), "max_size_mb": _settings().max_size_mb}
@@ -1,12 +1,11 @@
 import os
 import json
 import time
-import subprocess
 import shutil
 from core.logger import log_event
-from gtts import gTTS
 import traceback
 import re
+from utils import voice_paths, voice_index, sentence_utils
 
 # OpenAI client helper
 def get_openai_client():
@@ -39,68 +38,43 @@ def delete_voice_file(project_path, filename):
     Deletes a specific voice variant file.
     Does NOT allow deleting master files.
     """
-    if filename in ["voice.mp3", "voice_processed.mp3"]:
+    if voice_paths.is_master_file(filename):
         return False, "Cannot delete master files"
         
     audio_path = os.path.join(project_path, "audio", filename)
     if os.path.exists(audio_path):
         os.remove(audio_path)
+        voice_index.remove_variant(project_path, filename)
         return True, "File deleted"
+    voice_index.remove_variant(project_path, filename)
     return False, "File not found"
 
 def set_active_voice(project_path, filename):
     """
-    Sets a specific voice file as the active voice.mp3.
+    Sets a specific voice file as the active voice (voice.wav, or voice.mp3 for legacy variants).
     """
     audio_dir = os.path.join(project_path, "audio")
     source = os.path.join(audio_dir, filename)
-    target = os.path.join(audio_dir, "voice.mp3")
+    target = os.path.join(audio_dir, "voice" + os.path.splitext(filename)[1])
     
     if os.path.exists(source):
-        import shutil
-        shutil.copy2(source, target)
-        # Invalidate processed cache
-        processed_path = os.path.join(audio_dir, "voice_processed.mp3")
-        if os.path.exists(processed_path):
-            os.remove(processed_path)
+        tmp_target = target + ".tmp"
+        shutil.copy2(source, tmp_target)
+        # Drop the previous active voice (any format) and invalidate processed cache
+        voice_paths.clear_masters(project_path)
+        os.replace(tmp_target, target)
+        voice_index.set_active(project_path, filename, os.path.basename(target))
         return True, "Voice set as active"
     return False, "Source file not found"
 
 def get_actual_duration(file_path):
     """
-    Get actual audio duration using afinfo or ffprobe.
-    Retries up to 3 times to handle OS file locking/latency.
+    Get actual audio duration (header parsing via media_probe, cached per file version).
     """
     if not os.path.exists(file_path) or os.path.getsize(file_path) < 100:
         return 0.0
-
-    for attempt in range(3):
-        try:
-            # Preference 1: afinfo (Mac standard)
-            result = subprocess.run(['afinfo', '-b', file_path], capture_output=True, text=True)
-            if result.returncode == 0:
-                for line in result.stdout.split('\n'):
-                    if 'sec' in line:
-                        parts = line.strip().split(' ')
-                        if len(parts) > 0:
-                            try:
-                                return float(parts[0])
-                            except ValueError:
-                                continue
-            
-            # Preference 2: ffprobe (Cross-platform precision)
-            if shutil.which("ffprobe"):
-                cmd = [
-                    "ffprobe", "-v", "error", "-show_entries", "format=duration",
-                    "-of", "default=noprint_wrappers=1:nokey=1", file_path
-                ]
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode == 0 and result.stdout.strip():
-                    return round(float(result.stdout.strip()), 3)
-        except Exception:
-            pass
-        time.sleep(0.2) # Small wait before retry
-    return 0.0
+    from utils import media_probe
+    return media_probe.duration(file_path)
 
 def sanitize_text(text):
     """
@@ -111,40 +85,136 @@ def sanitize_text(text):
     # Only keep alphanumeric, Thai, spaces, and standard punctuation [.,!?]
     return re.sub(r'[^\w\sก-๙.,!?]', '', text)
 
-def generate_voice(project_id, project_path, script_content, profile_id="oa_echo", speed=1.0, provider=None, voice_name=None, style_instructions=None):
+def _provider_plan(provider, voice, script_content, speed, style_instructions, pause_breathing, ctx):
+    """
+    Prepares one provider's synthesis: returns {"provider", "method", "synthesize",
+    "cache_args", "pauses_applied"}. Nothing is sent to the provider yet.
+    synthesize(cancelled) raises CancelledError instead of sending its request once
+    the `cancelled` event is set (lost hedge, see tts_hedge).
+    """
+    from utils.tts_hedge import check_cancelled
+    plan = {"provider": provider, "method": provider, "cache_args": None, "pauses_applied": False}
+
+    if provider == "gtts":
+        # gTTS uses lang as voice essentially
+        lang = voice if voice and len(voice) <= 5 else "th"
+        is_slow = speed < 1.0
+        clean_text = sanitize_text(script_content)
+
+        def synthesize(cancelled=None):
+            import io
+            from gtts import gTTS
+            check_cancelled(cancelled)
+            buf = io.BytesIO()
+            gTTS(text=clean_text, lang=lang, slow=is_slow).write_to_fp(buf)
+            return buf.getvalue()
+        plan["voice"] = lang
+        plan["cache_args"] = ("gtts", lang, None, speed, clean_text, "mp3")
+        
+    elif provider == "openai":
+        client = get_openai_client()
+        if not client:
+            raise ValueError("OpenAI API Key missing")
+        openai_voice = voice or "alloy"
+
+        def synthesize(cancelled=None):
+            check_cancelled(cancelled)
+            response = client.audio.speech.create(
+                model="tts-1",
+                voice=openai_voice,
+                input=script_content,
+                speed=speed
+            )
+            return response.content
+        plan["voice"] = openai_voice
+        plan["cache_args"] = ("openai", openai_voice, None, speed, script_content, "mp3")
+
+    elif provider == "gemini":
+        from utils.gemini_tts import generate_gemini_tts
+        
+        # Use provided style_instructions or default
+        effective_style = style_instructions or "Read aloud in a warm and friendly tone"
+        gemini_voice = voice or "Puck"
+        plan["voice"] = gemini_voice
+
+        from utils.gemini_tts import generate_gemini_tts_chunked
+        from utils.sentence_utils import split_sentences
+        if ctx.settings.voice.chunked_synthesis and len(split_sentences(script_content)) > 1:
+            # Sentences are synthesized concurrently and cached individually;
+            # breathing pauses are inserted at the real boundaries while stitching.
+            def synthesize(cancelled=None):
+                return generate_gemini_tts_chunked(
+                    text=script_content,
+                    voice_name=gemini_voice,
+                    style_instructions=effective_style,
+                    pause_sec=ctx.sentence_pause if pause_breathing else 0.0,
+                    cancelled=cancelled
+                )
+            plan["pauses_applied"] = True
+            plan["method"] = "gemini (chunked)"
+        else:
+            from utils.gemini_tts import request_slots
+
+            def synthesize(cancelled=None):
+                # Same global request slots as chunked sentences (generate_voice, auditions)
+                with request_slots():
+                    check_cancelled(cancelled)
+                    return generate_gemini_tts(
+                        text=script_content,
+                        voice_name=gemini_voice,
+                        style_instructions=effective_style
+                    )
+            # Gemini returns 24 kHz PCM wrapped as WAV
+            plan["cache_args"] = ("gemini", gemini_voice, effective_style, speed, script_content, "wav")
+    else:
+        raise ValueError(f"Unknown provider: {provider}")
+
+    plan["synthesize"] = synthesize
+    return plan
+
+def _run_plan(plan, cancelled=None):
+    """
+    Runs a provider plan. Identical (provider, voice, style, speed, text) is served
+    from the shared cache. Returns (audio_bytes, cache_hit); real API latencies are
+    recorded for the hedging deadline. `cancelled` is handed to the plan's synthesize.
+    """
+    from utils.tts_cache import synthesize_cached
+    from utils import tts_hedge
+    start = time.time()
+    if plan["cache_args"]:
+        audio_data, cache_hit = synthesize_cached(*plan["cache_args"], lambda: plan["synthesize"](cancelled))
+    else:
+        audio_data, cache_hit = plan["synthesize"](cancelled), False
+    if not cache_hit:
+        tts_hedge.record_latency(plan["method"], time.time() - start)
+    return audio_data, cache_hit
+
+def generate_voice(project_id, project_path, script_content, profile_id="oa_echo", speed=1.0, provider=None, voice_name=None, style_instructions=None, ctx=None, set_active=True, hedge=True):
     """
     Generates a voice audio file using real TTS services.
     Validates output integrity before confirming success.
-    Reads global defaults for pauses and silence from project.json
+    Pauses and silence come from the run context (resolved here if not given).
+    set_active=False only writes the voice--- variant (auditions);
+    hedge=False never races a backup request. A take produced by the backup request
+    is saved as voice---...---backup (provider and voice are in the voice index) and,
+    like any other winning take, becomes the active voice. result["activated"] tells
+    whether voice.wav now holds this take.
     """
     audio_dir = os.path.join(project_path, "audio")
     os.makedirs(audio_dir, exist_ok=True)
     
     timestamp = int(time.time())
-    filename = f"voice---{profile_id}---{speed}---{timestamp}.mp3"
+    filename = f"voice---{profile_id}---{speed}---{timestamp}.wav" # Lossless until render
     audio_file = os.path.join(audio_dir, filename)
     
     # Load Project Settings
-    pause_breathing = False
-    silence_start = 0.0
-    silence_end = 0.0
-    
-    project_json_path = os.path.join(project_path, "project.json")
-    if os.path.exists(project_json_path):
-        try:
-            with open(project_json_path, 'r') as f:
-                pdata = json.load(f)
-                settings = pdata.get("settings", {})
-                
-                # Breathing Pause
-                pause_breathing = settings.get("voice", {}).get("breathing_pause", False)
-                
-                # Silence Padding
-                video_settings = settings.get("video", {})
-                silence_start = video_settings.get("intro_silence", 0.0)
-                silence_end = video_settings.get("outro_silence", 0.0)
-        except:
-            pass
+    if ctx is None:
+        from core.run_context import RunContext
+        ctx = RunContext.resolve(project_path, project_id)
+    pause_breathing = ctx.breathing_pause
+    pause_sec = ctx.sentence_pause
+    silence_start = ctx.voice_intro_silence
+    silence_end = ctx.voice_outro_silence
 
     # Provider/Voice Resolution
     active_provider = provider
@@ -158,97 +228,139 @@ def generate_voice(project_id, project_path, script_content, profile_id="oa_echo
     status = "OK"
     error_detail = None
     encoding_method = active_provider
+    pauses_applied = False
 
     try:
-        # Save to temporary file first
-        temp_file = audio_file + ".raw.mp3"
             
-        if active_provider == "gtts":
-            # gTTS uses lang as voice essentially
-            lang = active_voice if len(active_voice) <= 5 else "th"
-            is_slow = speed < 1.0
-            clean_text = sanitize_text(script_content)
-            
-            # Log script stats
-            char_count = len(re.sub(r'[^\u0E00-\u0E7F]', '', script_content))
-            word_count = len(script_content.replace(" ", "").replace("\n", "")) // 4
-            log_event(project_path, "pipeline.log", 
-                     f"[TTS] Script: {char_count} Thai chars, {word_count} words, est. {word_count * 0.5:.1f}s")
-            
-            tts = gTTS(text=clean_text, lang=lang, slow=is_slow)
-            tts.save(temp_file)
-            
-        elif active_provider == "openai":
-            client = get_openai_client()
-            if client:
-                # Log script stats
-                char_count = len(re.sub(r'[^\u0E00-\u0E7F]', '', script_content))
-                word_count = len(script_content.replace(" ", "").replace("\n", "")) // 4
-                log_event(project_path, "pipeline.log", 
-                         f"[TTS] Script: {char_count} Thai chars, {word_count} words, est. {word_count * 0.5:.1f}s")
-                
-                response = client.audio.speech.create(
-                    model="tts-1",
-                    voice=active_voice or "alloy",
-                    input=script_content,
-                    speed=speed
-                )
-                
-                if hasattr(response, 'write_to_file'):
-                    response.write_to_file(temp_file)
-                else:
-                    response.stream_to_file(temp_file)
+        # Log script stats
+        char_count = len(re.sub(r'[^\u0E00-\u0E7F]', '', script_content))
+        word_count = len(script_content.replace(" ", "").replace("\n", "")) // 4
+        from utils import speech_model
+        predicted, model_source = speech_model.predict_total(active_provider, active_voice, speed, script_content,
+                                                             pause_breathing, silence_start, silence_end, pause_sec)
+        tag = "[TTS] [GEMINI]" if active_provider == "gemini" else "[TTS]"
+        log_event(project_path, "pipeline.log", 
+                 f"{tag} Script: {char_count} Thai chars, {word_count} words, est. {predicted:.1f}s ({model_source})")
+
+        primary = _provider_plan(active_provider, active_voice, script_content, speed,
+                                 style_instructions, pause_breathing, ctx)
+
+        # Hedging: the backup provider is raced against a slow or failing primary
+        # (see tts_hedge). Opt-in; the loser is cancelled before any request it hasn't sent.
+        voice_settings = ctx.settings.voice
+        backup = None
+        if hedge and voice_settings.hedge_enabled:
+            if voice_settings.hedge_backup_provider:
+                backup_provider, backup_voice = voice_settings.hedge_backup_provider, voice_settings.hedge_backup_voice or None
             else:
-                raise ValueError("OpenAI API Key missing")
-        elif active_provider == "gemini":
-            from utils.gemini_tts import generate_gemini_tts
-            # Log script stats
-            char_count = len(re.sub(r'[^\u0E00-\u0E7F]', '', script_content))
-            word_count = len(script_content.replace(" ", "").replace("\n", "")) // 4
-            log_event(project_path, "pipeline.log", 
-                     f"[TTS] [GEMINI] Script: {char_count} Thai chars, {word_count} words")
-            
-            # Use provided style_instructions or default
-            effective_style = style_instructions or "Read aloud in a warm and friendly tone"
-            
-            audio_data = generate_gemini_tts(
-                text=script_content,
-                voice_name=active_voice or "Puck",
-                style_instructions=effective_style
-            )
+                backup_provider, backup_voice = active_provider, active_voice
+            try:
+                backup = _provider_plan(backup_provider, backup_voice, script_content, speed,
+                                        style_instructions, pause_breathing, ctx)
+            except Exception as e:
+                log_event(project_path, "pipeline.log", f"[TTS] Hedge backup {backup_provider} unavailable, not hedging: {e}")
+
+        from utils import tts_hedge
+        deadline_sec = tts_hedge.deadline(primary["method"], voice_settings.hedge_percentile,
+                                          voice_settings.hedge_min_samples, voice_settings.hedge_default_deadline_sec)
+        backup_name = f"{backup['method']} (backup)" if backup else None
+        (audio_data, cache_hit), winner, hedged = tts_hedge.hedged_call(
+            primary["method"], lambda cancelled: _run_plan(primary, cancelled),
+            backup_name, (lambda cancelled: _run_plan(backup, cancelled)) if backup else None,
+            deadline_sec=deadline_sec
+        )
+        substituted = backup is not None and winner == backup_name
+        plan = backup if substituted else primary
+        cache_args = plan["cache_args"]
+        encoding_method = plan["method"]
+        pauses_applied = plan["pauses_applied"]
+        if hedged:
+            log_event(project_path, "pipeline.log", f"[TTS] Hedged after {deadline_sec:.1f}s: {winner} won")
+        if substituted:
+            # Backup takes are named apart so the voice panel shows where they came from
+            filename = f"voice---{profile_id}---{speed}---{timestamp}---backup.wav"
+            audio_file = os.path.join(audio_dir, filename)
+
+        if cache_hit:
+            encoding_method = f"{plan['provider']} (cached)"
+            log_event(project_path, "pipeline.log", f"[TTS] Cache hit for {plan['provider']}/{cache_args[1]}, skipping API call")
+
+        from utils.audio_processor import add_silence_padding, add_sentence_pauses, compose_wav
+        from utils.sentence_utils import sentence_count as count_sentences
+
+        # Provider output: Gemini returns WAV, OpenAI/gTTS return MP3
+        raw_ext = cache_args[5] if cache_args else "wav"
+        temp_file = None
+        pcm_data = audio_data if raw_ext == "wav" else None
+
+        if raw_ext != "wav":
+            # Decode the provider's MP3 once; everything after this stays PCM
+            from utils.audio_processor import decode_to_wav
+            temp_file = audio_file + f".raw.{raw_ext}"
             with open(temp_file, "wb") as f:
                 f.write(audio_data)
-        else:
-            raise ValueError(f"Unknown provider: {active_provider}")
-            
-        # Apply audio processing
-        from utils.audio_processor import add_silence_padding, add_sentence_pauses
-        
-        # Step 1: Add sentence pauses -> saves to pause_file
-        pause_file = audio_file + ".paused.mp3"
-        
-        if pause_breathing:
-            add_sentence_pauses(temp_file, pause_file, script_content, 
-                              pause_duration=0.4, project_path=project_path)
-            source_for_padding = pause_file if os.path.exists(pause_file) and os.path.getsize(pause_file) > 100 else temp_file
-        else:
-            source_for_padding = temp_file
-        
-        # Step 2: Add silence padding -> saves to FINAL audio_file
-        success = add_silence_padding(source_for_padding, audio_file, 
-                          start_silence=silence_start, end_silence=silence_end, project_path=project_path)
-                          
-        if not success:
-             # Fallback: copy raw source to final
-             shutil.copy2(source_for_padding, audio_file)
+            decoded = audio_file + ".raw.wav"
+            if decode_to_wav(temp_file, decoded):
+                os.remove(temp_file)
+                temp_file = decoded
+                with open(decoded, "rb") as f:
+                    pcm_data = f.read()
+            else:
+                # No decoder available: keep the provider's MP3 as-is
+                filename = filename[:-len(".wav")] + ".mp3"
+                audio_file = os.path.join(audio_dir, filename)
+
+        # Sentence pauses + silence padding in one pass over the PCM (exact to the frame).
+        # Only chunked synthesis knows where sentences really end; for whole-text output
+        # the pauses go at evenly spaced positions, which can fall mid-word.
+        sentence_count = count_sentences(script_content) if pause_breathing and not pauses_applied else 1
+        # What actually ends up in the file, for the speech-rate model
+        pauses_inserted = sentence_utils.sentence_gaps(script_content) if pauses_applied and pause_breathing else 0
+        padding_inserted = 0.0
+        composed = False
+        if pcm_data is not None:
+            try:
+                compose_wav(pcm_data, audio_file, silence_start, silence_end, sentence_count, pause_duration=pause_sec)
+                composed = True
+                pauses_inserted += sentence_count - 1
+                padding_inserted = silence_start + silence_end
+                log_event(project_path, "pipeline.log",
+                          f"[AUDIO] Added silence: {silence_start}s start, {silence_end}s end, "
+                          f"{max(0, sentence_count - 1)} sentence pauses (pcm{', evenly spaced' if sentence_count > 1 else ''})")
+            except ValueError as e:
+                log_event(project_path, "pipeline.log", f"[AUDIO] PCM compose skipped: {e}")
+                if temp_file is None:
+                    temp_file = audio_file + ".raw.wav"
+                    with open(temp_file, "wb") as f:
+                        f.write(pcm_data)
+
+        pause_file = None
+        if not composed:
+            # Legacy path (undecodable MP3 or non-PCM WAV): pydub/sox on files
+            pause_file = audio_file + ".paused" + os.path.splitext(audio_file)[1]
+            if sentence_count > 1:
+                add_sentence_pauses(temp_file, pause_file, script_content, 
+                                  pause_duration=pause_sec, project_path=project_path)
+                source_for_padding = pause_file if os.path.exists(pause_file) and os.path.getsize(pause_file) > 100 else temp_file
+                if source_for_padding == pause_file:
+                    pauses_inserted += sentence_count - 1
+            else:
+                source_for_padding = temp_file
+
+            success = add_silence_padding(source_for_padding, audio_file, 
+                              start_silence=silence_start, end_silence=silence_end, project_path=project_path)
+                              
+            if success:
+                padding_inserted = silence_start + silence_end
+            else:
+                 # Fallback: copy raw source to final
+                 shutil.copy2(source_for_padding, audio_file)
 
         # Cleanup
-        if os.path.exists(temp_file):
-            try: os.remove(temp_file)
-            except: pass
-        if os.path.exists(pause_file):
-             try: os.remove(pause_file)
-             except: pass
+        for leftover in (temp_file, pause_file):
+            if leftover and os.path.exists(leftover):
+                try: os.remove(leftover)
+                except: pass
 
         # Integrity Check
         if not os.path.exists(audio_file) or os.path.getsize(audio_file) < 1024:
@@ -273,16 +385,41 @@ def generate_voice(project_id, project_path, script_content, profile_id="oa_echo
         except: pass
         return {"status": "FAIL", "error": "Duration detected as 0"}
 
-    # Update default voice.mp3
-    default_voice = os.path.join(audio_dir, "voice.mp3")
+    # Feed the speech-rate model (speech only: padding and breathing pauses removed)
+    if not cache_hit:
+        try:
+            from utils import speech_model
+            # Subtract only the pauses and padding that were actually inserted
+            speech_model.observe(plan["provider"], plan["voice"], speed, script_content,
+                                 duration - padding_inserted - pauses_inserted * pause_sec)
+        except Exception as e:
+            log_event(project_path, "pipeline.log", f"[VOICE_GENERATE] [WARNING] Speech-rate model not updated: {e}")
+
+    # Variant metadata for the voice panel (listing never re-probes files)
     try:
-        shutil.copy2(audio_file, default_voice)
-        # Invalidate processed cache
-        processed_path = os.path.join(audio_dir, "voice_processed.mp3")
-        if os.path.exists(processed_path):
-            os.remove(processed_path)
-    except:
-        pass
+        voice_index.add_variant(project_path, filename, profile_id=profile_id, provider=plan["provider"],
+                                voice=plan["voice"], method=encoding_method, hedged=hedged, backup=substituted, speed=speed,
+                                style=style_instructions or "", timestamp=str(timestamp), duration=duration,
+                                text_hash=voice_index.text_hash(script_content), size=os.path.getsize(audio_file))
+    except Exception as e:
+        log_event(project_path, "pipeline.log", f"[VOICE_GENERATE] [WARNING] Voice index not updated: {e}")
+
+    # Waveform peaks for the voice studio (voice.wav shares them: same content)
+    from utils.waveform import ensure_quietly
+    ensure_quietly(audio_file, project_path)
+
+    # Update default voice (voice.wav); also invalidates the processed cache
+    activated = False
+    if set_active:
+        if substituted:
+            log_event(project_path, "pipeline.log",
+                      f"[VOICE_GENERATE] {filename} came from the hedge backup ({plan['provider']}/{plan['voice']})")
+        try:
+            activated, message = set_active_voice(project_path, filename)
+            if not activated:
+                log_event(project_path, "pipeline.log", f"[VOICE_GENERATE] [WARNING] {filename} not activated: {message}")
+        except Exception as e:
+            log_event(project_path, "pipeline.log", f"[VOICE_GENERATE] [WARNING] {filename} not activated: {e}")
     
     log_event(project_path, "pipeline.log", 
              f"[VOICE_GENERATE] [OK] {filename} | Actual: {duration}s | Method: {encoding_method} | Speed: {speed} | Padding: {silence_start}s+{silence_end}s")
@@ -293,51 +430,91 @@ def generate_voice(project_id, project_path, script_content, profile_id="oa_echo
         "profile_id": profile_id,
         "speed": speed,
         "duration": duration,
+        "predicted_duration": predicted,
         "timestamp": timestamp,
         "url": f"/media/{project_id}/audio/{filename}",
-        "method": encoding_method
+        "method": encoding_method,
+        "provider": plan["provider"],
+        "voice": plan["voice"],
+        "hedged": hedged,
+        "backup": substituted,
+        "activated": activated
     }
 
+def resolve_audition_voice(voice_id):
+    """
+    Maps an audition id to (profile_id, provider, voice): VOICE_PROFILES ids use their
+    profile, GEMINI_VOICES ids are Gemini voices used directly. None if unknown.
+    """
+    profile = next((p for p in VOICE_PROFILES if p["id"] == voice_id), None)
+    if profile:
+        return profile["id"], profile.get("service", "gtts"), profile.get("voice") or profile.get("lang", "th")
+    from utils.gemini_tts import GEMINI_VOICES
+    if any(v["id"] == voice_id for v in GEMINI_VOICES):
+        return voice_id, "gemini", voice_id
+    return None
+
+def audition_voices(project_id, project_path, script_content, voice_ids, speed=1.0, style_instructions=None, max_workers=3):
+    """
+    Synthesizes one voice--- variant per id concurrently and yields each result as it
+    finishes (in completion order). The active voice is left untouched.
+    Identical requests are served from the TTS cache; Gemini API calls also share
+    the global request slots, so max_workers only bounds whole voices in flight.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    from core.run_context import RunContext
+    ctx = RunContext.resolve(project_path, project_id)
+
+    def run(voice_id):
+        resolved = resolve_audition_voice(voice_id)
+        if not resolved:
+            return {"status": "FAIL", "error": f"Unknown voice: {voice_id}"}
+        profile_id, provider, voice = resolved
+        return generate_voice(project_id, project_path, script_content, profile_id=profile_id, speed=speed,
+                              provider=provider, voice_name=voice, style_instructions=style_instructions,
+                              ctx=ctx, set_active=False, hedge=False)
+
+    unique_ids = list(dict.fromkeys(voice_ids))
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_ids) or 1))) as pool:
+        futures = {pool.submit(run, voice_id): voice_id for voice_id in unique_ids}
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as e:
+                result = {"status": "FAIL", "error": str(e)}
+            yield {"voice_id": futures[future], **result}
+
 def list_voice_files(project_path, project_id):
     """
-    Lists all generated voice files in the project with actual durations.
+    Lists all generated voice files in the project from the voice index
+    (no directory walk or duration probing; see voice_index).
     """
-    audio_dir = os.path.join(project_path, "audio")
-    if not os.path.exists(audio_dir):
-        return []
-    
-    files = []
-    for f in os.listdir(audio_dir):
-        file_path = os.path.join(audio_dir, f)
-        
-        # Skip directories or tiny broken files
-        if not os.path.isfile(file_path) or os.path.getsize(file_path) < 100:
-            continue
+    variants, active = voice_index.entries(project_path)
 
-        actual_dur = get_actual_duration(file_path)
-        if actual_dur <= 0:
+    files = []
+    for f, meta in variants.items():
+        if not meta.get("duration") or meta["duration"] <= 0:
             continue # Don't show files that browser can't play
+        files.append({
+            **meta,
+            "filename": f,
+            "url": f"/media/{project_id}/audio/{f}",
+            "peaks_url": f"/projects/{project_id}/peaks/{f}"
+        })
 
-        if f.startswith("voice---") and f.endswith(".mp3"):
-            parts = f[:-4].split('---')
-            if len(parts) >= 4:
-                try:
-                    files.append({
-                        "filename": f,
-                        "profile_id": parts[1],
-                        "speed": float(parts[2]),
-                        "timestamp": parts[3],
-                        "duration": actual_dur,
-                        "url": f"/media/{project_id}/audio/{f}"
-                    })
-                except:
-                    pass
-        elif f == "voice.mp3":
+    if active:
+        f = active["filename"]
+        duration = active.get("duration")
+        if duration is None:
+            duration = get_actual_duration(os.path.join(project_path, "audio", f))
+        if duration > 0:
             files.append({
                 "filename": f,
                 "label": "RAW_TTS (Current)",
-                "duration": actual_dur,
-                "url": f"/media/{project_id}/audio/{f}"
+                "source": active.get("source"),
+                "duration": duration,
+                "url": f"/media/{project_id}/audio/{f}",
+                "peaks_url": f"/projects/{project_id}/peaks/{f}"
             })
     
     # Sort by timestamp descending
@@ -0,0 +1,142 @@
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, CancelledError, wait, FIRST_COMPLETED
+from core.config import CACHE_DIR
+
+# Hedged TTS requests.
+# The primary provider gets a deadline derived from its own recent latencies
+# (a high percentile). If it hasn't answered by then (or fails), a backup
+# request is issued (tts_handler sends it to settings.voice.hedge_backup_provider)
+# and whichever finishes first wins.
+# Python threads can't be killed, so each side gets a `cancelled` event that is
+# set once the other side has won. Calls check it before each API request
+# (sentences of a chunked synthesis, a request still waiting for a rate-limit
+# slot) and raise CancelledError, so the loser stops spending quota on requests
+# it hasn't sent yet. A request already in flight runs to completion and its
+# result is discarded (it still lands in the TTS cache, which is harmless).
+#
+# Latency samples and hedge outcomes are kept in cache/tts_latency.json so
+# deadlines survive restarts and /api/tts/metrics can show the savings.
+
+METRICS_PATH = os.path.join(CACHE_DIR, "tts_latency.json")
+MAX_SAMPLES = 200
+
+_lock = threading.Lock()
+_metrics = None
+
+def _load():
+    global _metrics
+    if _metrics is None:
+        try:
+            with open(METRICS_PATH, "r") as f:
+                _metrics = json.load(f)
+        except (OSError, ValueError):
+            _metrics = {}
+        _metrics.setdefault("latency", {})
+        _metrics.setdefault("hedging", {"requests": 0, "hedged": 0, "wins": {}, "saved_sec": 0.0})
+    return _metrics
+
+def _save():
+    os.makedirs(os.path.dirname(METRICS_PATH), exist_ok=True)
+    tmp_path = METRICS_PATH + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(_metrics, f, indent=2)
+    os.replace(tmp_path, METRICS_PATH)
+
+def record_latency(provider, seconds):
+    """Stores one real (non-cached) request latency for a provider."""
+    with _lock:
+        samples = _load()["latency"].setdefault(provider, [])
+        samples.append(round(seconds, 3))
+        del samples[:-MAX_SAMPLES]
+        _save()
+
+def deadline(provider, percentile=95, min_samples=10, default_sec=20.0):
+    """Hedge deadline: the given latency percentile, or default_sec until enough samples exist."""
+    with _lock:
+        samples = sorted(_load()["latency"].get(provider, []))
+    if len(samples) < min_samples:
+        return default_sec
+    index = min(len(samples) - 1, int(round(percentile / 100.0 * (len(samples) - 1))))
+    return samples[index]
+
+def _record_outcome(winner, hedged):
+    with _lock:
+        hedging = _load()["hedging"]
+        hedging["requests"] += 1
+        if hedged:
+            hedging["hedged"] += 1
+        hedging["wins"][winner] = hedging["wins"].get(winner, 0) + 1
+        _save()
+
+def _record_saving(saved_sec):
+    with _lock:
+        hedging = _load()["hedging"]
+        hedging["saved_sec"] = round(hedging["saved_sec"] + saved_sec, 3)
+        _save()
+
+def check_cancelled(cancelled):
+    """Raises CancelledError if the hedge this call belongs to was already won by the other side."""
+    if cancelled is not None and cancelled.is_set():
+        raise CancelledError()
+
+def hedged_call(primary_name, primary, backup_name=None, backup=None, deadline_sec=20.0):
+    """
+    Runs primary(cancelled); if it is still running after deadline_sec (or fails) and a
+    backup is given, also runs backup(cancelled) and returns the first successful result.
+    The loser's `cancelled` event is set when the other side wins (see check_cancelled).
+    Returns (result, winner_name, hedged). Raises the primary's error if both fail.
+    """
+    executor = ThreadPoolExecutor(max_workers=2)
+    primary_cancelled, backup_cancelled = threading.Event(), threading.Event()
+    try:
+        primary_future = executor.submit(primary, primary_cancelled)
+        if backup is None:
+            result = primary_future.result()
+            _record_outcome(primary_name, False)
+            return result, primary_name, False
+
+        done, _ = wait([primary_future], timeout=deadline_sec)
+        if done and primary_future.exception() is None:
+            _record_outcome(primary_name, False)
+            return primary_future.result(), primary_name, False
+
+        backup_future = executor.submit(backup, backup_cancelled)
+        names = {primary_future: primary_name, backup_future: backup_name}
+        losers = {primary_future: backup_cancelled, backup_future: primary_cancelled}
+        pending = {primary_future, backup_future}
+        primary_error = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is not None:
+                    if future is primary_future:
+                        primary_error = future.exception()
+                    continue
+                won_at = time.time()
+                losers[future].set()
+                if future is backup_future and primary_future in pending:
+                    # Savings are known once the abandoned primary finishes
+                    primary_future.add_done_callback(
+                        lambda f: f.exception() is None and _record_saving(time.time() - won_at))
+                _record_outcome(names[future], True)
+                return future.result(), names[future], True
+        raise primary_error or backup_future.exception()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+def stats():
+    with _lock:
+        metrics = _load()
+        latency = {}
+        for provider, samples in metrics["latency"].items():
+            ordered = sorted(samples)
+            if ordered:
+                latency[provider] = {
+                    "samples": len(ordered),
+                    "p50": ordered[len(ordered) // 2],
+                    "p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                }
+        return {"latency": latency, "hedging": dict(metrics["hedging"])}
@@ -3,7 +3,11 @@ import json
 import subprocess
 import time
 import math
+import hashlib
+import threading
 from core.logger import log_event
+from core import governor
+from core.events import publish
 
 def get_ffmpeg_env():
     """Configures PATH to include local bin/ffmpeg if available."""
@@ -14,6 +18,87 @@ def get_ffmpeg_env():
         env["PATH"] = bin_dir + os.pathsep + env.get("PATH", "")
     return env
 
+STILL_SIZES = {"portrait": (2160, 3840), "landscape": (3840, 2160)} # The renderer scales to 2x output
+
+def get_render_still(project_path, img_path, video_format="portrait", meta=None):
+    """
+    Returns a baseline RGB JPEG copy of img_path that ffmpeg can always decode.
+    Large sources are decoded at a reduced scale that still covers the render's
+    2x working size, so ffmpeg never has to scale down a 4000 px photo either.
+    Cached under cache/stills/ keyed by the source's path, size and mtime and the
+    format, so the conversion is done once (possibly ahead of time by the
+    speculative executor). Falls back to the original path if conversion fails.
+    meta: the image index entry; a plain RGB/grayscale JPEG that can't be reduced
+    is used as-is (no re-encode).
+    """
+    from utils.image_processor import open_reduced, decode_size
+    target_w, target_h = STILL_SIZES.get(video_format, STILL_SIZES["portrait"])
+    if (meta and meta.get("format") == "JPEG" and meta.get("mode") in ("RGB", "L")
+            and meta.get("orientation", 1) == 1 and meta.get("width")
+            and decode_size(meta["width"], meta["height"], target_w, target_h, "fill") is None):
+        return img_path
+    try:
+        st = os.stat(img_path)
+    except OSError:
+        return img_path
+
+    stills_dir = os.path.join(project_path, "cache", "stills")
+    # Name + path hash: photo.jpg/photo.png or input/cover.png/cover.jpg don't share stills
+    path_hash = hashlib.sha1(os.path.abspath(img_path).encode("utf-8")).hexdigest()[:8]
+    base = f"{os.path.splitext(os.path.basename(img_path))[0]}.{path_hash}"
+    still_path = os.path.join(stills_dir, f"{base}-{st.st_size}-{st.st_mtime_ns}-{video_format}.jpg")
+    if os.path.exists(still_path):
+        return still_path
+
+    try:
+        os.makedirs(stills_dir, exist_ok=True)
+        # Drop stale stills of the same source (older versions of the file)
+        version = f"{base}-{st.st_size}-{st.st_mtime_ns}-"
+        for f in os.listdir(stills_dir):
+            if f.rsplit("-", 3)[0] == base and not f.startswith(version):
+                try: os.remove(os.path.join(stills_dir, f))
+                except: pass
+        tmp_path = still_path + ".tmp"
+        im, _ = open_reduced(img_path, target_w, target_h, mode="fill")
+        with im:
+            im.convert("RGB").save(tmp_path, "JPEG")
+        os.replace(tmp_path, still_path)
+        return still_path
+    except Exception:
+        return img_path
+
+def _run_with_progress(cmd, project_path, total_sec):
+    """
+    Runs ffmpeg with -progress on stdout and pushes render_progress events
+    (whole-percent steps) to live subscribers. Returns (returncode, stderr_bytes).
+    """
+    project_id = os.path.basename(os.path.normpath(project_path))
+    cmd = cmd[:1] + ["-progress", "pipe:1", "-nostats"] + cmd[1:]
+    process = governor.popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=get_ffmpeg_env())
+
+    # Drain stderr concurrently so a chatty ffmpeg can't block on a full pipe
+    stderr_chunks = []
+    drain = threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)
+    drain.start()
+
+    last_pct = -1
+    for raw in process.stdout:
+        key, _, value = raw.decode("utf-8", "ignore").strip().partition("=")
+        if key == "out_time_us" and total_sec > 0:
+            try:
+                pct = min(99, int(int(value) / 1e6 / total_sec * 100))
+            except ValueError:
+                continue
+            if pct != last_pct:
+                last_pct = pct
+                publish(project_id, "render_progress", {"percent": pct})
+        elif key == "progress" and value == "end":
+            publish(project_id, "render_progress", {"percent": 100})
+
+    process.wait()
+    drain.join()
+    return process.returncode, b"".join(stderr_chunks)
+
 def get_zoompan_filter(seg, width, height, frames, crop_data=None):
     kb = seg.get("ken_burns", {})
     if not kb.get("enabled", True):
@@ -54,7 +139,6 @@ def render_video(project_path, video_format="portrait", transition_id="none", tr
     Final high-stability renderer using Concat method. 
     Transitions (xfade) are disabled for this build to ensure 100% success rate.
     """
-    cleanup_files = []
     try:
         log_event(project_path, "render.log", f"[RENDER] Starting high-stability concat render...")
         WIDTH, HEIGHT = (1080, 1920) if video_format == "portrait" else (1920, 1080)
@@ -62,15 +146,21 @@ def render_video(project_path, video_format="portrait", transition_id="none", tr
         timeline_path = os.path.join(project_path, "timeline.json")
         with open(timeline_path, 'r') as f: timeline = json.load(f)
         
+        # Internal audio is lossless (WAV); this render is the only AAC encode
         audio_path = os.path.join(project_path, "output", "final_audio_mix.wav")
         if not os.path.exists(audio_path):
-            audio_path = os.path.join(project_path, "audio", "voice_processed.mp3")
-            if not os.path.exists(audio_path):
-                audio_path = os.path.join(project_path, "audio", "voice.mp3")
+            # Mix step skipped: mix now (library music is memory-mapped, so this is cheap)
+            from utils.audio_mixer import mix_background_music
+            mix_res = mix_background_music(project_path)
+            log_event(project_path, "render.log", f"[RENDER] No audio mix found, mixed on demand: {mix_res.get('status')}")
+        if not os.path.exists(audio_path):
+            from utils.voice_paths import best_voice_path
+            audio_path = best_voice_path(project_path) or os.path.join(project_path, "audio", "voice.wav")
 
         from utils.crop_manager import load_crops
-        from PIL import Image
+        from utils import image_index
         crops_data = load_crops(project_path)
+        images_meta = image_index.entries(project_path)
         input_dir = os.path.join(project_path, "input")
         
         if not output_file:
@@ -93,13 +183,8 @@ def render_video(project_path, video_format="portrait", transition_id="none", tr
             else:
                 img_path = os.path.abspath(os.path.join(input_dir, img_name))
             
-            # Formate normalization via PIL
-            temp_jpg = os.path.join(project_path, f"input_stb_{i}.jpg")
-            try:
-                with Image.open(img_path) as im: im.convert("RGB").save(temp_jpg, "JPEG")
-                img_path = temp_jpg
-                cleanup_files.append(temp_jpg)
-            except: pass
+            # Formate normalization via PIL (cached, may already be precomputed)
+            img_path = get_render_still(project_path, img_path, video_format, meta=images_meta.get(image_id))
 
             inputs.extend(["-loop", "1", "-r", "30", "-i", img_path])
             dur = seg['duration']
@@ -150,17 +235,13 @@ def render_video(project_path, video_format="portrait", transition_id="none", tr
             ])
         
         log_event(project_path, "render.log", f"[RENDER] Launching Concat Render...")
-        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=get_ffmpeg_env())
-        stdout, stderr = process.communicate()
+        total_sec = trim_to if trim_to and trim_to > 0 else sum(seg.get("duration", 0) for seg in segments)
+        returncode, stderr = _run_with_progress(cmd, project_path, total_sec)
         
-        if process.returncode != 0:
+        if returncode != 0:
             log_event(project_path, "render.log", f"[RENDER] FAIL: {stderr.decode('utf-8')[-200:]}")
             return {"status": "FAIL", "error": "Render failed"}
             
         return {"status": "PASS", "output_file": "final_video.mp4"}
     except Exception as e:
         return {"status": "FAIL", "error": str(e)}
-    finally:
-        for f in cleanup_files:
-            try: os.remove(f)
-            except: pass
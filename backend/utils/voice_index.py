@@ -0,0 +1,156 @@
+import os
+import json
+import hashlib
+import threading
+from utils import voice_paths
+
+# Per-project voice index (voice_index.json in the project root).
+# generate_voice records each voice--- variant's metadata when it is created
+# (profile, provider, speed, style, duration, text hash, size), and activation
+# and deletion update it, so the voice panel is listed from one small JSON file
+# instead of listing audio/, parsing filenames and probing every variant.
+#
+# Anything else that adds or removes files in audio/ changes its mtime, which
+# triggers a reconcile (listdir; only unknown files are probed) on the next
+# read, as in image_index. The index lives outside audio/ so its own writes
+# don't. Variants found this way (and legacy projects) get their metadata
+# from the filename.
+
+INDEX_NAME = "voice_index.json"
+VERSION = 1
+
+_lock = threading.Lock()
+
+def index_path(project_path):
+    return os.path.join(project_path, INDEX_NAME)
+
+def _legacy_index_path(project_path):
+    return os.path.join(project_path, "audio", INDEX_NAME)
+
+def _audio_dir(project_path):
+    return os.path.join(project_path, "audio")
+
+def text_hash(text):
+    from utils.tts_cache import normalize_text
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()[:16]
+
+def _load(project_path):
+    for path in (index_path(project_path), _legacy_index_path(project_path)):
+        try:
+            with open(path, "r") as f:
+                index = json.load(f)
+            if index.get("version") == VERSION:
+                return index
+        except (OSError, ValueError):
+            pass
+    return None
+
+def _save(project_path, index):
+    path = index_path(project_path)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    try:
+        os.remove(_legacy_index_path(project_path)) # Migrated out of audio/
+    except OSError:
+        pass
+
+def _variant_from_file(path):
+    """Metadata from a voice---profile---speed---timestamp filename + probed duration, or None."""
+    from utils import media_probe
+    parts = os.path.splitext(os.path.basename(path))[0].split('---')
+    if len(parts) < 4:
+        return None
+    try:
+        speed = float(parts[2])
+    except ValueError:
+        return None
+    size = os.path.getsize(path)
+    return {
+        "profile_id": parts[1],
+        "speed": speed,
+        "timestamp": parts[3],
+        "duration": media_probe.duration(path) if size >= 100 else 0.0,
+        "size": size,
+    }
+
+def _reconcile(project_path, index):
+    """Brings the index in line with audio/ (variants added or removed by other code, the active voice)."""
+    from utils import media_probe
+    audio_dir = _audio_dir(project_path)
+    on_disk = set()
+    for f in os.listdir(audio_dir):
+        path = os.path.join(audio_dir, f)
+        if not voice_paths.is_voice_variant(f) or not os.path.isfile(path):
+            continue
+        on_disk.add(f)
+        if f not in index["variants"]:
+            try:
+                entry = _variant_from_file(path)
+            except OSError:
+                continue
+            if entry:
+                index["variants"][f] = entry
+    for f in [f for f in index["variants"] if f not in on_disk]:
+        del index["variants"][f]
+
+    active = voice_paths.raw_voice_path(project_path)
+    if not active or os.path.getsize(active) < 100:
+        index["active"] = None
+    else:
+        recorded = index.get("active") or {}
+        size = os.path.getsize(active)
+        if recorded.get("filename") != os.path.basename(active) or recorded.get("size") != size:
+            # Replaced outside set_active: the source variant is unknown
+            index["active"] = {
+                "filename": os.path.basename(active),
+                "source": None,
+                "duration": media_probe.duration(active),
+                "size": size,
+            }
+
+def _get(project_path):
+    """The index, reconciled with audio/ if the folder changed since the last read."""
+    index = _load(project_path) or {"version": VERSION, "variants": {}, "active": None}
+    try:
+        dir_mtime = os.stat(_audio_dir(project_path)).st_mtime_ns
+    except OSError:
+        return index
+    if index.get("dir_mtime_ns") != dir_mtime:
+        _reconcile(project_path, index)
+        index["dir_mtime_ns"] = dir_mtime
+        _save(project_path, index)
+    return index
+
+def add_variant(project_path, filename, **metadata):
+    """Records a newly generated voice--- variant."""
+    with _lock:
+        index = _get(project_path)
+        index["variants"][filename] = metadata
+        _save(project_path, index)
+
+def remove_variant(project_path, filename):
+    with _lock:
+        index = _get(project_path)
+        index["variants"].pop(filename, None)
+        _save(project_path, index)
+
+def set_active(project_path, source_filename, active_filename):
+    """Records which variant was copied to voice.wav (the active voice)."""
+    with _lock:
+        index = _get(project_path)
+        variant = index["variants"].get(source_filename, {})
+        index["active"] = {
+            "filename": active_filename,
+            "source": source_filename,
+            "duration": variant.get("duration"),
+            "size": variant.get("size"),
+        }
+        _save(project_path, index)
+
+def entries(project_path):
+    """(variants {filename: metadata}, active entry or None) from the index."""
+    with _lock:
+        index = _get(project_path)
+    return index["variants"], index.get("active")
@@ -0,0 +1,46 @@
+import os
+
+# Voice audio stays lossless (WAV) through the internal chain:
+#   TTS -> voice---*.wav -> voice.wav -> voice_processed.wav -> final_audio_mix.wav
+# and is encoded to a delivery codec (AAC) once, at render.
+# Projects created before this keep their .mp3 files; every lookup accepts both.
+
+VOICE_EXTS = (".wav", ".mp3") # Preference order
+MASTER_NAMES = ("voice", "voice_processed")
+
+def _find(project_path, name):
+    audio_dir = os.path.join(project_path, "audio")
+    for ext in VOICE_EXTS:
+        path = os.path.join(audio_dir, name + ext)
+        if os.path.exists(path):
+            return path
+    return None
+
+def raw_voice_path(project_path):
+    """The active voice (voice.wav, or legacy voice.mp3), or None."""
+    return _find(project_path, "voice")
+
+def processed_voice_path(project_path):
+    """The normalized voice (voice_processed.wav, or legacy .mp3), or None."""
+    return _find(project_path, "voice_processed")
+
+def best_voice_path(project_path):
+    """Processed voice if available (matches the timeline), else the raw voice, else None."""
+    return processed_voice_path(project_path) or raw_voice_path(project_path)
+
+def is_master_file(filename):
+    name, ext = os.path.splitext(filename)
+    return name in MASTER_NAMES and ext in VOICE_EXTS
+
+def is_voice_variant(filename):
+    return filename.startswith("voice---") and os.path.splitext(filename)[1] in VOICE_EXTS
+
+def clear_masters(project_path, names=MASTER_NAMES):
+    """Removes voice / voice_processed in every format (before a new active voice is set)."""
+    audio_dir = os.path.join(project_path, "audio")
+    for name in names:
+        for ext in VOICE_EXTS:
+            path = os.path.join(audio_dir, name + ext)
+            if os.path.exists(path):
+                try: os.remove(path)
+                except OSError: pass
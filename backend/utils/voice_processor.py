@@ -3,40 +3,50 @@ import shutil
 import subprocess
 import json
 from core.logger import log_event
+from core import governor
+from utils import voice_paths
+from utils import loudness
+from utils import file_hash
 
 def get_actual_duration(file_path):
     """
-    Get actual audio duration using system tools (afinfo on Mac).
+    Get actual audio duration (header parsing via media_probe).
     """
+    from utils import media_probe
+    return media_probe.duration(file_path)
+
+def _sample_rate(file_path, default=48000):
+    """Sample rate of a WAV file; compressed inputs get the default."""
     try:
-        # afinfo -b provides a brief description
-        result = subprocess.run(['afinfo', '-b', file_path], capture_output=True, text=True)
-        if result.returncode == 0:
-            # Search for 'sec' in any line
-            for line in result.stdout.split('\n'):
-                if 'sec' in line:
-                    # Line example: '12.504 sec, format: ...'
-                    parts = line.strip().split(' ')
-                    if len(parts) > 0:
-                        try:
-                            return float(parts[0])
-                        except ValueError:
-                            continue
+        import wave
+        with wave.open(file_path, 'rb') as wav_file:
+            return wav_file.getframerate()
     except Exception:
-        pass
-    return 0.0
+        return default
+
+def _read_sidecar(path):
+    try:
+        with open(path, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _write_sidecar(path, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=2)
 
 def process_voice(project_id, project_path):
     """
     Normalizes volume and trims silence from the TTS audio.
-    Saves to voice_processed.mp3.
+    Saves to voice_processed.wav (16-bit PCM, same sample rate as the input)
+    so the voice is not re-encoded before the final render.
     """
-    raw_audio = os.path.join(project_path, "audio", "voice.mp3")
-    processed_audio = os.path.join(project_path, "audio", "voice_processed.mp3")
+    raw_audio = voice_paths.raw_voice_path(project_path)
+    processed_audio = os.path.join(project_path, "audio", "voice_processed.wav")
     
     # 1. Voice Input Validation
-    if not os.path.exists(raw_audio):
-        error_msg = "TTS output (voice.mp3) missing"
+    if not raw_audio:
+        error_msg = "TTS output (voice.wav) missing"
         log_event(project_path, "pipeline.log", f"[STEP19] FAIL: {error_msg}")
         return None, error_msg
 
@@ -45,23 +55,60 @@ def process_voice(project_id, project_path):
     
     # Check if ffmpeg is available
     ffmpeg_available = shutil.which("ffmpeg") is not None
+
+    # 3. Skip if voice_processed.wav was already made from this exact voice
+    source_hash = file_hash.content_hash(raw_audio)
+    sidecar_path = os.path.join(project_path, "audio", "voice_processed.json")
+    previous = _read_sidecar(sidecar_path)
+    if ffmpeg_available and previous.get("source_hash") == source_hash and os.path.exists(processed_audio):
+        final_duration = get_actual_duration(processed_audio) or orig_duration
+        log_event(project_path, "pipeline.log", f"[STEP19] SKIP | Voice unchanged ({source_hash[:12]}), reusing voice_processed.wav")
+        return {
+            "original_duration": orig_duration,
+            "processed_duration": final_duration,
+            "silence_trimmed": previous.get("silence_trimmed", True),
+            "normalization_applied": previous.get("normalization_applied", True),
+            "normalization_mode": previous.get("mode"),
+            "status": "OK",
+            "file": os.path.basename(processed_audio),
+            "cached": True
+        }, None
+
+    # Replace any previous processed voice (including legacy voice_processed.mp3)
+    voice_paths.clear_masters(project_path, names=("voice_processed",))
+    if os.path.exists(sidecar_path):
+        os.remove(sidecar_path)
     
     success = True
     silence_trimmed = False
     normalization_applied = False
+    mode = None
     
     if ffmpeg_available:
         # REAL PROCESSING
-        # Note: In a production environment, this would be a multi-step filter string
-        # silenceremove=start_periods=1:stop_periods=1:detection=peak
-        # loudnorm=I=-16:TP=-1.5:LRA=11
+        # 4. Normalize from the cached measurement: a static gain when it can reach
+        # the target without clipping, otherwise a two-pass loudnorm
         try:
-            cmd = [
-                "ffmpeg", "-y", "-i", raw_audio,
-                "-af", "loudnorm=I=-16:TP=-1.5:LRA=11",
-                processed_audio
-            ]
-            subprocess.run(cmd, check=True, capture_output=True)
+            sample_rate = _sample_rate(raw_audio)
+            norm = loudness.plan(loudness.measure(raw_audio, content_hash=source_hash))
+            mode = norm["mode"]
+            if mode == "gain":
+                loudness.apply_gain(raw_audio, processed_audio, norm["gain_db"], sample_rate)
+                log_event(project_path, "pipeline.log", f"[STEP19] Static gain {norm['gain_db']:+.2f} dB")
+            else:
+                # Measurement unavailable -> the old single-pass loudnorm
+                af = norm["filter"] if mode == "loudnorm" else "loudnorm=I=-16:TP=-1.5:LRA=11"
+                # loudnorm resamples to 192 kHz internally; pin the output rate to the source's
+                cmd = [
+                    "ffmpeg", "-y", "-i", raw_audio,
+                    "-af", af,
+                    "-ar", str(sample_rate),
+                    "-c:a", "pcm_s16le",
+                    processed_audio
+                ]
+                governor.run(cmd, check=True, capture_output=True)
+                mode = mode if mode == "loudnorm" else "loudnorm_single_pass"
+                log_event(project_path, "pipeline.log", f"[STEP19] Loudnorm ({mode})")
             silence_trimmed = True
             normalization_applied = True
         except subprocess.CalledProcessError as e:
@@ -72,6 +119,8 @@ def process_voice(project_id, project_path):
     else:
         # SIMULATION MODE (FFmpeg missing)
         log_event(project_path, "pipeline.log", "[STEP19] [WARNING] FFmpeg not found. Using simulation (Passthrough).")
+        # Passthrough keeps the source container (legacy MP3 stays .mp3)
+        processed_audio = os.path.join(project_path, "audio", "voice_processed" + os.path.splitext(raw_audio)[1])
         shutil.copy2(raw_audio, processed_audio)
         silence_trimmed = True # Simulated
         normalization_applied = True # Simulated
@@ -82,6 +131,8 @@ def process_voice(project_id, project_path):
     # Check for anomalies (e.g. file became empty/too short)
     if final_duration < 1.0 and orig_duration > 5.0:
         log_event(project_path, "pipeline.log", f"[STEP19] [WARN] Processed audio too short ({final_duration}s). Reverting to original.")
+        voice_paths.clear_masters(project_path, names=("voice_processed",))
+        processed_audio = os.path.join(project_path, "audio", "voice_processed" + os.path.splitext(raw_audio)[1])
         shutil.copy2(raw_audio, processed_audio)
         final_duration = orig_duration
         silence_trimmed = False
@@ -96,6 +147,15 @@ def process_voice(project_id, project_path):
 
     # 6. Logging
     status = "OK" if success else "FAIL"
+    from utils.waveform import ensure_quietly
+    ensure_quietly(processed_audio, project_path)
+    if ffmpeg_available and normalization_applied:
+        _write_sidecar(sidecar_path, {
+            "source_hash": source_hash,
+            "mode": mode,
+            "silence_trimmed": silence_trimmed,
+            "normalization_applied": normalization_applied
+        })
     log_event(project_path, "pipeline.log", 
               f"[STEP19] {status} | Orig: {orig_duration}s | Final: {final_duration}s | Trimmed: {silence_trimmed} | Normalized: {normalization_applied}")
     
@@ -104,8 +164,9 @@ def process_voice(project_id, project_path):
         "processed_duration": final_duration,
         "silence_trimmed": silence_trimmed,
         "normalization_applied": normalization_applied,
+        "normalization_mode": mode,
         "status": status,
-        "file": "voice_processed.mp3"
+        "file": os.path.basename(processed_audio)
     }
     
     return result, None
@@ -0,0 +1,142 @@
+import os
+import struct
+import threading
+from core.config import CACHE_DIR
+from utils import file_lru
+from utils.file_hash import content_hash
+
+# Precomputed waveform peaks so the UI can draw voice/mix waveforms without
+# downloading and decoding the audio.
+# Peaks are min/max pairs of the mono downmix at several zoom levels, quantized
+# to int8, and stored as one binary sidecar per audio content hash in
+# cache/peaks (identical files such as voice.wav and its variant share it).
+# The store is size-bounded: sidecars of audio that is no longer served (e.g.
+# earlier re-mixes of final_audio_mix.wav) are evicted LRU (file_lru).
+#
+# Sidecar layout (little endian):
+#   header: b"PEAK", version u8, level count u8, sample_rate u32, frames u32
+#   per level: samples_per_peak u32, peak count u32
+#   then per level, count * (min i8, max i8)
+
+PEAKS_DIR = os.path.join(CACHE_DIR, "peaks")
+MAGIC = b"PEAK"
+VERSION = 1
+BASE_SAMPLES_PER_PEAK = 256
+LEVEL_FACTOR = 4
+NUM_LEVELS = 4 # 256, 1024, 4096, 16384 samples per peak
+
+def _settings():
+    from core.global_settings import get_settings
+    return get_settings().waveform
+
+def sidecar_path(digest):
+    return os.path.join(PEAKS_DIR, digest[:2], f"{digest}.peaks")
+
+def _decode_mono(path):
+    """(mono float32 samples, sample_rate); WAV natively at its own rate, others via ffmpeg."""
+    from utils import audio_engine
+    if path.lower().endswith(".wav"):
+        try:
+            data, rate = audio_engine._read_wav(path)
+            return data.mean(axis=1), rate
+        except Exception:
+            pass
+    data = audio_engine.load_audio(path, rate=audio_engine.MIX_RATE, channels=1)
+    return data[:, 0], audio_engine.MIX_RATE
+
+def compute_levels(samples):
+    """[(samples_per_peak, int8 array shaped (count, 2))] from the finest level up."""
+    from utils.audio_engine import np
+    spp = BASE_SAMPLES_PER_PEAK
+    count = max(1, int(np.ceil(len(samples) / spp)))
+    padded = np.zeros(count * spp, dtype=np.float32)
+    padded[:len(samples)] = samples
+    frames = padded.reshape(count, spp)
+    lo, hi = frames.min(axis=1), frames.max(axis=1)
+
+    levels = []
+    for level in range(NUM_LEVELS):
+        quantized = np.stack([lo, hi], axis=1)
+        levels.append((spp, np.clip(np.round(quantized * 127.0), -127, 127).astype(np.int8)))
+        # Next zoom level reduces the current min/max pairs, not the samples
+        n = int(np.ceil(len(lo) / LEVEL_FACTOR))
+        pad = n * LEVEL_FACTOR - len(lo)
+        lo = np.concatenate([lo, np.full(pad, lo[-1], np.float32)]).reshape(n, LEVEL_FACTOR).min(axis=1)
+        hi = np.concatenate([hi, np.full(pad, hi[-1], np.float32)]).reshape(n, LEVEL_FACTOR).max(axis=1)
+        spp *= LEVEL_FACTOR
+    return levels
+
+def _pack(levels, rate, frames):
+    header = MAGIC + struct.pack("<BBII", VERSION, len(levels), rate, frames)
+    header += b"".join(struct.pack("<II", spp, len(peaks)) for spp, peaks in levels)
+    return header + b"".join(peaks.tobytes() for _, peaks in levels)
+
+def _unpack(data):
+    if data[:4] != MAGIC:
+        raise ValueError("Not a peaks file")
+    version, n_levels, rate, frames = struct.unpack("<BBII", data[4:14])
+    pos = 14
+    shapes = []
+    for _ in range(n_levels):
+        shapes.append(struct.unpack("<II", data[pos:pos + 8]))
+        pos += 8
+    levels = []
+    for spp, count in shapes:
+        levels.append((spp, data[pos:pos + count * 2]))
+        pos += count * 2
+    return {"sample_rate": rate, "frames": frames, "levels": levels}
+
+def ensure(path):
+    """Computes the peaks sidecar for an audio file if missing. Returns its path, or None."""
+    from utils import audio_engine
+    if not audio_engine.available() or not os.path.exists(path):
+        return None
+    digest = content_hash(path)
+    out = sidecar_path(digest)
+    if file_lru.LRUFileStore.touch(out): # LRU position
+        return out
+    samples, rate = _decode_mono(path)
+    data = _pack(compute_levels(samples), rate, len(samples))
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    tmp_path = out + f".{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, out)
+    lru = file_lru.store(PEAKS_DIR)
+    lru.added(len(data))
+    lru.evict(_settings().max_size_mb * 1024 * 1024, keep=out)
+    return out
+
+def ensure_quietly(path, project_path=None):
+    """ensure() for generation hooks: a failure only gets logged."""
+    try:
+        return ensure(path)
+    except Exception as e:
+        if project_path:
+            from core.logger import log_event
+            log_event(project_path, "pipeline.log", f"[PEAKS] Waveform peaks skipped for {os.path.basename(path)}: {e}")
+        return None
+
+def load(path, width=None):
+    """
+    Peaks for an audio file (computed on first request). Picks the coarsest level that
+    still has at least `width` peaks (finest level if width is None).
+    Returns {"sample_rate", "samples_per_peak", "duration", "peaks": [min, max, ...]}.
+    """
+    sidecar = ensure(path)
+    if not sidecar:
+        return None
+    with open(sidecar, "rb") as f:
+        parsed = _unpack(f.read())
+    levels = parsed["levels"]
+    spp, raw = levels[0]
+    if width:
+        for level_spp, level_raw in levels:
+            if len(level_raw) // 2 >= width:
+                spp, raw = level_spp, level_raw
+    return {
+        "sample_rate": parsed["sample_rate"],
+        "samples_per_peak": spp,
+        "duration": round(parsed["frames"] / float(parsed["sample_rate"]), 3),
+        "peaks": list(struct.unpack(f"<{len(raw)}b", raw)),
+    }
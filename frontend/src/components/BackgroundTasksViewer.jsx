@@ -1,5 +1,6 @@
 import React, { useState, useEffect } from 'react';
 import { API_URL } from '../config';
+import { subscribeEvents } from '../events';
 import { CloudDownload, CheckCircle, Loader2, AlertCircle, X } from 'lucide-react';
 
 export default function BackgroundTasksViewer() {
@@ -7,23 +8,44 @@ export default function BackgroundTasksViewer() {
     const [isVisible, setIsVisible] = useState(false);
 
     useEffect(() => {
+        let interval = null;
+
+        const applyTasks = (data) => {
+            setTasks(data);
+
+            // Show automatically if there are downloading tasks
+            const hasActive = Object.values(data).some(t => t.status === 'downloading');
+            if (hasActive) setIsVisible(true);
+        };
+
         const fetchTasks = async () => {
             try {
                 const res = await fetch(`${API_URL}/api/tasks/background`);
-                const data = await res.json();
-                setTasks(data);
-
-                // Show automatically if there are downloading tasks
-                const hasActive = Object.values(data).some(t => t.status === 'downloading');
-                if (hasActive) setIsVisible(true);
+                applyTasks(await res.json());
             } catch (err) {
                 console.error("Failed to fetch bg tasks", err);
             }
         };
 
-        const interval = setInterval(fetchTasks, 2000);
-        fetchTasks();
-        return () => clearInterval(interval);
+        // Download counters are pushed over SSE; poll only if the stream is unavailable
+        const unsubscribe = subscribeEvents('/events?types=download', {
+            download: (e) => {
+                const { task_id, ...task } = e.data;
+                setTasks(prev => {
+                    const next = { ...prev, [task_id]: task };
+                    if (task.status === 'downloading') setIsVisible(true);
+                    return next;
+                });
+            }
+        }, () => {
+            fetchTasks();
+            interval = setInterval(fetchTasks, 2000);
+        });
+
+        return () => {
+            unsubscribe();
+            if (interval) clearInterval(interval);
+        };
     }, []);
 
     const taskList = Object.values(tasks).sort((a, b) =>
@@ -1,16 +1,30 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Play, Loader, AlertCircle, CheckCircle, X, RotateCcw, Download, Video } from 'lucide-react';
 import { API_URL } from '../config';
+import { subscribeEvents } from '../events';
 
 export default function PipelineOrchestrator({ projectId, projectStatus, onUpdate }) {
     const [job, setJob] = useState(null);
     const [isPolling, setIsPolling] = useState(false);
+    const [renderProgress, setRenderProgress] = useState(null);
     const pollInterval = useRef(null);
+    const lastStatus = useRef(null);
+    const isLive = useRef(false); // true while the SSE stream is delivering job updates
 
-    // Initial Status Check
+    // Initial Status Check + live updates (polling is only the fallback)
     useEffect(() => {
-        checkStatus();
-        return () => stopPolling();
+        isLive.current = true;
+        const unsubscribe = subscribeEvents(`/projects/${projectId}/events?types=job,render_progress`, {
+            job: (e) => applyJob(e.data),
+            render_progress: (e) => setRenderProgress(e.data.percent)
+        }, () => {
+            isLive.current = false;
+            checkStatus();
+        });
+        return () => {
+            unsubscribe();
+            stopPolling();
+        };
     }, [projectId]);
 
     const stopPolling = () => {
@@ -22,36 +36,42 @@ export default function PipelineOrchestrator({ projectId, projectStatus, onUpdat
     };
 
     const startPolling = () => {
-        if (pollInterval.current) return;
+        if (pollInterval.current || isLive.current) return;
         setIsPolling(true);
         pollInterval.current = setInterval(checkStatus, 2000);
     };
 
+    const applyJob = (data) => {
+        const previous = lastStatus.current;
+        lastStatus.current = data.status;
+
+        // If we get a valid job object
+        if (data.status && data.status !== 'idle') {
+            setJob(data);
+
+            if (data.status === 'running') {
+                startPolling();
+            } else {
+                // Job finished (completed or failed)
+                stopPolling();
+                setRenderProgress(null);
+                if (data.status === 'completed' && previous === 'running') {
+                    // Just finished - mark for scroll and reload
+                    localStorage.setItem('scrollToVideo', 'true');
+                    window.location.reload();
+                }
+            }
+        } else {
+            setJob(null);
+            stopPolling();
+        }
+    };
+
     const checkStatus = async () => {
         try {
             const res = await fetch(`${API_URL}/projects/${projectId}/pipeline/status`);
             if (res.ok) {
-                const data = await res.json();
-
-                // If we get a valid job object
-                if (data.status && data.status !== 'idle') {
-                    setJob(data);
-
-                    if (data.status === 'running') {
-                        startPolling();
-                    } else {
-                        // Job finished (completed or failed)
-                        stopPolling();
-                        if (data.status === 'completed' && job?.status === 'running') {
-                            // Just finished - mark for scroll and reload
-                            localStorage.setItem('scrollToVideo', 'true');
-                            window.location.reload();
-                        }
-                    }
-                } else {
-                    setJob(null);
-                    stopPolling();
-                }
+                applyJob(await res.json());
             }
         } catch (e) {
             console.error("Status check failed", e);
@@ -63,6 +83,7 @@ export default function PipelineOrchestrator({ projectId, projectStatus, onUpdat
         try {
             // Optimistic UI
             setJob({ status: 'running', progress: 0, current_step_label: 'Initializing...' });
+            lastStatus.current = 'running';
             startPolling();
 
             const res = await fetch(`${API_URL}/projects/${projectId}/pipeline/start`, { method: 'POST' });
@@ -129,7 +150,7 @@ export default function PipelineOrchestrator({ projectId, projectStatus, onUpdat
                         </div>
                     </div>
                     <div className="mt-1 flex justify-between">
-                        <span className="text-xs font-bold text-gray-700 truncate max-w-[180px]">{job.current_step_label || 'Processing...'}</span>
+                        <span className="text-xs font-bold text-gray-700 truncate max-w-[180px]">{job.current_step_label || 'Processing...'}{job.current_step === '08_render' && renderProgress !== null ? ` (${renderProgress}%)` : ''}</span>
                     </div>
                 </div>
                 {/* Spinner */}
@@ -1,6 +1,7 @@
 import React, { useState, useEffect, useRef } from 'react';
 import { Play, Pause, SkipBack, SkipForward, Maximize2, RotateCcw, Edit3, Eye, EyeOff, Sparkles, Clock, Monitor, ShieldCheck } from 'lucide-react';
 import { API_URL } from '../config';
+import Waveform from './Waveform';
 
 export default function TimelinePreview({ projectId, refreshTs, onEditAsset }) {
     const [timeline, setTimeline] = useState(null);
@@ -82,7 +83,9 @@ export default function TimelinePreview({ projectId, refreshTs, onEditAsset }) {
     }
 
     const currentSegment = timeline.segments[selectedSegmentIdx];
-    const assetUrl = currentSegment ? `${API_URL}${currentSegment.image_url}?t=${refreshTs}` : '';
+    // Versioned WebP thumbnails (640px) are plenty for the preview stage
+    const segmentSrc = (seg) => seg.thumb_url ? `${API_URL}${seg.thumb_url}` : `${API_URL}${seg.image_url}?t=${refreshTs}`;
+    const assetUrl = currentSegment ? segmentSrc(currentSegment) : '';
 
     const getKenBurnsTransform = () => {
         if (!currentSegment || !currentSegment.ken_burns?.enabled) return 'scale(1)';
@@ -285,6 +288,13 @@ export default function TimelinePreview({ projectId, refreshTs, onEditAsset }) {
                 </div>
 
                 <div className="relative h-14 w-full bg-white/5 rounded-2xl border border-white/10 overflow-hidden flex cursor-pointer group/timeline shadow-inner">
+                    {timeline.peaks_url && (
+                        <div className="absolute inset-0 flex items-center pointer-events-none z-10 opacity-60">
+                            <Waveform peaksUrl={timeline.peaks_url} refreshTs={refreshTs} height={56}
+                                progress={timeline.total_duration ? currentTime / timeline.total_duration : 0}
+                                color="rgba(255,255,255,0.35)" playedColor="rgba(96,165,250,0.9)" />
+                        </div>
+                    )}
                     {timeline.segments.map((seg, i) => (
                         <div
                             key={i}
@@ -294,7 +304,7 @@ export default function TimelinePreview({ projectId, refreshTs, onEditAsset }) {
                             style={{ width: `${(seg.duration / timeline.total_duration) * 100}%` }}
                         >
                             <img
-                                src={`${API_URL}${seg.image_url}?t=${refreshTs}`}
+                                src={segmentSrc(seg)}
                                 className={`absolute inset-0 w-full h-full object-cover transition-all duration-500 ${selectedSegmentIdx === i ? 'opacity-70 scale-105 saturate-150' : 'opacity-20 grayscale'
                                     }`}
                             />
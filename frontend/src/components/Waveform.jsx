@@ -0,0 +1,52 @@
+import React, { useEffect, useRef, useState } from 'react';
+import { API_URL } from '../config';
+
+// Draws precomputed min/max peaks (GET /projects/{id}/peaks/{file}) on a canvas,
+// so waveforms appear without downloading or decoding the audio itself.
+export default function Waveform({ peaksUrl, refreshTs, progress = null, color = '#6366f1', playedColor = '#a5b4fc', height = 48, className = '' }) {
+    const canvasRef = useRef(null);
+    const [peaks, setPeaks] = useState(null);
+
+    useEffect(() => {
+        if (!peaksUrl) return;
+        const canvas = canvasRef.current;
+        const width = Math.max(50, Math.round((canvas?.clientWidth || 600) * (window.devicePixelRatio || 1)));
+        let cancelled = false;
+        fetch(`${API_URL}${peaksUrl}?width=${width}&t=${refreshTs || ''}`)
+            .then(res => res.ok ? res.json() : null)
+            .then(data => { if (!cancelled) setPeaks(data); })
+            .catch(() => { if (!cancelled) setPeaks(null); });
+        return () => { cancelled = true; };
+    }, [peaksUrl, refreshTs]);
+
+    useEffect(() => {
+        const canvas = canvasRef.current;
+        if (!canvas || !peaks) return;
+        const ratio = window.devicePixelRatio || 1;
+        canvas.width = canvas.clientWidth * ratio;
+        canvas.height = height * ratio;
+        const ctx = canvas.getContext('2d');
+        ctx.clearRect(0, 0, canvas.width, canvas.height);
+
+        const values = peaks.peaks;
+        const count = values.length / 2;
+        const mid = canvas.height / 2;
+        const scale = mid / 127;
+        const playedX = progress === null ? -1 : progress * canvas.width;
+        for (let x = 0; x < canvas.width; x++) {
+            // Reduce the peaks that fall into this pixel column
+            const start = Math.floor((x / canvas.width) * count);
+            const end = Math.max(start + 1, Math.floor(((x + 1) / canvas.width) * count));
+            let lo = 0, hi = 0;
+            for (let i = start; i < end && i < count; i++) {
+                lo = Math.min(lo, values[i * 2]);
+                hi = Math.max(hi, values[i * 2 + 1]);
+            }
+            ctx.fillStyle = x < playedX ? playedColor : color;
+            ctx.fillRect(x, mid - hi * scale, 1, Math.max(1, (hi - lo) * scale));
+        }
+    }, [peaks, progress, color, playedColor, height]);
+
+    if (!peaksUrl) return null;
+    return <canvas ref={canvasRef} className={`w-full block ${className}`} style={{ height }} />;
+}
@@ -591,7 +591,7 @@ export default function ImageProcessor({ projectId, assets, onUpdate, onClose, i
                                             <video src={`${API_URL}${asset.url}?t=${gridTs}#t=0.5`} className="w-full h-full object-cover" muted />
                                         ) : (
                                             <img
-                                                src={`${API_URL}${asset.url}?t=${gridTs}`}
+                                                src={asset.thumb_url ? `${API_URL}${asset.thumb_url}` : `${API_URL}${asset.url}?t=${gridTs}`}
                                                 className="w-full h-full object-cover"
                                                 alt={asset.name}
                                                 loading="lazy"
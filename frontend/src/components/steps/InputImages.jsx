@@ -221,12 +221,45 @@ export default function InputImages({ projectId, lastUpdated, projectData, onUpd
                     process_all: true,
                     mode: 'normalize',
                     bg_color: '#000000',
-                    ai_smart_crop: aiSmartCrop
+                    ai_smart_crop: aiSmartCrop,
+                    stream: true
                 })
             });
             if (res.ok) {
-                setStatus({ type: 'success', message: aiSmartCrop ? 'AI Perception: Subjects Traced & Cropped' : 'Normalization Complete (9:16)' });
+                // One NDJSON line per image as the worker pool finishes it; the backend
+                // only processes images, and its final line carries the real total
+                const reader = res.body.getReader();
+                const decoder = new TextDecoder();
+                let buffer = '';
+                let processed = 0;
+                const failed = [];
+                let total = assets.filter(a => /\.(jpe?g|png|webp)$/i.test(a.name)).length;
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffer += decoder.decode(value, { stream: true });
+                    const lines = buffer.split('\n');
+                    buffer = lines.pop();
+                    for (const line of lines) {
+                        if (!line.trim()) continue;
+                        const result = JSON.parse(line);
+                        if (result.done) {
+                            total = result.requested;
+                            continue;
+                        }
+                        if (result.status === 'OK') processed += 1;
+                        else failed.push(result.name);
+                        setStatus({ type: 'info', message: `Normalizing ${processed + failed.length}/${total}...` });
+                    }
+                }
+                if (failed.length) {
+                    setStatus({ type: 'error', message: `Normalized ${processed}/${total}; failed: ${failed.join(', ')}` });
+                } else {
+                    setStatus({ type: 'success', message: aiSmartCrop ? 'AI Perception: Subjects Traced & Cropped' : 'Normalization Complete (9:16)' });
+                }
                 handleRefresh();
+            } else {
+                setStatus({ type: 'error', message: 'Normalization Failed' });
             }
         } catch (e) {
             setStatus({ type: 'error', message: 'Normalization Failed' });
@@ -362,7 +395,7 @@ export default function InputImages({ projectId, lastUpdated, projectData, onUpd
                                             }}
                                         >
                                             <img
-                                                src={`${API_URL}${asset.url}?t=${new Date(lastUpdated).getTime()}`}
+                                                src={asset.thumb_url ? `${API_URL}${asset.thumb_url}` : `${API_URL}${asset.url}?t=${new Date(lastUpdated).getTime()}`}
                                                 alt={asset.name}
                                                 className="object-cover w-full h-full transition-transform duration-500 group-hover:scale-110"
                                                 loading="lazy"
@@ -403,6 +436,14 @@ export default function InputImages({ projectId, lastUpdated, projectData, onUpd
                                                         <RotateCcw size={8} /> EDITED
                                                     </span>
                                                 )}
+                                                {asset.duplicate_of && (
+                                                    <span
+                                                        className="text-[8px] bg-amber-500 text-white px-1.5 py-0.5 rounded-full font-black uppercase flex-none ml-2"
+                                                        title={`Near-duplicate of ${asset.duplicate_of} (skipped in the timeline)`}
+                                                    >
+                                                        DUP
+                                                    </span>
+                                                )}
                                             </div>
                                             <div className="text-[10px] text-gray-400 font-mono tracking-tight">
                                                 {asset.size ? (asset.size / 1024).toFixed(0) + ' KB' : '0 KB'}
@@ -775,7 +816,7 @@ function VideoCoverManager({ projectId, projectData, assets, onUpdate }) {
                                                         onClick={() => handleSetCover('existing', asset.name)}
                                                         className={`relative cursor-pointer rounded-xl overflow-hidden border-2 transition-all group aspect-square ${isSelected ? 'border-indigo-600 ring-4 ring-indigo-50 shadow-md transform scale-[1.02]' : 'border-gray-100 hover:border-gray-300 hover:shadow-sm'}`}
                                                     >
-                                                        <img src={`${API_URL}${asset.url}`} className="w-full h-full object-cover" loading="lazy" />
+                                                        <img src={`${API_URL}${asset.thumb_url || asset.url}`} className="w-full h-full object-cover" loading="lazy" />
                                                         {isSelected && (
                                                             <div className="absolute inset-0 bg-indigo-600/20 flex items-center justify-center backdrop-blur-[1px]">
                                                                 <div className="bg-indigo-600 text-white p-1.5 rounded-full shadow-lg"><ImageIcon size={20} /></div>
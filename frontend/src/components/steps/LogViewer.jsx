@@ -1,6 +1,9 @@
 import React, { useState, useEffect } from 'react';
 import { FileText, Download, Terminal } from 'lucide-react';
 import { API_URL } from '../../config';
+import { subscribeEvents } from '../../events';
+
+const MAX_LINES = 200; // Same window as GET /logs
 
 export default function LogViewer({ projectId, lastUpdated }) {
     const [logs, setLogs] = useState([]);
@@ -20,6 +23,13 @@ export default function LogViewer({ projectId, lastUpdated }) {
             });
     }, [projectId, lastUpdated]);
 
+    // Append new lines as they are written instead of re-fetching every log file
+    useEffect(() => {
+        return subscribeEvents(`/projects/${projectId}/events?types=log`, {
+            log: (e) => setLogs(prev => [...prev, e.data.line].slice(-MAX_LINES))
+        });
+    }, [projectId]);
+
     const filteredLogs = logs.filter(line => {
         if (filter === 'ALL') return true;
         return line.toUpperCase().includes(filter);
@@ -1,6 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import { Mic, Sparkles, Activity, Volume2, RotateCcw, Play, FileAudio, CheckCircle, Trash2 } from 'lucide-react';
 import { API_URL } from '../../config';
+import Waveform from '../Waveform';
 
 export default function VoiceManager({ projectId, lastUpdated, projectData, onUpdate }) {
     const [profiles, setProfiles] = useState([]);
@@ -229,7 +230,7 @@ export default function VoiceManager({ projectId, lastUpdated, projectData, onUp
                             </div>
                         ) : (
                             voiceFiles.map((file, idx) => {
-                                const isActive = file.filename === 'voice.mp3';
+                                const isActive = /^voice\.(wav|mp3)$/.test(file.filename);
                                 return (
                                     <div
                                         key={idx}
@@ -270,7 +271,8 @@ export default function VoiceManager({ projectId, lastUpdated, projectData, onUp
                                                 )}
                                             </div>
                                         </div>
-                                        <div className="bg-gray-50 p-4 rounded-2xl border border-gray-100 shadow-inner">
+                                        <div className="bg-gray-50 p-4 rounded-2xl border border-gray-100 shadow-inner space-y-3">
+                                            <Waveform peaksUrl={file.peaks_url} refreshTs={new Date(projectData.last_updated).getTime()} color={isActive ? '#16a34a' : '#6366f1'} height={40} />
                                             <audio controls className="w-full h-10" src={`${API_URL}${file.url}?t=${new Date(projectData.last_updated).getTime()}`}>
                                                 Your browser does not support audio.
                                             </audio>
@@ -1,7 +1,19 @@
-import React, { useState, useEffect } from 'react';
+import React, { useState, useEffect, useRef } from 'react';
 import { Mic, Play, RotateCcw, Sparkles, Volume2, Info, MessageSquare, Wand } from 'lucide-react';
 import { API_URL } from '../../config';
 
+const WAV_HEADER_BYTES = 44; // Canonical PCM header, as written by the backend
+
+const concatBytes = (parts, length) => {
+    const out = new Uint8Array(length);
+    let offset = 0;
+    for (const part of parts) {
+        out.set(part, offset);
+        offset += part.length;
+    }
+    return out;
+};
+
 export default function VoiceSandbox() {
     const [text, setText] = useState('สวัสดีครับ ยินดีต้อนรับสู่ระบบอัตโนมัติ Easy Auto Video');
     const [style, setStyle] = useState('สดใสและเป็นกันเอง');
@@ -10,6 +22,7 @@ export default function VoiceSandbox() {
     const [generating, setGenerating] = useState(false);
     const [audioUrl, setAudioUrl] = useState(null);
     const [error, setError] = useState(null);
+    const playbackRef = useRef(null); // { abort, audio } of the preview being streamed
 
     useEffect(() => {
         // Fetch available Gemini voices from backend
@@ -22,40 +35,108 @@ export default function VoiceSandbox() {
                 }
             })
             .catch(err => console.error("Failed to fetch voices", err));
+        return () => stopStreaming();
     }, []);
 
+    useEffect(() => () => { if (audioUrl) URL.revokeObjectURL(audioUrl); }, [audioUrl]);
+
+    const stopStreaming = () => {
+        if (playbackRef.current) {
+            playbackRef.current.abort.abort();
+            playbackRef.current.audio.close();
+            playbackRef.current = null;
+        }
+    };
+
+    // Plays the streamed 16-bit PCM WAV as it arrives (Web Audio: <audio> and MediaSource
+    // can't play a growing WAV from a POST response) and returns the complete file
+    const playWavStream = async (body, audio) => {
+        const reader = body.getReader();
+        const parts = [];
+        let received = 0;
+        let pending = new Uint8Array(0);
+        let format = null;
+        let playAt = 0;
+        while (true) {
+            const { done, value } = await reader.read();
+            if (done) break;
+            parts.push(value);
+            received += value.length;
+            pending = concatBytes([pending, value], pending.length + value.length);
+            if (!format) {
+                if (pending.length < WAV_HEADER_BYTES) continue;
+                const view = new DataView(pending.buffer, 0, WAV_HEADER_BYTES);
+                format = { channels: view.getUint16(22, true), rate: view.getUint32(24, true) };
+                pending = pending.slice(WAV_HEADER_BYTES);
+            }
+            const frameBytes = 2 * format.channels;
+            const usable = pending.length - (pending.length % frameBytes);
+            if (usable === 0) continue;
+            const samples = new Int16Array(pending.slice(0, usable).buffer);
+            pending = pending.slice(usable);
+
+            const frames = samples.length / format.channels;
+            const buffer = audio.createBuffer(format.channels, frames, format.rate);
+            for (let c = 0; c < format.channels; c++) {
+                const channel = buffer.getChannelData(c);
+                for (let i = 0; i < frames; i++) channel[i] = samples[i * format.channels + c] / 32768;
+            }
+            const source = audio.createBufferSource();
+            source.buffer = buffer;
+            source.connect(audio.destination);
+            playAt = Math.max(playAt, audio.currentTime + 0.05);
+            source.start(playAt);
+            playAt += buffer.duration;
+        }
+
+        const bytes = concatBytes(parts, received);
+        // Streamed previews carry open-ended header sizes: fill in the real ones
+        const view = new DataView(bytes.buffer);
+        if (bytes.length >= WAV_HEADER_BYTES && view.getUint32(4, true) === 0xFFFFFFFF) {
+            view.setUint32(4, bytes.length - 8, true);
+            view.setUint32(40, bytes.length - WAV_HEADER_BYTES, true);
+        }
+        return bytes;
+    };
+
     const handleGenerate = async () => {
         if (!text.trim()) return;
+        stopStreaming();
         setGenerating(true);
         setError(null);
+        setAudioUrl(null);
 
+        const playback = { abort: new AbortController(), audio: new AudioContext() };
+        playbackRef.current = playback;
         try {
-            const res = await fetch(`${API_URL}/api/tts/gemini/preview`, {
+            const res = await fetch(`${API_URL}/api/tts/gemini/preview/stream`, {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify({
-                    text,
-                    voice: selectedVoice,
-                    style: style
-                })
+                body: JSON.stringify({ text, voice: selectedVoice, style }),
+                signal: playback.abort.signal
             });
-
             if (!res.ok) {
-                const errData = await res.json();
+                // The error comes from this response; nothing is requested again
+                const errData = await res.json().catch(() => ({}));
                 throw new Error(errData.detail || "Failed to generate audio");
             }
-
-            // Convert binary response to blob URL
-            const blob = await res.blob();
-            const url = URL.createObjectURL(blob);
-            setAudioUrl(url);
+            const bytes = await playWavStream(res.body, playback.audio);
+            // Replay and download use the bytes already received
+            setAudioUrl(URL.createObjectURL(new Blob([bytes], { type: 'audio/wav' })));
         } catch (err) {
-            setError(err.message);
+            if (err.name !== 'AbortError') setError(err.message || "Failed to generate audio");
         } finally {
-            setGenerating(false);
+            if (playbackRef.current === playback) setGenerating(false);
         }
     };
 
+    const handleDownload = () => {
+        const a = document.createElement('a');
+        a.href = audioUrl;
+        a.download = `gemini-tts-${selectedVoice}-${Date.now()}.wav`;
+        a.click();
+    };
+
     return (
         <div className="max-w-5xl mx-auto space-y-10 animate-fadeIn">
             <div className="flex justify-between items-end border-b border-gray-100 pb-8">
@@ -168,7 +249,7 @@ export default function VoiceSandbox() {
                                 <div className="space-y-6">
                                     {audioUrl ? (
                                         <div className="bg-white/10 backdrop-blur-xl p-4 rounded-2xl border border-white/20">
-                                            <audio controls src={audioUrl} className="w-full h-10 accent-white" autoPlay />
+                                            <audio controls src={audioUrl} className="w-full h-10 accent-white" />
                                         </div>
                                     ) : (
                                         <div className="h-20 flex flex-col items-center justify-center text-white/40 border-2 border-dashed border-white/20 rounded-2xl">
@@ -178,12 +259,7 @@ export default function VoiceSandbox() {
 
                                     {audioUrl && (
                                         <button
-                                            onClick={() => {
-                                                const a = document.createElement('a');
-                                                a.href = audioUrl;
-                                                a.download = `gemini-tts-${selectedVoice}-${Date.now()}.wav`;
-                                                a.click();
-                                            }}
+                                            onClick={handleDownload}
                                             className="w-full py-4 text-[10px] font-black uppercase tracking-widest border border-white/20 rounded-xl hover:bg-white/10 transition-colors"
                                         >
                                             Download Preview File
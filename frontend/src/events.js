@@ -0,0 +1,42 @@
+import { API_URL } from './config';
+
+// Subscribes to a Server-Sent-Events stream from the backend.
+// handlers: { [eventType]: (event) => void } where event = { type, project_id, data, ts }
+// onFallback is called once if the stream can't be used (no EventSource support
+// or the connection fails before opening) so the caller can fall back to polling.
+// Returns an unsubscribe function.
+export function subscribeEvents(path, handlers, onFallback) {
+    if (typeof window === 'undefined' || !window.EventSource) {
+        onFallback && onFallback();
+        return () => { };
+    }
+
+    const source = new EventSource(`${API_URL}${path}`);
+    let opened = false;
+    let closed = false;
+
+    source.onopen = () => { opened = true; };
+    source.onerror = () => {
+        // After a successful open the browser reconnects by itself
+        if (!opened && !closed) {
+            closed = true;
+            source.close();
+            onFallback && onFallback();
+        }
+    };
+
+    Object.entries(handlers).forEach(([type, handler]) => {
+        source.addEventListener(type, (e) => {
+            try {
+                handler(JSON.parse(e.data));
+            } catch (err) {
+                console.error(`Bad ${type} event`, err);
+            }
+        });
+    });
+
+    return () => {
+        closed = true;
+        source.close();
+    };
+}
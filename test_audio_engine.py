@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+import os
+import sys
+import wave
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+import numpy as np
+from utils import audio_engine
+
+RATE = audio_engine.MIX_RATE
+
+def _tone(seconds, freq, amp, channels=2):
+    t = np.arange(int(seconds * RATE), dtype=np.float32) / RATE
+    mono = (amp * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+    return np.repeat(mono[:, None], channels, axis=1)
+
+def _read(path):
+    data, rate = audio_engine._read_wav(path)
+    return data, rate
+
+def _rms(x):
+    return float(np.sqrt(np.mean(x * x)))
+
+def test_mix_loops_fades_and_ducks():
+    print("=" * 60)
+    print("TEST: NumPy Audio Engine (loop, fades, ducking)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # 1s silence, 2s speech, 1s silence; music is shorter than the voice so it must loop
+        voice = np.concatenate([np.zeros((RATE, 2), np.float32), _tone(2.0, 440, 0.5), np.zeros((RATE, 2), np.float32)])
+        music = _tone(1.3, 110, 0.2)
+        out_path = os.path.join(tmpdir, "mix.wav")
+
+        duration = audio_engine.mix(voice, music, out_path, music_gain=1.0, fade_sec=0.5, duck=True, block_sec=0.25)
+        out, rate = _read(out_path)
+
+        assert rate == RATE
+        assert len(out) == len(voice), f"length {len(out)} != {len(voice)}"
+        assert abs(duration - 4.0) < 1e-6
+        print(f"✓ Output length matches voice ({duration:.2f}s) with looped 1.3s music")
+
+        # Fades: first and last samples are silent, middle of the lead-in is not
+        assert np.abs(out[:10]).max() < 0.01
+        assert np.abs(out[-10:]).max() < 0.01
+        print("✓ Fade in/out applied")
+
+        # Ducking: music alone during speech = mix - voice; compare with the music-only lead-in
+        music_only_lead = out[int(0.6 * RATE):int(0.9 * RATE)]
+        music_under_voice = out[int(2.0 * RATE):int(2.5 * RATE)] - voice[int(2.0 * RATE):int(2.5 * RATE)]
+        ratio_db = 20 * np.log10(_rms(music_under_voice) / _rms(music_only_lead))
+        print(f"  Music level under voice: {ratio_db:.1f} dB")
+        assert ratio_db < -6.0, "music should be ducked while the voice is active"
+        print("✓ Music ducked under the voice")
+
+        # Without ducking the level is unchanged
+        audio_engine.mix(voice, music, out_path, music_gain=1.0, fade_sec=0.5, duck=False)
+        out, _ = _read(out_path)
+        music_under_voice = out[int(2.0 * RATE):int(2.5 * RATE)] - voice[int(2.0 * RATE):int(2.5 * RATE)]
+        assert abs(20 * np.log10(_rms(music_under_voice) / _rms(music_only_lead))) < 1.0
+        print("✓ duck=False leaves the music level alone")
+
+def test_wav_decode_and_resample():
+    print("=" * 60)
+    print("TEST: WAV decode to mix format")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # 24 kHz mono 16-bit, like Gemini TTS output
+        path = os.path.join(tmpdir, "voice.wav")
+        samples = (np.sin(2 * np.pi * 200 * np.arange(24000) / 24000) * 16000).astype("<i2")
+        with wave.open(path, 'wb') as w:
+            w.setnchannels(1)
+            w.setsampwidth(2)
+            w.setframerate(24000)
+            w.writeframes(samples.tobytes())
+
+        data = audio_engine.load_audio(path)
+        assert data.shape[1] == 2
+        assert abs(len(data) - RATE) <= 1, f"expected ~{RATE} frames, got {len(data)}"
+        assert abs(np.abs(data).max() - 16000 / 32768) < 0.01
+        print(f"✓ 24 kHz mono -> {RATE} Hz stereo ({len(data)} frames)")
+
+def test_music_library_index():
+    print("=" * 60)
+    print("TEST: Music library (pre-decoded PCM + metadata)")
+    print("=" * 60)
+
+    from utils import music_library
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        saved = (music_library.MUSIC_DIR, music_library.LIBRARY_DIR, music_library.INDEX_PATH)
+        music_library.MUSIC_DIR = os.path.join(tmpdir, "music")
+        music_library.LIBRARY_DIR = os.path.join(tmpdir, "cache")
+        music_library.INDEX_PATH = os.path.join(music_library.LIBRARY_DIR, "index.json")
+        try:
+            os.makedirs(music_library.MUSIC_DIR)
+            # 8s click track at 120 BPM
+            track = np.zeros((RATE * 8, 2), np.float32)
+            for t in np.arange(0.25, 8.0, 0.5):
+                i = int(t * RATE)
+                track[i:i + 2000] = _tone(2000 / RATE, 1000, 0.5)
+            path = os.path.join(music_library.MUSIC_DIR, "click.wav")
+            audio_engine.write_wav(track, path)
+
+            index = music_library.build_index()
+            entry = index["click.wav"]
+            assert entry["duration"] == 8.0
+            assert len(entry["energy_db"]) == 8
+            assert abs(entry["tempo_bpm"] - 120.0) < 2.0, entry["tempo_bpm"]
+            print(f"✓ Indexed: {entry['duration']}s, {entry['tempo_bpm']} BPM, {len(entry['beats'])} beats")
+
+            pcm = music_library.load_pcm(entry)
+            assert isinstance(pcm, np.memmap) and pcm.shape == track.shape
+            assert music_library.find_track(path)["hash"] == entry["hash"]
+            print("✓ Decoded PCM is memory-mapped at the mix rate")
+
+            tracks = music_library.list_tracks()
+            assert [t["file"] for t in tracks] == ["click.wav"] and "beats" not in tracks[0]
+            assert not tracks[0].get("pending")
+            # A changed track is refreshed on its own by the mix path
+            os.utime(path, ns=(1, 1))
+            assert music_library.get_track("click.wav")["mtime_ns"] == 1
+            print("✓ Listing served from the index; stale track refreshed individually")
+
+            os.remove(path)
+            assert music_library.build_index() == {}
+            assert not os.path.exists(os.path.join(music_library.LIBRARY_DIR, entry["pcm"]))
+            print("✓ Removed tracks are dropped from the index")
+        finally:
+            music_library.MUSIC_DIR, music_library.LIBRARY_DIR, music_library.INDEX_PATH = saved
+
+def test_waveform_peaks():
+    print("=" * 60)
+    print("TEST: Waveform peak sidecars")
+    print("=" * 60)
+
+    from utils import waveform
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        saved = waveform.PEAKS_DIR
+        waveform.PEAKS_DIR = os.path.join(tmpdir, "peaks")
+        try:
+            # 1s quiet tone then 1s loud tone
+            path = os.path.join(tmpdir, "voice.wav")
+            audio_engine.write_wav(np.concatenate([_tone(1.0, 220, 0.1), _tone(1.0, 220, 0.8)]), path)
+
+            peaks = waveform.load(path)
+            assert peaks["samples_per_peak"] == waveform.BASE_SAMPLES_PER_PEAK
+            assert peaks["duration"] == 2.0
+            values = np.array(peaks["peaks"]).reshape(-1, 2)
+            half = len(values) // 2
+            assert values[:half - 1, 1].max() <= 14 and values[half + 1:, 1].max() >= 100
+            assert (values[:, 0] <= values[:, 1]).all()
+            print(f"✓ Finest level: {len(values)} min/max pairs")
+
+            coarse = waveform.load(path, width=50)
+            assert coarse["samples_per_peak"] > peaks["samples_per_peak"]
+            assert len(coarse["peaks"]) // 2 >= 50
+            print(f"✓ width=50 -> {coarse['samples_per_peak']} samples per peak")
+
+            # Identical content shares one sidecar
+            copy_path = os.path.join(tmpdir, "voice---copy.wav")
+            with open(path, "rb") as src, open(copy_path, "wb") as dst:
+                dst.write(src.read())
+            assert waveform.ensure(copy_path) == waveform.ensure(path)
+            print("✓ Sidecar keyed by content hash")
+
+            # A re-mix leaves a new sidecar; over budget the older one is evicted
+            from core.global_settings import get_settings
+            first = waveform.ensure(path)
+            os.utime(first, (1, 1))
+            audio_engine.write_wav(_tone(1.0, 440, 0.5), path)
+            budget = get_settings().waveform.max_size_mb
+            get_settings().waveform.max_size_mb = 0
+            try:
+                second = waveform.ensure(path)
+            finally:
+                get_settings().waveform.max_size_mb = budget
+            assert os.path.exists(second) and not os.path.exists(first)
+            print("✓ Stale peaks evicted over budget")
+        finally:
+            waveform.PEAKS_DIR = saved
+
+def test_pcm_padding_and_pauses():
+    print("=" * 60)
+    print("TEST: In-memory silence padding and sentence pauses")
+    print("=" * 60)
+
+    from utils import pcm
+    from utils.audio_processor import compose_wav
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        rate = pcm.GEMINI_RATE
+        speech = (np.arange(rate, dtype=np.int16) % 2000 + 1).tobytes() # 1s, no zero samples
+        data = pcm.write_wav(speech, 1, 2, rate)
+        out = os.path.join(tmpdir, "voice.wav")
+
+        compose_wav(data, out, start_silence=1.5, end_silence=0.75, sentence_count=3, pause_duration=0.4)
+        with wave.open(out, 'rb') as w:
+            assert (w.getnchannels(), w.getsampwidth(), w.getframerate()) == (1, 2, rate)
+            samples = np.frombuffer(w.readframes(w.getnframes()), dtype=np.int16)
+        expected = int(1.5 * rate) + rate + 2 * int(0.4 * rate) + int(0.75 * rate)
+        assert len(samples) == expected, (len(samples), expected)
+        assert not samples[:int(1.5 * rate)].any() and not samples[-int(0.75 * rate):].any()
+        print(f"✓ Exact length: {len(samples)} frames")
+
+        # Original samples survive bit-exact once the silence is removed
+        assert samples[samples != 0].tobytes() == speech
+        print("✓ Speech samples unchanged")
+
+        try:
+            compose_wav(b"ID3" + b"\x00" * 64, out)
+            assert False, "expected ValueError for non-WAV input"
+        except ValueError:
+            print("✓ Non-WAV input rejected (callers fall back to sox/pydub)")
+
+if __name__ == "__main__":
+    test_mix_loops_fades_and_ducks()
+    test_wav_decode_and_resample()
+    test_music_library_index()
+    test_waveform_peaks()
+    test_pcm_padding_and_pauses()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from PIL import Image
+from utils import image_processor
+
+def _make_project(tmpdir, sizes):
+    input_dir = os.path.join(tmpdir, "input")
+    os.makedirs(input_dir)
+    names = []
+    for i, size in enumerate(sizes):
+        name = f"{i:03d}.jpg"
+        Image.new("RGB", size, (200, 40 * i % 255, 90)).save(os.path.join(input_dir, name), quality=90)
+        names.append(name)
+    return names
+
+def test_batch_processing_pool():
+    print("=" * 60)
+    print("TEST: Parallel batch image processing")
+    print("=" * 60)
+
+    # Force the pool even on a single-core machine
+    saved = image_processor.image_workers
+    image_processor.image_workers = lambda: 2
+    try:
+        _run_batches()
+    finally:
+        image_processor.image_workers = saved
+        image_processor._reset_pool()
+
+def _run_batches():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        names = _make_project(tmpdir, [(1600, 900), (900, 1600), (1000, 1000), (1200, 2200)])
+        config = {"width": 540, "height": 960, "mode": "fit", "bg_color": "#000000"}
+
+        results = image_processor.process_batch_images(tmpdir, names + ["missing.jpg"], config)
+        assert [r["name"] for r in results] == names + ["missing.jpg"]
+        assert all(r["status"] == "OK" for r in results[:-1]), results
+        assert results[-1]["status"] == "FAIL"
+        for name in names:
+            with Image.open(os.path.join(tmpdir, "input", name)) as img:
+                assert img.size == (540, 960)
+        print(f"✓ {len(names)} images processed in the pool, results in input order")
+
+        # Fit pads a landscape image: top row is background
+        with Image.open(os.path.join(tmpdir, "input", names[0])) as img:
+            assert img.getpixel((270, 5)) == (0, 0, 0)
+        print("✓ fit semantics preserved")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        names = _make_project(tmpdir, [(1600, 900), (900, 1600), (1000, 1000)])
+        streamed = list(image_processor.iter_batch_images(tmpdir, names, {**config, "mode": "fill"}))
+        assert sorted(r["name"] for r in streamed) == names
+        with Image.open(os.path.join(tmpdir, "input", names[0])) as img:
+            assert img.getpixel((270, 5)) != (0, 0, 0)
+        print("✓ Streaming iterator yields every image (fill crops, no padding)")
+
+def test_reduced_decoding():
+    print("=" * 60)
+    print("TEST: Reduced-resolution decoding of large inputs")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        names = _make_project(tmpdir, [(4000, 3000), (3024, 4032)])
+        landscape, portrait = (os.path.join(tmpdir, "input", n) for n in names)
+
+        # fit into 1080x1920 only needs 1080x810: JPEG DCT scale 1/2 (1/4 would be too small)
+        img, original = image_processor.open_reduced(landscape, 1080, 1920, mode="fit")
+        assert original == (4000, 3000) and img.size == (2000, 1500), img.size
+        # fill must cover 1080x1920 on both sides: no reduction possible
+        img, _ = image_processor.open_reduced(landscape, 1080, 1920, mode="fill")
+        assert img.size == (4000, 3000)
+        img, _ = image_processor.open_reduced(portrait, 1080, 1920, mode="fill")
+        assert img.size == (1512, 2016)
+        print("✓ JPEG decoded at the smallest covering scale")
+
+        png = os.path.join(tmpdir, "input", "big.png")
+        Image.new("RGB", (5000, 5000), (10, 20, 30)).save(png)
+        img, _ = image_processor.open_reduced(png, 500, 500, mode="fill")
+        assert img.size == (1000, 1000), img.size
+        print("✓ Non-JPEG reduced to 2x the target before resampling")
+
+        for name in names:
+            assert image_processor.normalize_asset(tmpdir, name)
+            with Image.open(os.path.join(tmpdir, "input", name)) as out:
+                assert out.size == (1080, 1920)
+        print("✓ Normalization output unchanged (1080x1920)")
+
+def test_thumbnails():
+    print("=" * 60)
+    print("TEST: WebP thumbnail cache")
+    print("=" * 60)
+
+    from utils import thumbnails
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        saved = thumbnails.THUMBS_DIR
+        thumbnails.THUMBS_DIR = os.path.join(tmpdir, "thumbs")
+        try:
+            names = _make_project(tmpdir, [(1080, 1920)])
+            src = os.path.join(tmpdir, "input", names[0])
+
+            assert thumbnails.snap_width(200) == 320 and thumbnails.snap_width(5000) == 640
+            thumb = thumbnails.ensure(src, 200)
+            with Image.open(thumb) as img:
+                assert img.format == "WEBP" and img.size == (320, 569)
+            assert thumbnails.ensure(src, 320) == thumb
+            print(f"✓ 320px WebP generated once ({os.path.getsize(thumb)} bytes)")
+
+            url = thumbnails.thumb_url("p1", names[0], source_path=src)
+            assert url.startswith(f"/projects/p1/thumb/320/{names[0]}?v=")
+            assert thumbnails.thumb_url("p1", "../cover.jpg", width=640) == "/projects/p1/thumb/640/cover.jpg?root=1"
+            print("✓ Versioned URLs")
+
+            thumbnails.invalidate(src)
+            assert not os.path.exists(thumb)
+            print("✓ Invalidated before the source is replaced")
+
+            # Phone photo stored landscape with "rotate 90" in EXIF: thumbnail is upright
+            phone = os.path.join(tmpdir, "input", "phone.jpg")
+            exif = Image.Exif()
+            exif[0x0112] = 6
+            Image.new("RGB", (1600, 1200)).save(phone, exif=exif)
+            upright = thumbnails.ensure(phone, 320)
+            with Image.open(upright) as img:
+                assert img.size == (320, 427), img.size
+            print("✓ EXIF orientation applied")
+
+            other = thumbnails.ensure(src, 160)
+            assert thumbnails.evict(0, keep=upright) == 1
+            assert os.path.exists(upright) and not os.path.exists(other)
+            from utils import file_lru
+            assert file_lru.store(thumbnails.THUMBS_DIR).total_bytes() == os.path.getsize(upright)
+            print("✓ Least recently used thumbnails evicted over budget")
+        finally:
+            thumbnails.THUMBS_DIR = saved
+
+def test_image_index():
+    print("=" * 60)
+    print("TEST: Per-project image metadata index")
+    print("=" * 60)
+
+    from utils import image_index
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        names = _make_project(tmpdir, [(800, 600), (600, 800)])
+        meta = image_index.entries(tmpdir)
+        assert sorted(meta) == names
+        assert (meta[names[0]]["width"], meta[names[0]]["height"]) == (800, 600)
+        assert meta[names[0]]["format"] == "JPEG" and meta[names[0]]["orientation"] == 1
+        assert len(meta[names[0]]["hash"]) == 64 and meta[names[0]]["has_backup"] is False
+        print("✓ Built on first read")
+
+        # Files added by other code paths are picked up via input/'s mtime
+        Image.new("RGB", (300, 300)).save(os.path.join(tmpdir, "input", "extra.png"))
+        assert image_index.get(tmpdir, "extra.png")["format"] == "PNG"
+        print("✓ New files reconciled")
+
+        # In-place rewrite (normalize) goes through update(); stale entries aren't trusted
+        path = os.path.join(tmpdir, "input", names[0])
+        Image.new("RGB", (1080, 1920)).save(path, quality=90)
+        os.utime(path, ns=(1, 1))
+        assert image_index.cached_size(tmpdir, names[0]) is None
+        image_index.update(tmpdir, names[0])
+        assert image_index.cached_size(tmpdir, names[0]) == (1080, 1920)
+        print("✓ Updated after an in-place rewrite")
+
+        assert image_processor.normalize_asset(tmpdir, names[1])
+        image_index.remove(tmpdir, "extra.png")
+        os.remove(os.path.join(tmpdir, "input", "extra.png"))
+        assert sorted(image_index.entries(tmpdir)) == names
+        print("✓ Deleted files removed")
+
+def test_duplicate_detection():
+    print("=" * 60)
+    print("TEST: Perceptual-hash duplicate detection")
+    print("=" * 60)
+
+    from utils import image_hash, image_index
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        input_dir = os.path.join(tmpdir, "input")
+        os.makedirs(input_dir)
+        # A "product shot" with structure, the same shot resized/recompressed, and a different one
+        shot = Image.new("RGB", (1200, 1200), (255, 255, 255))
+        shot.paste((200, 30, 30), (300, 200, 900, 1000))
+        shot.paste((30, 30, 200), (450, 400, 750, 700))
+        shot.save(os.path.join(input_dir, "1.jpg"), quality=95)
+        shot.resize((600, 600)).save(os.path.join(input_dir, "7.jpg"), quality=60)
+        other = Image.new("RGB", (1200, 1200), (255, 255, 255))
+        other.paste((30, 160, 30), (100, 600, 1100, 900))
+        other.save(os.path.join(input_dir, "2.jpg"), quality=95)
+
+        meta = image_index.entries(tmpdir)
+        assert all(len(m["dhash"]) == 16 for m in meta.values())
+        assert image_hash.distance(meta["1.jpg"]["dhash"], meta["7.jpg"]["dhash"]) <= image_hash.DEFAULT_MAX_DISTANCE
+        assert image_hash.distance(meta["1.jpg"]["dhash"], meta["2.jpg"]["dhash"]) > image_hash.DEFAULT_MAX_DISTANCE
+        print("✓ Resized copy within threshold, different shot outside it")
+
+        groups = image_index.duplicates(tmpdir)
+        assert groups == [["1.jpg", "7.jpg"]], groups
+        assert image_index.duplicate_of(groups) == {"7.jpg": "1.jpg"}
+        print("✓ Naturally first file kept")
+
+def test_local_roi_detection():
+    print("=" * 60)
+    print("TEST: Local saliency ROI detection")
+    print("=" * 60)
+
+    from utils import saliency, ai_detector
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # Product on white, off-centre to the right
+        shot = Image.new("RGB", (1600, 1000), (250, 250, 250))
+        shot.paste((180, 40, 40), (1000, 300, 1300, 800))
+        path = os.path.join(tmpdir, "product.jpg")
+        shot.save(path, quality=90)
+
+        result = saliency.detect_roi(path)
+        roi = result["roi"]
+        assert result["type"] == "product" and result["confidence"] >= 0.9
+        assert 560 <= roi["xmin"] <= 625 and 810 <= roi["xmax"] <= 870, roi
+        assert 230 <= roi["ymin"] <= 300 and 800 <= roi["ymax"] <= 870, roi
+        print(f"✓ Subject found against the background: {roi}")
+
+        # Cut-out product: the alpha channel is the mask
+        cutout = Image.new("RGBA", (800, 800), (0, 0, 0, 0))
+        cutout.paste((40, 180, 40, 255), (100, 200, 400, 600))
+        cutout_path = os.path.join(tmpdir, "cutout.png")
+        cutout.save(cutout_path)
+        cut = saliency.detect_roi(cutout_path)
+        assert cut["type"] == "product" and cut["confidence"] == 0.95
+        assert 80 <= cut["roi"]["xmin"] <= 130 and 470 <= cut["roi"]["xmax"] <= 545, cut
+        broken = os.path.join(tmpdir, "broken.jpg")
+        with open(broken, "wb") as f:
+            f.write(b"not an image")
+        failed = saliency.detect_roi(broken)
+        assert failed["roi"] is None and "failed" in failed["error"]
+        print("✓ Alpha cut-outs detected; unreadable files report why")
+
+        # Auto mode only asks Gemini when the local result is unsure
+        calls = []
+        saved = ai_detector.detect_roi
+        ai_detector.detect_roi = lambda p: calls.append(p) or {"roi": None, "type": "none"}
+        try:
+            assert image_processor.detect_roi(path, "auto") == result and not calls
+            noise = os.path.join(tmpdir, "noise.png")
+            Image.effect_noise((400, 400), 80).save(noise)
+            assert image_processor.detect_roi(noise, "local")["confidence"] < 0.6
+            image_processor.detect_roi(noise, "auto")
+            assert calls == [noise]
+        finally:
+            ai_detector.detect_roi = saved
+        print("✓ Gemini used only for low-confidence local results")
+
+        os.makedirs(os.path.join(tmpdir, "input"))
+        shot.save(os.path.join(tmpdir, "input", "p.jpg"), quality=90)
+        assert image_processor.normalize_asset(tmpdir, "p.jpg", ai_smart_crop=True, roi_detector="local")
+        from utils import crop_manager
+        crop = crop_manager.load_crops(tmpdir)["p.jpg"]
+        assert crop["type"] == "product" and crop["crop_box"][0] > 0
+        print("✓ Smart crop follows the local ROI")
+
+if __name__ == "__main__":
+    test_batch_processing_pool()
+    test_reduced_decoding()
+    test_thumbnails()
+    test_image_index()
+    test_duplicate_detection()
+    test_local_roi_detection()
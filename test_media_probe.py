@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+import os
+import sys
+import wave
+import struct
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils import media_probe
+
+# MPEG1 Layer III, 128 kbps, 44.1 kHz, stereo, no padding -> 417-byte frames of 1152 samples
+MP3_HEADER = b"\xff\xfb\x90\x00"
+MP3_FRAME_LEN = 417
+
+def _write_wav(path, seconds, rate=24000, channels=1):
+    with wave.open(path, 'wb') as w:
+        w.setnchannels(channels)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * channels * int(seconds * rate))
+
+def _write_mp3(path, n_frames, xing_frames=None, id3=True):
+    with open(path, "wb") as f:
+        if id3:
+            # ID3v2.3 tag with a 20-byte (syncsafe) body
+            f.write(b"ID3\x03\x00\x00\x00\x00\x00\x14" + b"\x00" * 20)
+        if xing_frames is not None:
+            frame = bytearray(MP3_HEADER + b"\x00" * (MP3_FRAME_LEN - 4))
+            frame[36:48] = b"Xing" + struct.pack(">II", 0x1, xing_frames)
+            f.write(frame)
+        for _ in range(n_frames):
+            f.write(MP3_HEADER + b"\x00" * (MP3_FRAME_LEN - 4))
+        f.write(b"TAG" + b"\x00" * 125)
+
+def _box(box_type, body):
+    return struct.pack(">I4s", 8 + len(body), box_type) + body
+
+def _write_mp4(path, timescale, duration):
+    mvhd = _box(b"mvhd", b"\x00\x00\x00\x00" + struct.pack(">IIII", 0, 0, timescale, duration) + b"\x00" * 80)
+    with open(path, "wb") as f:
+        f.write(_box(b"ftyp", b"isom\x00\x00\x02\x00isomiso2mp41"))
+        f.write(_box(b"mdat", b"\x00" * 1000))
+        f.write(_box(b"moov", mvhd))
+
+def test_probe_formats():
+    print("=" * 60)
+    print("TEST: Media Probe (WAV / MP3 / MP4 headers)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        wav_path = os.path.join(tmpdir, "voice.wav")
+        _write_wav(wav_path, 2.5)
+        info = media_probe.probe(wav_path)
+        assert info["format"] == "wav" and info["duration"] == 2.5, info
+        assert info["sample_rate"] == 24000 and info["channels"] == 1
+        print(f"✓ WAV: {info['duration']}s")
+
+        mp3_path = os.path.join(tmpdir, "cbr.mp3")
+        _write_mp3(mp3_path, 100)
+        expected = round(100 * 1152 / 44100.0, 3)
+        info = media_probe.probe(mp3_path)
+        assert info["format"] == "mp3" and info["duration"] == expected, info
+        print(f"✓ MP3 (frame scan): {info['duration']}s")
+
+        xing_path = os.path.join(tmpdir, "vbr.mp3")
+        _write_mp3(xing_path, 10, xing_frames=500)
+        info = media_probe.probe(xing_path)
+        assert info["duration"] == round(500 * 1152 / 44100.0, 3), info
+        print(f"✓ MP3 (Xing header): {info['duration']}s")
+
+        mp4_path = os.path.join(tmpdir, "final_video.mp4")
+        _write_mp4(mp4_path, 1000, 12345)
+        info = media_probe.probe(mp4_path)
+        assert info["format"] == "mp4" and info["duration"] == 12.345, info
+        print(f"✓ MP4 (mvhd): {info['duration']}s")
+
+        junk_path = os.path.join(tmpdir, "broken.mp3")
+        with open(junk_path, "wb") as f:
+            f.write(b"not audio" * 50)
+        if not media_probe.shutil.which("ffprobe"):
+            assert media_probe.duration(junk_path) == 0.0
+            print("✓ Unreadable file -> 0.0")
+
+def test_probe_cache():
+    print("=" * 60)
+    print("TEST: Media Probe cache (path, size, mtime)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "voice.wav")
+        _write_wav(path, 1.0)
+        assert media_probe.duration(path) == 1.0
+
+        calls = []
+        original = media_probe._probe_uncached
+        media_probe._probe_uncached = lambda p, size: calls.append(p) or original(p, size)
+        try:
+            assert media_probe.duration(path) == 1.0
+            assert calls == [], "second lookup should hit the cache"
+            print("✓ Repeated lookup served from cache")
+
+            _write_wav(path, 3.0)
+            assert media_probe.duration(path) == 3.0
+            assert len(calls) == 1
+            print("✓ Rewritten file is probed again")
+        finally:
+            media_probe._probe_uncached = original
+
+if __name__ == "__main__":
+    test_probe_formats()
+    test_probe_cache()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils import speech_model
+
+def test_speech_rate_fit():
+    print("=" * 60)
+    print("TEST: Speech-rate model (chars -> seconds)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        saved = speech_model.MODEL_PATH
+        speech_model.MODEL_PATH = os.path.join(tmpdir, "speech_rate.json")
+        try:
+            text = "ของดีบอกต่อ" * 10
+            chars = speech_model.spoken_chars(text)
+            seconds, source = speech_model.predict_speech("gemini", "Puck", 1.0, text)
+            assert source == "heuristic" and abs(seconds - chars * 0.125) < 1e-9
+            print(f"✓ No data: heuristic {seconds:.1f}s for {chars} chars")
+
+            # Puck speaks 0.3 + 0.08 s/char
+            for n in (40, 80, 120, 160, 200):
+                speech_model.observe("gemini", "Puck", 1.0, "ก" * n, 0.3 + 0.08 * n)
+            seconds, source = speech_model.predict_speech("gemini", "Puck", 1.0, text)
+            assert source == "voice"
+            assert abs(seconds - (0.3 + 0.08 * chars)) < 0.01, seconds
+            print(f"✓ Fitted voice model: {seconds:.2f}s")
+
+            # Other voices use the pooled fit; other speeds scale the voice's own fit
+            _, source = speech_model.predict_speech("gemini", "Kore", 1.0, text)
+            assert source == "pooled"
+            fast, source = speech_model.predict_speech("gemini", "Puck", 1.25, text)
+            assert source == "speed-scaled" and abs(fast - seconds / 1.25) < 0.01
+            print("✓ Pooled and speed-scaled fallbacks")
+
+            total, _ = speech_model.predict_total("gemini", "Puck", 1.0, "หนึ่ง. สอง. สาม.", breathing_pause=True, intro=0.5, outro=1.0)
+            speech, _ = speech_model.predict_speech("gemini", "Puck", 1.0, "หนึ่ง. สอง. สาม.")
+            assert abs(total - round(speech + 2 * 0.4 + 1.5, 2)) < 1e-9
+            print("✓ Total adds sentence pauses and padding")
+
+            # Line breaks are sentence boundaries for prediction and pause insertion alike
+            from utils import sentence_utils
+            multiline = "หนึ่ง\nสอง. สาม"
+            assert sentence_utils.sentence_count(multiline) == 3
+            with_lines, _ = speech_model.predict_total("gemini", "Puck", 1.0, multiline, breathing_pause=True)
+            speech, _ = speech_model.predict_speech("gemini", "Puck", 1.0, multiline)
+            assert abs(with_lines - round(speech + 2 * 0.4, 2)) < 1e-9
+            print("✓ One sentence splitter for pauses and prediction")
+        finally:
+            speech_model.MODEL_PATH = saved
+
+if __name__ == "__main__":
+    test_speech_rate_fit()
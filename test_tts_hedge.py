@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+import os
+import sys
+import time
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils import tts_hedge
+
+def _slow(result, seconds):
+    def call(cancelled):
+        time.sleep(seconds)
+        return result
+    return call
+
+def _failing(cancelled):
+    raise RuntimeError("provider down")
+
+def _requests(result, count, seconds, sent):
+    """A call made of several API requests (like chunked sentences) that honours cancellation."""
+    def call(cancelled):
+        for _ in range(count):
+            tts_hedge.check_cancelled(cancelled)
+            sent.append(result)
+            time.sleep(seconds)
+        return result
+    return call
+
+def test_hedged_call():
+    print("=" * 60)
+    print("TEST: Hedged TTS requests")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        saved = (tts_hedge.METRICS_PATH, tts_hedge._metrics)
+        tts_hedge.METRICS_PATH = os.path.join(tmpdir, "tts_latency.json")
+        tts_hedge._metrics = None
+        try:
+            # Fast primary: no backup request
+            result, winner, hedged = tts_hedge.hedged_call("gemini", _slow("A", 0.01), "gtts", _slow("B", 0.01), deadline_sec=0.5)
+            assert (result, winner, hedged) == ("A", "gemini", False)
+            print("✓ Primary within deadline wins without hedging")
+
+            # Slow primary: backup issued after the deadline and wins
+            start = time.time()
+            result, winner, hedged = tts_hedge.hedged_call("gemini", _slow("A", 1.0), "gtts", _slow("B", 0.05), deadline_sec=0.1)
+            elapsed = time.time() - start
+            assert (result, winner, hedged) == ("B", "gtts", True)
+            assert elapsed < 0.6, f"should not wait for the slow primary ({elapsed:.2f}s)"
+            print(f"✓ Backup won after deadline ({elapsed:.2f}s)")
+
+            # Failing primary: immediate failover
+            result, winner, _ = tts_hedge.hedged_call("gemini", _failing, "gtts", _slow("B", 0.01), deadline_sec=5.0)
+            assert (result, winner) == ("B", "gtts")
+            print("✓ Primary error fails over to the backup")
+
+            # Both fail: primary error surfaces
+            try:
+                tts_hedge.hedged_call("gemini", _failing, "gtts", _failing, deadline_sec=0.1)
+                assert False, "expected an error"
+            except RuntimeError as e:
+                assert "provider down" in str(e)
+            print("✓ Both failing raises")
+
+            # The losing side stops before requests it hasn't sent yet
+            sent = []
+            result, winner, _ = tts_hedge.hedged_call("gemini", _requests("A", 10, 0.1, sent), "gtts", _slow("B", 0.01), deadline_sec=0.15)
+            assert (result, winner) == ("B", "gtts")
+            time.sleep(0.3)
+            assert len(sent) <= 3, f"primary kept sending after losing ({len(sent)} requests)"
+            print(f"✓ Losing primary cancelled after {len(sent)} of 10 requests")
+
+            time.sleep(1.0) # Let the abandoned primary finish and record the saving
+            hedging = tts_hedge.stats()["hedging"]
+            assert hedging["requests"] == 4 and hedging["hedged"] == 3
+            assert hedging["wins"] == {"gemini": 1, "gtts": 3}
+            assert hedging["saved_sec"] > 0.3, hedging
+            print(f"✓ Metrics recorded: {hedging}")
+        finally:
+            tts_hedge.METRICS_PATH, tts_hedge._metrics = saved
+
+def test_percentile_deadline():
+    print("=" * 60)
+    print("TEST: Percentile hedge deadline")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        saved = (tts_hedge.METRICS_PATH, tts_hedge._metrics)
+        tts_hedge.METRICS_PATH = os.path.join(tmpdir, "tts_latency.json")
+        tts_hedge._metrics = None
+        try:
+            assert tts_hedge.deadline("openai", min_samples=10, default_sec=20.0) == 20.0
+            for i in range(1, 21):
+                tts_hedge.record_latency("openai", float(i))
+            assert tts_hedge.deadline("openai", percentile=95, min_samples=10) == 19.0
+            assert tts_hedge.deadline("openai", percentile=50, min_samples=10) == 11.0
+            print("✓ Default until enough samples, then the latency percentile")
+        finally:
+            tts_hedge.METRICS_PATH, tts_hedge._metrics = saved
+
+if __name__ == "__main__":
+    test_hedged_call()
+    test_percentile_deadline()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+import os
+import sys
+import tempfile
+
+# Add backend to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'backend'))
+
+from utils import pcm, voice_index, tts_handler
+
+def _write_voice(path, seconds):
+    with open(path, "wb") as f:
+        f.write(pcm.write_wav(pcm.silence(seconds)))
+
+def test_voice_index():
+    print("=" * 60)
+    print("TEST: Per-project voice index")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as project_path:
+        audio_dir = os.path.join(project_path, "audio")
+        os.makedirs(audio_dir)
+
+        # Legacy project: variants on disk, no index yet -> migrated on first list
+        legacy = "voice---gm_puck---1.0---1700000000.wav"
+        _write_voice(os.path.join(audio_dir, legacy), 2.0)
+        files = tts_handler.list_voice_files(project_path, "p1")
+        assert [f["filename"] for f in files] == [legacy]
+        assert files[0]["profile_id"] == "gm_puck" and files[0]["duration"] == 2.0
+        assert os.path.exists(voice_index.index_path(project_path))
+        print("✓ Legacy variants migrated from filenames")
+
+        # New variant recorded at creation time with full metadata
+        new = "voice---gm_kore---1.1---1700000100.wav"
+        _write_voice(os.path.join(audio_dir, new), 3.0)
+        voice_index.add_variant(project_path, new, profile_id="gm_kore", provider="gemini", voice="Kore",
+                                speed=1.1, style="calm", timestamp="1700000100", duration=3.0,
+                                text_hash=voice_index.text_hash("สวัสดี  ครับ"), size=1234)
+        assert voice_index.text_hash("สวัสดี ครับ") == voice_index.text_hash("สวัสดี  ครับ")
+
+        files = tts_handler.list_voice_files(project_path, "p1")
+        assert [f["filename"] for f in files] == [new, legacy]
+        assert files[0]["provider"] == "gemini" and files[0]["style"] == "calm"
+        print("✓ Listing served from the index, newest first")
+
+        # Files added or removed by other code are reconciled via audio/'s mtime
+        stray = "voice---gm_zephyr---1.0---1700000200.wav"
+        _write_voice(os.path.join(audio_dir, stray), 1.0)
+        files = tts_handler.list_voice_files(project_path, "p1")
+        assert [f["filename"] for f in files] == [stray, new, legacy]
+        assert files[0]["profile_id"] == "gm_zephyr" and files[0]["duration"] == 1.0
+        os.remove(os.path.join(audio_dir, stray))
+        files = tts_handler.list_voice_files(project_path, "p1")
+        assert [f["filename"] for f in files] == [new, legacy]
+        assert files[0]["provider"] == "gemini" # Recorded metadata survives a reconcile
+        print("✓ Outside changes to audio/ reconciled")
+
+        ok, _ = tts_handler.set_active_voice(project_path, new)
+        assert ok
+        files = tts_handler.list_voice_files(project_path, "p1")
+        active = [f for f in files if f.get("label")]
+        assert len(active) == 1 and active[0]["filename"] == "voice.wav"
+        assert active[0]["source"] == new and active[0]["duration"] == 3.0
+        print("✓ Activation recorded with the source variant")
+
+        ok, _ = tts_handler.delete_voice_file(project_path, new)
+        assert ok
+        files = tts_handler.list_voice_files(project_path, "p1")
+        assert new not in [f["filename"] for f in files]
+        assert any(f["filename"] == "voice.wav" for f in files)
+        print("✓ Deletion removes the variant from the index")
+
+if __name__ == "__main__":
+    test_voice_index()